@@ -0,0 +1,80 @@
+"""
+Benchmarks del backend.
+
+Cada benchmark se ejecuta como módulo desde la raíz del proyecto, por ejemplo
+``python -m benchmarks.paginacion``, y trabaja sobre una base de datos de
+prueba desechable creada igual que la de los tests.
+"""
+import os
+import statistics
+import time
+from contextlib import contextmanager
+
+import django
+
+
+def preparar_django():
+    """Configura Django para ejecutar un benchmark fuera de ``manage.py``"""
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+    django.setup()
+
+
+@contextmanager
+def base_de_datos_temporal():
+    """Crea la base de datos de prueba y la destruye al terminar"""
+    from django.db import connection
+    from django.test.utils import setup_test_environment, teardown_test_environment
+
+    setup_test_environment()
+    nombre_original = connection.settings_dict['NAME']
+    connection.creation.create_test_db(verbosity=0, autoclobber=True)
+    try:
+        yield
+    finally:
+        connection.creation.destroy_test_db(nombre_original, verbosity=0)
+        teardown_test_environment()
+
+
+def sin_auto_now(modelo, *campos):
+    """Ver ``services.sinteticos.sin_auto_now``"""
+    from services.sinteticos import sin_auto_now as desactivar
+    return desactivar(modelo, *campos)
+
+
+def medir(funcion, repeticiones=20, calentamiento=2):
+    """Ejecuta ``funcion`` varias veces y devuelve los tiempos en segundos"""
+    for _ in range(calentamiento):
+        funcion()
+    tiempos = []
+    for _ in range(repeticiones):
+        inicio = time.perf_counter()
+        funcion()
+        tiempos.append(time.perf_counter() - inicio)
+    return tiempos
+
+
+def percentil(tiempos, p):
+    ordenados = sorted(tiempos)
+    indice = min(len(ordenados) - 1, max(0, round(p / 100 * len(ordenados)) - 1))
+    return ordenados[indice]
+
+
+def resumen_ms(tiempos):
+    """Resume una lista de tiempos (segundos) en milisegundos"""
+    return {
+        'p50': statistics.median(tiempos) * 1000,
+        'p95': percentil(tiempos, 95) * 1000,
+        'p99': percentil(tiempos, 99) * 1000,
+        'max': max(tiempos) * 1000,
+    }
+
+
+def imprimir_tabla(encabezados, filas):
+    anchos = [
+        max(len(str(encabezado)), *(len(str(fila[i])) for fila in filas))
+        for i, encabezado in enumerate(encabezados)
+    ]
+    print('  '.join(str(e).ljust(a) for e, a in zip(encabezados, anchos)))
+    print('  '.join('-' * a for a in anchos))
+    for fila in filas:
+        print('  '.join(str(v).ljust(a) for v, a in zip(fila, anchos)))
@@ -0,0 +1,87 @@
+"""
+Analítica de solicitudes de los últimos 90 días con historias de distinto
+tamaño: conteo en vivo (``GROUP BY`` sobre todas las solicitudes del rango)
+contra resúmenes diarios + hoy en vivo (``GET /api/solicitudes/analitica/``).
+Con resúmenes el tiempo no debe crecer con la historia.
+
+    python -m benchmarks.analitica --filas 10000 100000 500000
+"""
+import argparse
+import datetime
+
+from benchmarks import (
+    base_de_datos_temporal, imprimir_tabla, medir, preparar_django, resumen_ms, sin_auto_now,
+)
+
+DIAS_DE_HISTORIA = 730
+
+
+def poblar(total):
+    from django.utils import timezone
+    from services.models import Servicio, SolicitudCliente
+
+    categorias = [valor for valor, _ in Servicio.CATEGORIA_CHOICES]
+    estatus = [valor for valor, _ in SolicitudCliente.ESTATUS_CHOICES]
+    servicios = Servicio.objects.bulk_create([
+        Servicio(
+            nombre=f'Servicio {i}', categoria=categoria, descripcion='Descripción',
+            precio_mxn=1000, responsable_email='bench@example.com',
+        )
+        for i, categoria in enumerate(categorias)
+    ])
+    ahora = timezone.now()
+    existentes = SolicitudCliente.objects.count()
+    with sin_auto_now(SolicitudCliente, 'fecha_creacion'):
+        for inicio in range(existentes, total, 10000):
+            SolicitudCliente.objects.bulk_create([
+                SolicitudCliente(
+                    servicio=servicios[i % len(servicios)],
+                    cliente_nombre=f'Cliente {i}',
+                    cliente_email='cliente@example.com',
+                    mensaje='Mensaje de prueba',
+                    estatus=estatus[i % len(estatus)],
+                    # Repartidas a lo largo de la historia, las más recientes primero
+                    fecha_creacion=ahora - datetime.timedelta(minutes=i * DIAS_DE_HISTORIA * 1440 / total),
+                )
+                for i in range(inicio, min(inicio + 10000, total))
+            ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--filas', type=int, nargs='+', default=[10000, 100000])
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    preparar_django()
+    from django.test import Client
+    from django.utils import timezone
+    from services import analitica
+    from services.models import ResumenDiarioSolicitudes, SolicitudCliente
+
+    client = Client()
+    desde = timezone.localdate() - datetime.timedelta(days=89)
+    resultados = []
+    with base_de_datos_temporal():
+        for total in sorted(args.filas):
+            SolicitudCliente.objects.all().delete()
+            ResumenDiarioSolicitudes.objects.all().delete()
+            poblar(total)
+            en_vivo = resumen_ms(medir(lambda: analitica.contar_por_dia(desde), repeticiones=args.repeticiones))
+            analitica.resumir(desde=timezone.localdate() - datetime.timedelta(days=DIAS_DE_HISTORIA + 1))
+            resumido = resumen_ms(medir(
+                lambda: client.get('/api/solicitudes/analitica/', {'dias': 90}), repeticiones=args.repeticiones
+            ))
+            resultados.append((
+                f'{total:,}', f'{en_vivo["p50"]:.1f}', f'{en_vivo["p95"]:.1f}',
+                f'{resumido["p50"]:.1f}', f'{resumido["p95"]:.1f}',
+            ))
+
+    print(f'\nAnalítica de 90 días ({DIAS_DE_HISTORIA} días de historia, ms)\n')
+    imprimir_tabla(
+        ['solicitudes', 'en vivo p50', 'en vivo p95', 'resúmenes p50', 'resúmenes p95'], resultados
+    )
+
+
+if __name__ == '__main__':
+    main()
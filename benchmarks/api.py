@@ -0,0 +1,284 @@
+"""
+Suite de benchmarks de la API: recorre cada ruta de ``core/urls.py`` (y sus
+métodos de escritura) con el cliente de pruebas de Django, con varios
+tamaños de datos generados con ``services.sinteticos``. Por endpoint guarda
+latencia p50/p95/p99, peticiones por segundo (un cliente), consultas SQL y
+bytes de la respuesta.
+
+    python -m benchmarks.api --tamanos 1000 10000 --salida resultados.json
+    python -m benchmarks.regresiones resultados.json --baseline benchmarks/baseline.json
+
+Con ``--guardar`` el resultado reemplaza ``benchmarks/baseline.json``. Cada
+ruta nueva debe agregar aquí su escenario (igual que su presupuesto de
+consultas en ``services/tests/test_query_budgets.py``).
+"""
+import argparse
+import datetime
+import json
+import platform
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from urllib.parse import urlencode
+
+from benchmarks import base_de_datos_temporal, imprimir_tabla, preparar_django, resumen_ms
+
+BASELINE = Path(__file__).with_name('baseline.json')
+
+SEMILLA = 20240101
+
+
+@dataclass
+class Escenario:
+    """
+    Una petición a medir. ``preparar(datos)`` se llama antes de cada
+    repetición, fuera de la medición, y devuelve ``(kwargs de reverse,
+    cuerpo)``; ahí se crean los objetos que la petición consume (p. ej. el
+    que se elimina). ``params`` es la query string, o una función de
+    ``datos`` que la devuelve.
+    """
+    ruta: str
+    metodo: str = 'get'
+    params: object = field(default_factory=dict)
+    preparar: object = None
+    variante: str = ''
+
+    @property
+    def nombre(self):
+        return f'{self.ruta} {self.metodo.upper()}{" " + self.variante if self.variante else ""}'
+
+
+class Datos:
+    """Ids de los objetos existentes y fábricas de objetos nuevos"""
+
+    def __init__(self, hasta):
+        from services.models import Servicio, SolicitudCliente, SolicitudPendiente
+
+        self.hasta = hasta
+        self.servicio = Servicio.objects.order_by('id').values_list('pk', flat=True)[0]
+        self.servicios = list(Servicio.objects.order_by('id').values_list('pk', flat=True)[:10])
+        self.solicitudes = list(SolicitudCliente.objects.order_by('id').values_list('pk', flat=True)[:10])
+        self.pendiente = SolicitudPendiente.objects.create(datos={'servicio': self.servicio}).seguimiento
+
+    def nuevo_servicio(self):
+        from services.models import Servicio
+        return Servicio.objects.create(**servicio_valido()).pk
+
+    def nueva_solicitud(self):
+        from services.models import SolicitudCliente
+        return SolicitudCliente.objects.create(servicio_id=self.servicio, **solicitud_valida()).pk
+
+
+def servicio_valido(**cambios):
+    return {
+        'nombre': 'Servicio de benchmark',
+        'categoria': 'Data',
+        'descripcion': 'Servicio creado por la suite de benchmarks',
+        'precio_mxn': '25000.00',
+        'responsable_email': 'bench@example.com',
+        **cambios,
+    }
+
+
+def solicitud_valida(**cambios):
+    return {
+        'cliente_nombre': 'Cliente de benchmark',
+        'cliente_email': 'bench@example.com',
+        'mensaje': 'Solicitud creada por la suite de benchmarks',
+        **cambios,
+    }
+
+
+ESCENARIOS = [
+    Escenario('api-root'),
+    Escenario('health-check'),
+    Escenario('metrics'),
+    Escenario('servicio-list'),
+    Escenario('servicio-list', params={'contadores': 'true'}, variante='contadores'),
+    Escenario('servicio-list', params={'categoria': 'Web', 'ordering': '-precio_mxn'}, variante='filtros'),
+    Escenario('servicio-list', params={'search': 'migración nube'}, variante='búsqueda'),
+    Escenario('servicio-list', params={'fields': 'nombre,categoria,precio_mxn'}, variante='campos'),
+    Escenario('servicio-list', 'post', preparar=lambda d: ({}, servicio_valido())),
+    Escenario('servicio-detail', preparar=lambda d: ({'pk': d.servicio}, None)),
+    Escenario(
+        'servicio-detail', 'patch',
+        preparar=lambda d: ({'pk': d.servicio}, {'tiempo_estimado_dias': 30}),
+    ),
+    Escenario('servicio-detail', 'delete', preparar=lambda d: ({'pk': d.nuevo_servicio()}, None)),
+    Escenario('servicio-solicitudes', preparar=lambda d: ({'pk': d.servicio}, None)),
+    Escenario('servicio-solicitudes', 'post', preparar=lambda d: ({'pk': d.servicio}, solicitud_valida())),
+    Escenario('servicio-estadisticas'),
+    Escenario(
+        'servicio-bulk', 'post',
+        preparar=lambda d: ({}, [servicio_valido(nombre=f'Lote {i}') for i in range(10)]),
+    ),
+    Escenario(
+        'servicio-bulk', 'patch',
+        preparar=lambda d: ({}, [{'id': pk, 'nivel_prioridad': 4} for pk in d.servicios]),
+    ),
+    Escenario('servicio-bulk-desactivar', 'post', preparar=lambda d: ({}, d.servicios[5:])),
+    Escenario('servicio-desactivar', 'post', params={'categoria': 'Data', 'max_precio': '5000'}),
+    Escenario('servicio-reactivar', 'post', params={'categoria': 'Data', 'max_precio': '5000'}),
+    Escenario('solicitud-list'),
+    Escenario('solicitud-list', params={'estatus': 'nuevo'}, variante='estatus'),
+    Escenario('solicitud-list', params={'omit': 'mensaje'}, variante='sin mensaje'),
+    Escenario('solicitud-list', 'post', preparar=lambda d: ({}, solicitud_valida(servicio=d.servicio))),
+    Escenario('solicitud-detail', preparar=lambda d: ({'pk': d.solicitudes[0]}, None)),
+    Escenario(
+        'solicitud-detail', 'patch',
+        preparar=lambda d: ({'pk': d.solicitudes[0]}, {'estatus': 'en_proceso'}),
+    ),
+    Escenario('solicitud-detail', 'delete', preparar=lambda d: ({'pk': d.nueva_solicitud()}, None)),
+    Escenario('solicitud-analitica'),
+    Escenario(
+        'solicitud-exportar',
+        params=lambda d: {'desde': (d.hasta - datetime.timedelta(days=6)).isoformat(), 'formato': 'csv'},
+        variante='7 días',
+    ),
+    Escenario(
+        'solicitud-bulk', 'post',
+        preparar=lambda d: ({}, [solicitud_valida(servicio=d.servicio) for _ in range(10)]),
+    ),
+    Escenario(
+        'solicitud-bulk', 'patch',
+        preparar=lambda d: ({}, [{'id': pk, 'estatus': 'cerrado'} for pk in d.solicitudes]),
+    ),
+    Escenario('solicitud-pendiente-detail', preparar=lambda d: ({'seguimiento': d.pendiente}, None)),
+    Escenario('solicitud-pendiente-estado'),
+]
+
+
+def verificar_cobertura():
+    """Falla si alguna ruta de ``core/urls.py`` no tiene escenario"""
+    from services.tests.utils import rutas_api
+
+    faltantes = rutas_api() - {escenario.ruta for escenario in ESCENARIOS}
+    if faltantes:
+        raise SystemExit(f'Rutas sin escenario en benchmarks/api.py: {", ".join(sorted(faltantes))}')
+
+
+def poblar(solicitudes, hasta):
+    """
+    Lleva la base de datos a ``solicitudes`` solicitudes (y un servicio por
+    cada 100) hasta el día ``hasta``, agregando solo las que faltan. Con el
+    mismo ``hasta`` los datos son idénticos; con otro, iguales pero
+    desplazados en el tiempo.
+    """
+    from services import analitica
+    from services.models import Servicio, SolicitudCliente
+    from services.sinteticos import GeneradorSintetico
+
+    generador = GeneradorSintetico(semilla=SEMILLA + solicitudes, hasta=hasta, dias=365)
+    faltan = max(20, solicitudes // 100) - Servicio.objects.count()
+    if faltan > 0:
+        generador.servicios(faltan)
+    servicios = list(Servicio.objects.only('pk', 'fecha_publicacion'))
+    generador.solicitudes(servicios, max(0, solicitudes - SolicitudCliente.objects.count()))
+    analitica.resumir(desde=hasta - datetime.timedelta(days=400), hasta=hasta)
+
+
+def medir_escenario(client, escenario, datos, repeticiones, calentamiento):
+    from django.db import connection
+    from django.test.utils import CaptureQueriesContext
+    from django.urls import reverse
+
+    def peticion():
+        kwargs, cuerpo = escenario.preparar(datos) if escenario.preparar else ({}, None)
+        url = reverse(escenario.ruta, kwargs=kwargs)
+        params = escenario.params(datos) if callable(escenario.params) else escenario.params
+        if params:
+            url = f'{url}?{urlencode(params)}'
+        opciones = {} if cuerpo is None else {'data': json.dumps(cuerpo), 'content_type': 'application/json'}
+        inicio = time.perf_counter()
+        response = getattr(client, escenario.metodo)(url, **opciones)
+        if response.streaming:
+            b''.join(response.streaming_content)
+        return time.perf_counter() - inicio, response
+
+    # CaptureQueriesContext cuenta por diferencia sobre queries_log, que
+    # tiene tamaño máximo: se vacía para que no esté lleno
+    connection.queries_log.clear()
+    with CaptureQueriesContext(connection) as consultas:
+        _, response = peticion()
+    if response.status_code >= 400:
+        raise SystemExit(f'{escenario.nombre}: respuesta {response.status_code}')
+    for _ in range(calentamiento - 1):
+        peticion()
+    tiempos = [peticion()[0] for _ in range(repeticiones)]
+    resumen = resumen_ms(tiempos)
+    return {
+        'p50_ms': round(resumen['p50'], 3),
+        'p95_ms': round(resumen['p95'], 3),
+        'p99_ms': round(resumen['p99'], 3),
+        'rps': round(len(tiempos) / sum(tiempos), 1),
+        'consultas': len(consultas),
+        'bytes': None if response.streaming else len(response.content),
+        'estatus': response.status_code,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--tamanos', type=int, nargs='+', default=[1000, 10000],
+                        help='Número de solicitudes de cada conjunto de datos')
+    parser.add_argument('--repeticiones', type=int, default=50)
+    parser.add_argument('--calentamiento', type=int, default=3)
+    parser.add_argument('--rutas', nargs='+', help='Solo los escenarios de estas rutas')
+    parser.add_argument('--salida', type=Path, help='Archivo JSON con los resultados')
+    parser.add_argument('--guardar', action='store_true', help=f'Escribir los resultados en {BASELINE.name}')
+    args = parser.parse_args()
+
+    preparar_django()
+    import django
+    from django.db import connection
+    from django.test import Client
+    from django.test.utils import override_settings
+    from django.utils import timezone
+
+    verificar_cobertura()
+    hasta = timezone.localdate() - datetime.timedelta(days=1)
+    escenarios = [e for e in ESCENARIOS if not args.rutas or e.ruta in args.rutas]
+    resultado = {
+        'generado': datetime.datetime.now().isoformat(timespec='seconds'),
+        'entorno': {
+            'python': platform.python_version(),
+            'django': django.get_version(),
+            'base_de_datos': connection.vendor,
+            'maquina': platform.machine(),
+        },
+        'repeticiones': args.repeticiones,
+        'resultados': {},
+    }
+
+    client = Client()
+    # /api/metrics se mide sin token aunque DEBUG sea False
+    with base_de_datos_temporal(), override_settings(METRICAS_PUBLICAS=True):
+        for tamano in sorted(args.tamanos):
+            print(f'Poblando {tamano:,} solicitudes...', file=sys.stderr)
+            poblar(tamano, hasta)
+            datos = Datos(hasta)
+            por_escenario = {}
+            for escenario in escenarios:
+                por_escenario[escenario.nombre] = medir_escenario(
+                    client, escenario, datos, args.repeticiones, args.calentamiento
+                )
+            resultado['resultados'][str(tamano)] = por_escenario
+
+            print(f'\n{tamano:,} solicitudes ({args.repeticiones} repeticiones, ms)\n')
+            imprimir_tabla(
+                ['endpoint', 'p50', 'p95', 'p99', 'req/s', 'consultas', 'bytes'],
+                [
+                    (nombre, m['p50_ms'], m['p95_ms'], m['p99_ms'], m['rps'], m['consultas'], m['bytes'] or '-')
+                    for nombre, m in por_escenario.items()
+                ],
+            )
+
+    contenido = json.dumps(resultado, indent=2, ensure_ascii=False) + '\n'
+    for destino in filter(None, [args.salida, BASELINE if args.guardar else None]):
+        destino.write_text(contenido, encoding='utf-8')
+        print(f'\nResultados en {destino}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+"""
+Carga concurrente sobre el catálogo público servido con gunicorn en modo
+WSGI (workers síncronos) y en modo ASGI (workers de uvicorn con las vistas
+asíncronas de ``services.async_views``).
+
+Cada consulta SQL tarda además ``--latencia-ms`` para simular una base de
+datos remota, que es donde un worker síncrono se queda bloqueado.
+
+    python -m benchmarks.asgi --concurrencia 200 --peticiones 2000 --latencia-ms 20
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+from benchmarks import imprimir_tabla, resumen_ms
+
+RAIZ = Path(__file__).resolve().parent.parent
+
+SERVIDORES = {
+    'WSGI (sync)': ['core.wsgi', '-k', 'sync'],
+    'ASGI (uvicorn)': ['core.asgi:application', '-k', 'uvicorn.workers.UvicornWorker'],
+}
+
+
+def poblar(entorno, servicios):
+    codigo = (
+        'from benchmarks import preparar_django; preparar_django()\n'
+        'from django.core.management import call_command\n'
+        'from services.models import Servicio\n'
+        'from services.search import reindexar_todo\n'
+        'call_command("migrate", verbosity=0)\n'
+        'Servicio.objects.bulk_create([Servicio(nombre=f"Servicio {i}", categoria="Web", '
+        'descripcion="Descripción", precio_mxn=1000 + i, responsable_email="bench@example.com") '
+        f'for i in range({servicios})])\n'
+        'reindexar_todo()\n'
+    )
+    subprocess.run([sys.executable, '-c', codigo], cwd=RAIZ, env=entorno, check=True)
+
+
+def puerto_libre():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def esperar_puerto(puerto, limite=30):
+    fin = time.monotonic() + limite
+    while time.monotonic() < fin:
+        try:
+            with socket.create_connection(('127.0.0.1', puerto), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f'El servidor no respondió en el puerto {puerto}')
+
+
+async def peticion(puerto, ruta):
+    reader, writer = await asyncio.open_connection('127.0.0.1', puerto)
+    writer.write(
+        f'GET {ruta} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n'.encode()
+    )
+    await writer.drain()
+    respuesta = await reader.read()
+    writer.close()
+    return int(respuesta.split(b' ', 2)[1])
+
+
+async def carga(puerto, ruta, concurrencia, peticiones):
+    """Lanza ``peticiones`` GET con ``concurrencia`` clientes simultáneos"""
+    tiempos = []
+    errores = 0
+    pendientes = iter(range(peticiones))
+
+    async def cliente():
+        nonlocal errores
+        for _ in pendientes:
+            inicio = time.perf_counter()
+            try:
+                codigo = await peticion(puerto, ruta)
+            except OSError:
+                codigo = None
+            tiempos.append(time.perf_counter() - inicio)
+            if codigo != 200:
+                errores += 1
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(cliente() for _ in range(concurrencia)))
+    return tiempos, errores, time.perf_counter() - inicio
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--concurrencia', type=int, default=200)
+    parser.add_argument('--peticiones', type=int, default=2000)
+    parser.add_argument('--latencia-ms', type=float, default=20)
+    parser.add_argument('--servicios', type=int, default=500)
+    parser.add_argument('--ruta', default='/api/servicios/?categoria=Web')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directorio:
+        entorno = {
+            **os.environ,
+            'DJANGO_SETTINGS_MODULE': 'benchmarks.settings_latencia',
+            'DATABASE_URL': f'sqlite:///{directorio}/benchmark.sqlite3',
+            'DEBUG': 'False',
+            'ALLOWED_HOSTS': '127.0.0.1',
+            'BENCH_LATENCIA_MS': '0',
+        }
+        poblar(entorno, args.servicios)
+        entorno['BENCH_LATENCIA_MS'] = str(args.latencia_ms)
+
+        filas = []
+        for nombre, aplicacion in SERVIDORES.items():
+            puerto = puerto_libre()
+            servidor = subprocess.Popen(
+                # Sin los reinicios por max_requests de gunicorn.conf.py
+                ['gunicorn', *aplicacion, '--workers', str(args.workers), '--max-requests', '0',
+                 '--bind', f'127.0.0.1:{puerto}', '--log-level', 'warning'],
+                cwd=RAIZ, env=entorno,
+            )
+            try:
+                esperar_puerto(puerto)
+                asyncio.run(carga(puerto, args.ruta, 10, 50))  # calentamiento
+                tiempos, errores, total = asyncio.run(
+                    carga(puerto, args.ruta, args.concurrencia, args.peticiones)
+                )
+            finally:
+                servidor.terminate()
+                servidor.wait()
+            r = resumen_ms(tiempos)
+            filas.append((
+                nombre, f'{args.peticiones / total:,.0f}',
+                f"{r['p50']:.0f}", f"{r['p95']:.0f}", errores,
+            ))
+
+    print(f'\n{args.ruta} — {args.workers} workers, {args.concurrencia} clientes, '
+          f'{args.latencia_ms:g} ms por consulta\n')
+    imprimir_tabla(['servidor', 'req/s', 'p50 ms', 'p95 ms', 'errores'], filas)
+
+
+if __name__ == '__main__':
+    main()
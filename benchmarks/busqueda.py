@@ -0,0 +1,83 @@
+"""
+Latencia de la búsqueda de servicios (``?search=``) con la búsqueda de texto
+completo frente al ``icontains`` anterior, a varios tamaños de catálogo.
+
+    python -m benchmarks.busqueda --tamanos 10000,100000
+"""
+import argparse
+import random
+
+from benchmarks import base_de_datos_temporal, imprimir_tabla, medir, preparar_django, resumen_ms
+
+PALABRAS = (
+    'desarrollo aplicaciones web móvil nube migración datos análisis seguridad auditoría '
+    'consultoría plataforma integración sistemas infraestructura servidores soporte '
+    'capacitación automatización pruebas diseño interfaces arquitectura microservicios'
+).split()
+
+
+# Vocabulario de relleno para que cada término aparezca en pocos servicios,
+# como en un catálogo real.
+RELLENO = [f'termino{i}' for i in range(5000)]
+
+
+def poblar(total, existentes):
+    from services.models import Servicio
+
+    rnd = random.Random(total)
+    vocabulario = PALABRAS + RELLENO
+    for inicio in range(existentes, total, 5000):
+        Servicio.objects.bulk_create([
+            Servicio(
+                nombre=' '.join(rnd.sample(PALABRAS, 3)).capitalize(),
+                categoria=rnd.choice(Servicio.CATEGORIA_CHOICES)[0],
+                descripcion=' '.join(rnd.choices(vocabulario, k=60)),
+                precio_mxn=rnd.randint(1000, 200000),
+                responsable_email='bench@example.com',
+            )
+            for _ in range(inicio, min(inicio + 5000, total))
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--tamanos', default='10000,100000')
+    parser.add_argument('--repeticiones', type=int, default=10)
+    args = parser.parse_args()
+
+    preparar_django()
+    from django.db.models import Q
+    from django.test import Client
+    from services.models import Servicio
+    from services.search import reindexar_todo
+
+    consultas = ['movil', 'termino42', 'microservicios termino7', 'zzz']
+    filas = []
+    with base_de_datos_temporal():
+        client = Client()
+        existentes = 0
+        for tamano in [int(t) for t in args.tamanos.split(',')]:
+            poblar(tamano, existentes)
+            existentes = tamano
+            reindexar_todo()
+            for consulta in consultas:
+                def texto_completo():
+                    client.get('/api/servicios/', {'search': consulta})
+
+                def icontains():
+                    queryset = Servicio.objects.filter(
+                        Q(nombre__icontains=consulta) | Q(descripcion__icontains=consulta)
+                    )
+                    queryset.count()
+                    list(queryset[:20])
+
+                for nombre, funcion in (('texto completo', texto_completo), ('icontains', icontains)):
+                    r = resumen_ms(medir(funcion, repeticiones=args.repeticiones))
+                    filas.append((tamano, consulta, nombre, f"{r['p50']:.2f}", f"{r['p95']:.2f}"))
+
+    print('\nBúsqueda de servicios\n')
+    imprimir_tabla(['servicios', 'consulta', 'motor', 'p50 ms', 'p95 ms'], filas)
+
+
+if __name__ == '__main__':
+    main()
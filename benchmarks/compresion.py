@@ -0,0 +1,116 @@
+"""
+Compresión de las respuestas: bytes en la red y CPU.
+
+Con servicios de descripciones largas mide, para una página del listado (20
+servicios, la de la API) y una de 100:
+
+- bytes y tiempo de compresión (ms, p50) de cada codificación y nivel;
+- el ``GET`` completo por el middleware sin compresión, comprimiendo en cada
+  petición y reutilizando los bytes comprimidos de la caché.
+
+    python -m benchmarks.compresion --servicios 200 --repeticiones 50
+"""
+import argparse
+import random
+
+from benchmarks import base_de_datos_temporal, imprimir_tabla, medir, preparar_django, resumen_ms
+
+PALABRAS = (
+    'desarrollo aplicaciones web móviles nube migración servidores datos análisis seguridad '
+    'auditoría consultoría arquitectura integración pagos inventario clientes reportes tablero '
+    'automatización pruebas despliegue contenedores monitoreo respaldo recuperación red acceso '
+    'usuarios permisos catálogo pedidos facturación soporte capacitación rendimiento escalabilidad '
+    'disponibilidad infraestructura base interfaz diseño experiencia accesibilidad optimización'
+).split()
+
+
+def descripcion(generador, palabras=180):
+    return ' '.join(generador.choice(PALABRAS) for _ in range(palabras)).capitalize() + '.'
+
+
+def poblar(total):
+    from services.models import Servicio
+
+    generador = random.Random(20240101)
+    Servicio.objects.bulk_create([
+        Servicio(
+            nombre=f'Servicio {i}', categoria='Web', descripcion=descripcion(generador),
+            precio_mxn=1000 + i, responsable_email='bench@example.com',
+        )
+        for i in range(total)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--servicios', type=int, default=200)
+    parser.add_argument('--repeticiones', type=int, default=50)
+    args = parser.parse_args()
+
+    preparar_django()
+    from django.core.cache import cache
+    from django.test import Client
+    from django.test.utils import override_settings
+    from django.urls import reverse
+
+    from core import compresion
+    from core.renderers import FastJSONRenderer
+    from services.fast import ValuesRepresentation
+    from services.models import Servicio
+    from services.serializers import ServicioSerializer
+
+    niveles = [('gzip', 1), ('gzip', 6), ('gzip', 9)]
+    if compresion.brotli is not None:
+        niveles += [('br', 1), ('br', 5), ('br', 11)]
+
+    with base_de_datos_temporal(), override_settings(ALLOWED_HOSTS=['testserver']):
+        poblar(args.servicios)
+        client = Client()
+        url = reverse('servicio-list')
+        representacion = ValuesRepresentation.para(ServicioSerializer)
+        cuerpos = [
+            ('página de 20', client.get(url).content),
+            ('página de 100', FastJSONRenderer().render(
+                representacion.many(representacion.preparar(Servicio.objects.all()[:100]))
+            )),
+        ]
+
+        filas = []
+        for nombre, cuerpo in cuerpos:
+            filas.append((nombre, 'sin comprimir', '-', len(cuerpo), '100 %', '-'))
+            for codificacion, nivel in niveles:
+                configuracion = {
+                    'COMPRESION_NIVEL_GZIP' if codificacion == 'gzip' else 'COMPRESION_NIVEL_BROTLI': nivel
+                }
+                with override_settings(**configuracion):
+                    comprimido = compresion.comprimir(cuerpo, codificacion)
+                    ms = resumen_ms(medir(
+                        lambda: compresion.comprimir(cuerpo, codificacion), repeticiones=args.repeticiones
+                    ))['p50']
+                filas.append((
+                    nombre, codificacion, nivel, len(comprimido),
+                    f'{len(comprimido) / len(cuerpo):.0%}', f'{ms:.3f}',
+                ))
+
+        print(f'\nCompresión de la respuesta (p50 de {args.repeticiones})\n')
+        imprimir_tabla(['cuerpo', 'codificación', 'nivel', 'bytes', 'del original', 'ms'], filas)
+
+        casos = [('sin compresión', '', 300)]
+        for codificacion in compresion.codificaciones_disponibles()[::-1]:
+            casos += [(f'{codificacion}, sin caché', codificacion, 0), (f'{codificacion}, con caché', codificacion, 300)]
+
+        filas = []
+        for nombre, codificacion, segundos in casos:
+            cache.clear()
+            with override_settings(COMPRESION_CACHE_SEGUNDOS=segundos):
+                peticion = lambda: client.get(url, HTTP_ACCEPT_ENCODING=codificacion)
+                tiempos = resumen_ms(medir(peticion, repeticiones=args.repeticiones))
+                response = peticion()
+            filas.append((nombre, f'{tiempos["p50"]:.3f}', f'{tiempos["p95"]:.3f}', len(response.content)))
+
+        print(f'\nGET /api/servicios/ por el middleware (ms, {args.repeticiones} repeticiones)\n')
+        imprimir_tabla(['caso', 'p50', 'p95', 'bytes'], filas)
+
+
+if __name__ == '__main__':
+    main()
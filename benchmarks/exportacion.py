@@ -0,0 +1,67 @@
+"""
+Memoria y tiempo de la exportación en streaming de solicitudes, para varios
+tamaños: el pico de memoria debe ser el mismo con 10 mil que con 1 millón de
+filas.
+
+    python -m benchmarks.exportacion --filas 10000 100000 1000000
+"""
+import argparse
+import time
+import tracemalloc
+
+from benchmarks import base_de_datos_temporal, imprimir_tabla, preparar_django
+
+
+def poblar(total):
+    from services.models import Servicio, SolicitudCliente
+
+    servicio = Servicio.objects.create(
+        nombre='Servicio', categoria='Web', descripcion='Descripción',
+        precio_mxn=1000, responsable_email='bench@example.com',
+    )
+    existentes = SolicitudCliente.objects.count()
+    for inicio in range(existentes, total, 10000):
+        SolicitudCliente.objects.bulk_create([
+            SolicitudCliente(
+                servicio=servicio,
+                cliente_nombre=f'Cliente {i}',
+                cliente_email='cliente@example.com',
+                mensaje='Mensaje de prueba para la exportación',
+            )
+            for i in range(inicio, min(inicio + 10000, total))
+        ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--filas', type=int, nargs='+', default=[10000, 100000])
+    args = parser.parse_args()
+
+    preparar_django()
+    from services import export
+    from services.models import SolicitudCliente
+
+    resultados = []
+    with base_de_datos_temporal():
+        for total in sorted(args.filas):
+            poblar(total)
+            for formato in export.FORMATOS:
+                tracemalloc.start()
+                inicio = time.perf_counter()
+                tamano = sum(
+                    len(bloque) for bloque in export.generar(SolicitudCliente.objects.all(), formato)
+                )
+                segundos = time.perf_counter() - inicio
+                _, pico = tracemalloc.get_traced_memory()
+                tracemalloc.stop()
+                resultados.append((
+                    f'{total:,}', formato, f'{segundos:.2f}',
+                    f'{total / segundos:,.0f}', f'{tamano / 2**20:.1f}', f'{pico / 2**20:.1f}',
+                ))
+
+    print('\nExportación de solicitudes\n')
+    imprimir_tabla(['filas', 'formato', 's', 'filas/s', 'MiB generados', 'pico MiB'], resultados)
+
+
+if __name__ == '__main__':
+    main()
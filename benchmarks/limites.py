@@ -0,0 +1,75 @@
+"""
+Costo del límite token bucket por petición (``allow_request`` de
+``SolicitudIPThrottle`` y ``SolicitudServicioThrottle``), sin la vista. Usa
+la caché configurada: en memoria, o Redis con ``REDIS_URL``. El objetivo es
+menos de 1 ms por petición; con Redis casi todo es la ida y vuelta a la red.
+
+    python -m benchmarks.limites --repeticiones 10000
+    REDIS_URL=redis://localhost:6379/0 python -m benchmarks.limites
+"""
+import argparse
+
+from benchmarks import imprimir_tabla, medir, preparar_django, resumen_ms
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--repeticiones', type=int, default=10000)
+    parser.add_argument('--clientes', type=int, default=1000)
+    args = parser.parse_args()
+
+    preparar_django()
+    from django.conf import settings
+    from django.core.cache import cache
+    from django.test import override_settings
+    from rest_framework.parsers import JSONParser
+    from rest_framework.request import Request
+    from rest_framework.test import APIRequestFactory
+    from services.throttling import SolicitudIPThrottle, SolicitudServicioThrottle
+
+    class Vista:
+        kwargs = {}
+
+    factory = APIRequestFactory()
+    peticiones = [
+        Request(
+            factory.post(
+                '/api/solicitudes/', {'servicio': i % 50}, format='json',
+                REMOTE_ADDR=f'10.0.{i // 256}.{i % 256}',
+            ),
+            parsers=[JSONParser()],
+        )
+        for i in range(args.clientes)
+    ]
+    for peticion in peticiones:
+        peticion.data  # El cuerpo ya viene parseado cuando se evalúan los límites
+
+    casos = [
+        ('por IP (aceptada)', SolicitudIPThrottle, '1000000/min', peticiones),
+        ('por servicio (aceptada)', SolicitudServicioThrottle, '1000000/min', peticiones),
+        ('por IP (rechazada)', SolicitudIPThrottle, '1/day', peticiones[:1]),
+    ]
+    resultados = []
+    for nombre, throttle_class, tasa, muestra in casos:
+        rest_framework = {
+            **settings.REST_FRAMEWORK,
+            'DEFAULT_THROTTLE_RATES': {throttle_class.scope: tasa},
+        }
+        with override_settings(REST_FRAMEWORK=rest_framework):
+            cache.clear()
+            contador = iter(range(10 ** 9))
+
+            def revisar():
+                throttle_class().allow_request(muestra[next(contador) % len(muestra)], Vista())
+
+            tiempos = resumen_ms(medir(revisar, repeticiones=args.repeticiones, calentamiento=len(muestra)))
+        resultados.append((nombre, f'{tiempos["p50"]:.3f}', f'{tiempos["p95"]:.3f}', f'{tiempos["max"]:.3f}'))
+    cache.clear()
+
+    backend = settings.CACHES['default']['BACKEND'].rsplit('.', 1)[-1]
+    print(f'\nLímite token bucket por petición ({backend}, ms)\n')
+    imprimir_tabla(['caso', 'p50', 'p95', 'max'], resultados)
+
+
+if __name__ == '__main__':
+    main()
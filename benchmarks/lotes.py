@@ -0,0 +1,81 @@
+"""
+Throughput de la creación en lote (/bulk/) frente a una petición por fila,
+para servicios y solicitudes.
+
+    python -m benchmarks.lotes --filas 500 --repeticiones 5
+"""
+import argparse
+import json
+
+from benchmarks import base_de_datos_temporal, imprimir_tabla, medir, preparar_django, resumen_ms
+
+
+def servicios(filas):
+    return [
+        {
+            'nombre': f'Servicio {i}',
+            'categoria': 'Data',
+            'descripcion': 'Análisis de datos para el catálogo',
+            'precio_mxn': '25000.00',
+            'responsable_email': 'bench@example.com',
+        }
+        for i in range(filas)
+    ]
+
+
+def solicitudes(filas, servicio_id):
+    return [
+        {
+            'servicio': servicio_id,
+            'cliente_nombre': f'Cliente {i}',
+            'cliente_email': 'cliente@example.com',
+            'mensaje': 'Mensaje de prueba',
+        }
+        for i in range(filas)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--filas', type=int, default=500)
+    parser.add_argument('--repeticiones', type=int, default=5)
+    args = parser.parse_args()
+
+    preparar_django()
+    from django.test import Client
+
+    with base_de_datos_temporal():
+        client = Client()
+        servicio_id = client.post(
+            '/api/servicios/', json.dumps(servicios(1)[0]), content_type='application/json'
+        ).json()['id']
+        casos = [
+            ('/api/servicios/', servicios(args.filas)),
+            ('/api/solicitudes/', solicitudes(args.filas, servicio_id)),
+        ]
+
+        filas = []
+        for url, lote in casos:
+            cuerpos = [json.dumps(elemento) for elemento in lote]
+
+            def una_por_fila():
+                for cuerpo in cuerpos:
+                    response = client.post(url, cuerpo, content_type='application/json')
+                    assert response.status_code == 201, response.content
+
+            def en_lote():
+                response = client.post(f'{url}bulk/', json.dumps(lote), content_type='application/json')
+                assert response.status_code == 201, response.content
+
+            for modo, funcion in (('una por fila', una_por_fila), ('bulk', en_lote)):
+                r = resumen_ms(medir(funcion, repeticiones=args.repeticiones, calentamiento=1))
+                filas.append((
+                    url, modo, f"{r['p50']:.1f}", f"{args.filas / r['p50'] * 1000:,.0f}",
+                ))
+
+        print(f'\nCreación de {args.filas} filas\n')
+        imprimir_tabla(['endpoint', 'modo', 'p50 ms', 'filas/s'], filas)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+"""
+Latencia de la página 1 frente a una página profunda, con paginación por
+número de página (COUNT + OFFSET) y con paginación por cursor (keyset).
+
+    python -m benchmarks.paginacion --solicitudes 50000 --pagina 1000
+"""
+import argparse
+import random
+from datetime import timedelta
+
+from benchmarks import (
+    base_de_datos_temporal, imprimir_tabla, medir, preparar_django, resumen_ms, sin_auto_now,
+)
+
+
+def poblar(total_servicios, total_solicitudes):
+    from django.utils import timezone
+    from services.models import Servicio, SolicitudCliente
+
+    rnd = random.Random(42)
+    hoy = timezone.now()
+    with sin_auto_now(Servicio, 'fecha_publicacion'):
+        servicios = Servicio.objects.bulk_create([
+            Servicio(
+                nombre=f'Servicio {i}',
+                categoria=rnd.choice(Servicio.CATEGORIA_CHOICES)[0],
+                descripcion='Descripción de prueba',
+                precio_mxn=rnd.randint(1000, 200000),
+                responsable_email='bench@example.com',
+                fecha_publicacion=(hoy - timedelta(days=rnd.randint(0, 730))).date(),
+            )
+            for i in range(total_servicios)
+        ])
+    with sin_auto_now(SolicitudCliente, 'fecha_creacion'):
+        for inicio in range(0, total_solicitudes, 5000):
+            SolicitudCliente.objects.bulk_create([
+                SolicitudCliente(
+                    servicio=rnd.choice(servicios),
+                    cliente_nombre=f'Cliente {i}',
+                    cliente_email='cliente@example.com',
+                    mensaje='Mensaje de prueba',
+                    estatus=rnd.choice(SolicitudCliente.ESTATUS_CHOICES)[0],
+                    fecha_creacion=hoy - timedelta(seconds=rnd.randint(0, 365 * 86400)),
+                )
+                for i in range(inicio, min(inicio + 5000, total_solicitudes))
+            ])
+
+
+def cursor_en_pagina(queryset, pagina, tamano):
+    """Cursor equivalente a haber recorrido ``pagina - 1`` páginas"""
+    from core.pagination import KeysetPagination
+
+    paginador = KeysetPagination()
+    paginador.ordering = paginador.get_ordering(queryset)
+    orden = [f'-{c}' if d else c for c, d in paginador.ordering]
+    fila = queryset.order_by(*orden)[(pagina - 1) * tamano - 1]
+    return paginador.encode_cursor(fila)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--servicios', type=int, default=25000)
+    parser.add_argument('--solicitudes', type=int, default=50000)
+    parser.add_argument('--pagina', type=int, default=1000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    preparar_django()
+    from django.conf import settings
+    from django.test import Client
+    from services.models import Servicio, SolicitudCliente
+
+    tamano = settings.REST_FRAMEWORK['PAGE_SIZE']
+    with base_de_datos_temporal():
+        poblar(args.servicios, args.solicitudes)
+        client = Client()
+        casos = [
+            ('/api/solicitudes/', SolicitudCliente.objects.all()),
+            ('/api/servicios/', Servicio.objects.all()),
+            ('/api/servicios/?ordenar_por=precio_desc', Servicio.objects.order_by('-precio_mxn')),
+        ]
+
+        filas = []
+        for url, queryset in casos:
+            separador = '&' if '?' in url else '?'
+            paginas = queryset.count() // tamano
+            profunda = min(args.pagina, paginas)
+            variantes = [
+                ('page', 1, f'{url}{separador}page=1'),
+                ('page', profunda, f'{url}{separador}page={profunda}'),
+                ('cursor', 1, f'{url}{separador}paginacion=cursor'),
+                ('cursor', profunda,
+                 f'{url}{separador}cursor={cursor_en_pagina(queryset, profunda, tamano)}'),
+            ]
+            for modo, pagina, ruta in variantes:
+                assert client.get(ruta).status_code == 200, ruta
+                tiempos = medir(lambda: client.get(ruta), repeticiones=args.repeticiones)
+                r = resumen_ms(tiempos)
+                filas.append((url, modo, pagina, f"{r['p50']:.2f}", f"{r['p95']:.2f}"))
+
+        print(f'\nPaginación ({args.solicitudes} solicitudes, {args.servicios} servicios, '
+              f'{tamano} por página)\n')
+        imprimir_tabla(['endpoint', 'modo', 'página', 'p50 ms', 'p95 ms'], filas)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Compara resultados de ``benchmarks.api`` con el baseline y marca las
+regresiones: más consultas SQL que antes, o una latencia (p50 por defecto,
+la más estable) más de ``--umbral`` por encima de la del baseline y por más de
+``--minimo-ms``, para no marcar el ruido de los endpoints de décimas de
+milisegundo. Sale con código 1 si hay alguna.
+
+    python -m benchmarks.regresiones resultados.json
+    python -m benchmarks.regresiones resultados.json --baseline otro.json --umbral 0.25 --metrica p95_ms
+
+Las latencias solo son comparables en la misma máquina y base de datos; el
+número de consultas, en cualquiera.
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+from benchmarks import imprimir_tabla
+
+BASELINE = Path(__file__).with_name('baseline.json')
+
+METRICAS = ('p50_ms', 'p95_ms', 'p99_ms')
+
+
+def comparar(actual, baseline, umbral=0.5, minimo_ms=1.0, metrica='p50_ms'):
+    """
+    Lista de ``(tamaño, endpoint, motivo, antes, después)`` con las
+    regresiones de ``actual`` respecto a ``baseline`` (ambos como los
+    escribe ``benchmarks.api``). Solo se comparan tamaños y endpoints
+    presentes en los dos.
+    """
+    regresiones = []
+    for tamano, endpoints in actual['resultados'].items():
+        anteriores = baseline['resultados'].get(tamano, {})
+        for endpoint, medida in endpoints.items():
+            anterior = anteriores.get(endpoint)
+            if anterior is None:
+                continue
+            if medida['consultas'] > anterior['consultas']:
+                regresiones.append((tamano, endpoint, 'consultas', anterior['consultas'], medida['consultas']))
+            antes, despues = anterior[metrica], medida[metrica]
+            if despues > antes * (1 + umbral) and despues - antes > minimo_ms:
+                regresiones.append((tamano, endpoint, metrica, antes, despues))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('resultados', type=Path, help='JSON escrito por benchmarks.api --salida')
+    parser.add_argument('--baseline', type=Path, default=BASELINE)
+    parser.add_argument('--umbral', type=float, default=0.5, help='Aumento relativo tolerado (0.5 = 50%%)')
+    parser.add_argument('--minimo-ms', type=float, default=1.0, help='Aumento absoluto tolerado en ms')
+    parser.add_argument('--metrica', choices=METRICAS, default='p50_ms')
+    args = parser.parse_args()
+
+    actual = json.loads(args.resultados.read_text(encoding='utf-8'))
+    baseline = json.loads(args.baseline.read_text(encoding='utf-8'))
+    if actual.get('entorno') != baseline.get('entorno'):
+        print(
+            f'Aviso: entornos distintos ({baseline.get("entorno")} → {actual.get("entorno")}); '
+            'las latencias pueden no ser comparables',
+            file=sys.stderr,
+        )
+
+    regresiones = comparar(actual, baseline, args.umbral, args.minimo_ms, args.metrica)
+    if not regresiones:
+        print('Sin regresiones respecto al baseline')
+        return
+    print(f'{len(regresiones)} regresiones respecto a {args.baseline}:\n')
+    imprimir_tabla(
+        ['solicitudes', 'endpoint', 'métrica', 'antes', 'después'],
+        [(f'{int(tamano):,}', endpoint, motivo, antes, despues) for tamano, endpoint, motivo, antes, despues in regresiones],
+    )
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Costo de representar y renderizar listas de servicios y solicitudes, por
+cada 1,000 filas: serializer de DRF + JSONRenderer contra
+ValuesRepresentation + FastJSONRenderer (la ruta de list/retrieve). Ambos
+caminos incluyen la consulta y deben producir los mismos bytes.
+
+    python -m benchmarks.serializacion --filas 1000 --repeticiones 20
+"""
+import argparse
+
+from benchmarks import base_de_datos_temporal, imprimir_tabla, medir, preparar_django, resumen_ms
+
+
+def poblar(total):
+    from services.models import Servicio, SolicitudCliente
+
+    servicios = Servicio.objects.bulk_create([
+        Servicio(
+            nombre=f'Servicio {i}', categoria='Web', descripcion='Descripción del servicio',
+            precio_mxn=1000 + i, responsable_email='bench@example.com',
+        )
+        for i in range(total)
+    ])
+    SolicitudCliente.objects.bulk_create([
+        SolicitudCliente(
+            servicio=servicios[i % len(servicios)],
+            cliente_nombre=f'Cliente {i}',
+            cliente_email='cliente@example.com',
+            mensaje='Mensaje de prueba para la serialización',
+        )
+        for i in range(total)
+    ])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--filas', type=int, default=1000)
+    parser.add_argument('--repeticiones', type=int, default=20)
+    args = parser.parse_args()
+
+    preparar_django()
+    from rest_framework.renderers import JSONRenderer
+    from core.renderers import FastJSONRenderer
+    from services.fast import ValuesRepresentation
+    from services.models import Servicio, SolicitudCliente
+    from services.serializers import ServicioSerializer, SolicitudClienteSerializer
+
+    casos = [
+        ('servicios', ServicioSerializer, Servicio.objects.all()),
+        ('solicitudes', SolicitudClienteSerializer, SolicitudCliente.objects.select_related('servicio')),
+    ]
+    por_mil = 1000 / args.filas
+    resultados = []
+    with base_de_datos_temporal():
+        poblar(args.filas)
+        for nombre, serializer_class, queryset in casos:
+            representacion = ValuesRepresentation.para(serializer_class)
+
+            def drf():
+                return JSONRenderer().render(serializer_class(queryset.all(), many=True).data)
+
+            def rapido():
+                return FastJSONRenderer().render(representacion.many(representacion.preparar(queryset.all())))
+
+            if drf() != rapido():
+                raise SystemExit(f'{nombre}: las salidas no coinciden')
+            ms_drf = resumen_ms(medir(drf, repeticiones=args.repeticiones))['p50']
+            ms_rapido = resumen_ms(medir(rapido, repeticiones=args.repeticiones))['p50']
+            resultados.append((
+                nombre, f'{ms_drf * por_mil:.1f}', f'{ms_rapido * por_mil:.1f}',
+                f'{ms_drf / ms_rapido:.1f}x',
+            ))
+
+    print(f'\nSerialización de listas (ms por 1,000 filas, p50 de {args.repeticiones})\n')
+    imprimir_tabla(['lista', 'DRF', 'values + orjson', 'mejora'], resultados)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,26 @@
+"""
+Settings para los benchmarks de carga: los de ``core.settings`` más una
+latencia artificial por consulta SQL (``BENCH_LATENCIA_MS``), para simular
+una base de datos en otra máquina.
+"""
+import os
+import time
+
+from django.db.backends.signals import connection_created
+
+from core.settings import *  # noqa: F401,F403
+
+LATENCIA = float(os.getenv('BENCH_LATENCIA_MS', '0')) / 1000
+
+
+def _con_latencia(execute, sql, params, many, context):
+    time.sleep(LATENCIA)
+    return execute(sql, params, many, context)
+
+
+def _instalar_latencia(sender, connection, **kwargs):
+    if LATENCIA and _con_latencia not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_con_latencia)
+
+
+connection_created.connect(_instalar_latencia)
@@ -12,6 +12,10 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'core.settings')
+# Con ASGI cada petición corre su código síncrono en un hilo propio, así que
+# una conexión persistente no se reutilizaría y quedaría abierta: se cierra al
+# terminar la petición, aunque el entorno traiga otro DB_CONN_MAX_AGE
+os.environ['DB_CONN_MAX_AGE'] = '0'
 
 application = get_asgi_application()
 
@@ -0,0 +1,184 @@
+"""
+Compresión negociada de las respuestas (brotli o gzip).
+
+``CompresionMiddleware`` elige la codificación con ``Accept-Encoding``
+(brotli si el paquete ``brotli`` está instalado y el cliente lo acepta con
+igual o mayor preferencia, si no gzip) y comprime las respuestas de los
+tipos de ``COMPRESION_TIPOS`` desde ``COMPRESION_MINIMO_BYTES``. Las
+respuestas en flujo (exportaciones) se comprimen bloque por bloque, sin
+esperar al final.
+
+Las respuestas con ``ETag`` son las lecturas que se repiten idénticas hasta
+que cambian los datos: sus bytes comprimidos se guardan en la caché
+(``COMPRESION_CACHE_SEGUNDOS``) con la huella del cuerpo como clave, así que
+las siguientes peticiones iguales no se vuelven a comprimir. Con
+``REDIS_URL`` la caché es compartida por todos los workers.
+
+No se comprime HTML (el admin y la API navegable llevan el token CSRF; ver
+BREACH). Como Django con ``GZipMiddleware``, el ``ETag`` se vuelve débil al
+comprimir; ``If-None-Match`` e ``If-Match`` aceptan la versión débil.
+"""
+import gzip
+import hashlib
+import zlib
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import caches
+from django.core.exceptions import MiddlewareNotUsed
+from django.utils.cache import patch_vary_headers
+
+try:
+    import brotli
+except ImportError:  # brotli es opcional: sin él solo se ofrece gzip
+    brotli = None
+
+PREFIJO_CACHE = 'compresion'
+
+
+def codificaciones_disponibles():
+    """Codificaciones que se pueden producir, de la preferida a la menos preferida"""
+    return ('br', 'gzip') if brotli is not None else ('gzip',)
+
+
+def negociar(accept_encoding):
+    """
+    La codificación a usar según ``Accept-Encoding`` (``None`` si ninguna):
+    la de mayor ``q``; en empate, la primera de ``codificaciones_disponibles``.
+    """
+    calidades = {}
+    for parte in accept_encoding.split(','):
+        nombre, _, parametros = parte.partition(';')
+        nombre = nombre.strip().lower()
+        calidad = 1.0
+        for parametro in parametros.split(';'):
+            clave, _, valor = parametro.partition('=')
+            if clave.strip().lower() == 'q':
+                try:
+                    calidad = float(valor)
+                except ValueError:
+                    calidad = 0.0
+        if nombre:
+            calidades[nombre] = calidad
+
+    comodin = calidades.get('*', 0.0)
+    mejor, mejor_calidad = None, 0.0
+    for codificacion in codificaciones_disponibles():
+        calidad = calidades.get(codificacion, comodin)
+        if calidad > mejor_calidad:
+            mejor, mejor_calidad = codificacion, calidad
+    return mejor
+
+
+def comprimir(contenido, codificacion):
+    """``contenido`` comprimido con ``codificacion`` (``br`` o ``gzip``)"""
+    if codificacion == 'br':
+        return brotli.compress(contenido, quality=settings.COMPRESION_NIVEL_BROTLI)
+    # mtime=0: los mismos bytes para el mismo contenido
+    return gzip.compress(contenido, compresslevel=settings.COMPRESION_NIVEL_GZIP, mtime=0)
+
+
+class CompresorFlujo:
+    """Comprime un flujo bloque por bloque; cada bloque se envía completo al cliente"""
+
+    def __init__(self, codificacion):
+        if codificacion == 'br':
+            compresor = brotli.Compressor(quality=settings.COMPRESION_NIVEL_BROTLI)
+            self._comprimir = lambda bloque: compresor.process(bloque) + compresor.flush()
+            self._terminar = compresor.finish
+        else:
+            compresor = zlib.compressobj(settings.COMPRESION_NIVEL_GZIP, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._comprimir = lambda bloque: compresor.compress(bloque) + compresor.flush(zlib.Z_SYNC_FLUSH)
+            self._terminar = compresor.flush
+
+    def bloques(self, contenido):
+        for bloque in contenido:
+            if bloque:
+                yield self._comprimir(bloque)
+        yield self._terminar()
+
+    async def abloques(self, contenido):
+        async for bloque in contenido:
+            if bloque:
+                yield self._comprimir(bloque)
+        yield self._terminar()
+
+
+def _clave(contenido, codificacion):
+    return f'{PREFIJO_CACHE}:{codificacion}:{hashlib.sha1(contenido).hexdigest()}:{len(contenido)}'
+
+
+def comprimir_con_cache(contenido, codificacion):
+    """Como ``comprimir``, reutilizando el resultado guardado para el mismo contenido"""
+    if not settings.COMPRESION_CACHE_SEGUNDOS:
+        return comprimir(contenido, codificacion)
+    cache = caches[settings.COMPRESION_CACHE]
+    clave = _clave(contenido, codificacion)
+    comprimido = cache.get(clave)
+    if comprimido is None:
+        comprimido = comprimir(contenido, codificacion)
+        cache.set(clave, comprimido, settings.COMPRESION_CACHE_SEGUNDOS)
+    return comprimido
+
+
+def _comprimible(response):
+    if response.has_header('Content-Encoding') or response.status_code in (204, 304):
+        return False
+    tipo = response.get('Content-Type', '').split(';')[0].strip().lower()
+    if tipo not in settings.COMPRESION_TIPOS:
+        return False
+    return response.streaming or len(response.content) >= settings.COMPRESION_MINIMO_BYTES
+
+
+def comprimir_respuesta(request, response):
+    """Comprime ``response`` si el cliente lo acepta y vale la pena"""
+    if not _comprimible(response):
+        return response
+    patch_vary_headers(response, ('Accept-Encoding',))
+    codificacion = negociar(request.META.get('HTTP_ACCEPT_ENCODING', ''))
+    if codificacion is None:
+        return response
+
+    if response.streaming:
+        compresor = CompresorFlujo(codificacion)
+        if response.is_async:
+            response.streaming_content = compresor.abloques(response.streaming_content)
+        else:
+            response.streaming_content = compresor.bloques(response.streaming_content)
+        del response.headers['Content-Length']
+    else:
+        if response.has_header('ETag'):
+            comprimido = comprimir_con_cache(response.content, codificacion)
+        else:
+            comprimido = comprimir(response.content, codificacion)
+        if len(comprimido) >= len(response.content):
+            return response
+        response.content = comprimido
+        response.headers['Content-Length'] = str(len(comprimido))
+
+    etag = response.get('ETag')
+    if etag and etag.startswith('"'):
+        response.headers['ETag'] = 'W/' + etag
+    response.headers['Content-Encoding'] = codificacion
+    return response
+
+
+class CompresionMiddleware:
+    """Comprime las respuestas (ver ``comprimir_respuesta``). Se desactiva con ``COMPRESION=False``"""
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.COMPRESION:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        return comprimir_respuesta(request, self.get_response(request))
+
+    async def _acall(self, request):
+        return comprimir_respuesta(request, await self.get_response(request))
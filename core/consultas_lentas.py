@@ -0,0 +1,265 @@
+"""
+Registro de consultas SQL lentas.
+
+``ConsultasLentasMiddleware`` instala en cada conexión un
+``execute_wrapper`` que mide cada consulta de la petición en curso. Las que
+tardan más de ``CONSULTAS_LENTAS_MS`` se escriben, con probabilidad
+``CONSULTAS_LENTAS_MUESTREO``, como una línea JSON en
+``CONSULTAS_LENTAS_ARCHIVO`` (rotado por tamaño), junto con la ruta, los
+parámetros de la petición normalizados y el plan de ejecución (``EXPLAIN``,
+o ``EXPLAIN QUERY PLAN`` en SQLite) de los ``SELECT``. Los parámetros son los
+de la huella canónica de la consulta (``request.huella_consulta``, la misma
+de logs y métricas) cuando la vista filtró con un FilterSet. Los valores con
+que se ejecutó el SQL (correos, teléfonos, mensajes) no se escriben.
+
+Durante la petición solo se anotan las consultas lentas: el ``EXPLAIN`` y la
+escritura del registro se hacen al cerrar la respuesta, ya enviada y fuera de
+las transacciones de la vista, así que no agregan latencia, savepoints ni
+bloqueos a la petición ni cuentan en sus métricas.
+
+``python manage.py consultas_lentas`` resume el archivo por ruta y consulta.
+"""
+import datetime
+import functools
+import json
+import logging
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from logging.handlers import RotatingFileHandler
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import DatabaseError, connections, transaction
+from django.db.backends.signals import connection_created
+
+# Parámetros que no cambian la forma de la consulta
+PARAMETROS_IGNORADOS = {'page', 'cursor'}
+
+# (request, consultas lentas pendientes de registrar) de la petición en curso
+_peticion = ContextVar('consultas_lentas_peticion', default=None)
+
+logger = logging.getLogger(__name__)
+
+_manejadores = {}
+_lock = threading.Lock()
+
+
+def normalizar_parametros(query_params):
+    """Parámetros de la petición ordenados, sin los de paginación"""
+    return {
+        clave: ','.join(query_params.getlist(clave))
+        for clave in sorted(query_params)
+        if clave not in PARAMETROS_IGNORADOS
+    }
+
+
+def parametros_y_consulta(request):
+    """
+    ``(parámetros, clave)`` de la consulta de ``request``: los filtros de su
+    huella canónica y ``huella_consulta.clave``, o, si la vista no la
+    calculó, los parámetros normalizados y ``None``.
+    """
+    huella_consulta = getattr(request, 'huella_consulta', None)
+    if huella_consulta is None:
+        return normalizar_parametros(request.GET), None
+    parametros = {
+        nombre: ','.join(valor) if isinstance(valor, tuple) else valor
+        for nombre, valor in huella_consulta
+    }
+    return parametros, huella_consulta.clave
+
+
+def huella(sql):
+    """
+    El SQL sin lo que varía entre ejecuciones de la misma consulta: listas
+    ``IN``, números literales (``LIMIT``/``OFFSET``) y espacios.
+    """
+    sql = re.sub(r'IN \((?:%s, )*%s\)', 'IN (...)', sql)
+    sql = re.sub(r'\b\d+(?:\.\d+)?\b', '?', sql)
+    return ' '.join(sql.split())
+
+
+def plan(connection, sql, params):
+    """Plan de ejecución de ``sql`` como lista de líneas"""
+    try:
+        # En su propia transacción (o savepoint, si hay una abierta): en
+        # PostgreSQL un EXPLAIN fallido no deja la conexión abortada
+        with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+            cursor.execute(f'{connection.ops.explain_query_prefix()} {sql}', params)
+            return [
+                fila[0] if len(fila) == 1 else ' '.join(str(columna) for columna in fila)
+                for fila in cursor.fetchall()
+            ]
+    except DatabaseError as error:
+        return [f'EXPLAIN falló: {error}']
+
+
+def _manejador(archivo):
+    with _lock:
+        manejador = _manejadores.get(archivo)
+        if manejador is None:
+            Path(archivo).parent.mkdir(parents=True, exist_ok=True)
+            manejador = _manejadores[archivo] = RotatingFileHandler(
+                archivo,
+                maxBytes=settings.CONSULTAS_LENTAS_MAX_BYTES,
+                backupCount=settings.CONSULTAS_LENTAS_RESPALDOS,
+                encoding='utf-8',
+            )
+        return manejador
+
+
+def registrar(request, connection, sql, params, duracion):
+    """Escribe una consulta lenta en ``CONSULTAS_LENTAS_ARCHIVO``"""
+    coincidencia = request.resolver_match
+    es_select = sql.lstrip().upper().startswith(('SELECT', 'WITH'))
+    parametros, consulta = parametros_y_consulta(request)
+    entrada = {
+        'fecha': datetime.datetime.now(datetime.timezone.utc).isoformat(timespec='seconds'),
+        'ruta': coincidencia.view_name if coincidencia else request.path,
+        'metodo': request.method,
+        'parametros': parametros,
+        'consulta': consulta,
+        'duracion_ms': round(duracion * 1000, 3),
+        'huella': huella(sql),
+        'sql': sql,
+        'plan': plan(connection, sql, params) if es_select else None,
+    }
+    registro = logging.makeLogRecord({'msg': json.dumps(entrada, ensure_ascii=False)})
+    _manejador(str(settings.CONSULTAS_LENTAS_ARCHIVO)).handle(registro)
+
+
+def registrar_pendientes(request, pendientes):
+    """Registra las consultas lentas anotadas durante ``request``"""
+    for alias, sql, params, duracion in pendientes:
+        try:
+            registrar(request, connections[alias], sql, params, duracion)
+        except Exception:
+            # El registro es un diagnóstico: si falla no debe romper el cierre
+            logger.exception('No se pudo registrar una consulta lenta')
+
+
+def _medir_consulta(execute, sql, params, many, context):
+    peticion = _peticion.get()
+    if peticion is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    resultado = execute(sql, params, many, context)
+    duracion = time.perf_counter() - inicio
+    if (
+        not many
+        and duracion * 1000 >= settings.CONSULTAS_LENTAS_MS
+        and random.random() < settings.CONSULTAS_LENTAS_MUESTREO
+    ):
+        peticion[1].append((context['connection'].alias, sql, params, duracion))
+    return resultado
+
+
+def _instalar(connection, **kwargs):
+    if _medir_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_medir_consulta)
+
+
+class ConsultasLentasMiddleware:
+    """
+    Marca la petición en curso para ``_medir_consulta`` y registra sus
+    consultas lentas al cerrar la respuesta. Se desactiva con
+    ``CONSULTAS_LENTAS=False``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.CONSULTAS_LENTAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(_instalar, dispatch_uid='consultas_lentas')
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        token, pendientes = self._empezar(request)
+        try:
+            response = self.get_response(request)
+        finally:
+            _peticion.reset(token)
+        return self._terminar(request, response, pendientes)
+
+    async def _acall(self, request):
+        token, pendientes = self._empezar(request)
+        try:
+            response = await self.get_response(request)
+        finally:
+            _peticion.reset(token)
+        return self._terminar(request, response, pendientes)
+
+    def _empezar(self, request):
+        for connection in connections.all(initialized_only=True):
+            _instalar(connection)
+        pendientes = []
+        return _peticion.set((request, pendientes)), pendientes
+
+    def _terminar(self, request, response, pendientes):
+        if pendientes:
+            # El servidor cierra la respuesta después de enviarla (y antes de
+            # cerrar las conexiones de la petición)
+            response._resource_closers.append(functools.partial(registrar_pendientes, request, pendientes))
+        return response
+
+
+def leer(archivo):
+    """Entradas de ``archivo`` y de sus respaldos rotados, de la más antigua a la más reciente"""
+    archivo = Path(archivo)
+    respaldos = sorted(
+        archivo.parent.glob(f'{archivo.name}.*'),
+        key=lambda ruta: int(ruta.suffix[1:]) if ruta.suffix[1:].isdigit() else 0,
+        reverse=True,
+    )
+    for ruta in [*respaldos, archivo]:
+        if not ruta.exists():
+            continue
+        with ruta.open(encoding='utf-8') as lineas:
+            for linea in lineas:
+                try:
+                    yield json.loads(linea)
+                except ValueError:
+                    continue
+
+
+def resumir(entradas, orden='total'):
+    """
+    Agrupa las entradas por ruta y huella. Devuelve una lista de dicts con
+    ``ruta``, ``huella``, ``veces``, ``total_ms``, ``promedio_ms``,
+    ``max_ms``, los ``parametros`` más frecuentes y la entrada más lenta
+    (``peor``), ordenada de mayor a menor por ``orden`` (``total``, ``max``
+    o ``veces``).
+    """
+    grupos = {}
+    for entrada in entradas:
+        grupo = grupos.setdefault((entrada['ruta'], entrada['huella']), {
+            'ruta': entrada['ruta'], 'huella': entrada['huella'],
+            'veces': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'conteo_parametros': {}, 'peor': None,
+        })
+        grupo['veces'] += 1
+        grupo['total_ms'] += entrada['duracion_ms']
+        if grupo['peor'] is None or entrada['duracion_ms'] > grupo['max_ms']:
+            grupo['max_ms'] = entrada['duracion_ms']
+            grupo['peor'] = entrada
+        parametros = json.dumps(entrada['parametros'], sort_keys=True, ensure_ascii=False)
+        grupo['conteo_parametros'][parametros] = grupo['conteo_parametros'].get(parametros, 0) + 1
+
+    resumen = []
+    for grupo in grupos.values():
+        conteo = grupo.pop('conteo_parametros')
+        grupo['parametros'] = json.loads(max(conteo, key=conteo.get))
+        grupo['total_ms'] = round(grupo['total_ms'], 3)
+        grupo['promedio_ms'] = round(grupo['total_ms'] / grupo['veces'], 3)
+        resumen.append(grupo)
+    clave = {'total': 'total_ms', 'max': 'max_ms', 'veces': 'veces'}[orden]
+    return sorted(resumen, key=lambda grupo: grupo[clave], reverse=True)
@@ -47,6 +47,18 @@ def custom_exception_handler(exc, context):
             custom_response_data['message'] = 'Permiso denegado'
             custom_response_data['details'] = {'detail': 'No tienes permiso para realizar esta acción'}
 
+        # Handle optimistic concurrency (If-Match)
+        elif response.status_code in (status.HTTP_412_PRECONDITION_FAILED, status.HTTP_428_PRECONDITION_REQUIRED):
+            custom_response_data['message'] = 'Precondición fallida'
+
+        # Handle throttling (DRF already sets the Retry-After header)
+        elif response.status_code == status.HTTP_429_TOO_MANY_REQUESTS:
+            custom_response_data['message'] = 'Demasiadas solicitudes'
+            custom_response_data['details'] = {
+                'detail': 'Has superado el límite de solicitudes. Intenta más tarde.',
+                'retry_after': int(response['Retry-After']) if 'Retry-After' in response else None,
+            }
+
         response.data = custom_response_data
 
     else:
@@ -0,0 +1,345 @@
+"""
+Métricas de rendimiento por petición.
+
+``MetricasMiddleware`` mide de cada petición el tiempo total, el tiempo y
+número de consultas SQL, el tiempo de serialización (representación de las
+filas y renderizado JSON) y el tamaño de la respuesta. Los devuelve en el
+header ``Server-Timing`` y los acumula por ruta y método en histogramas en
+memoria, que ``GET /api/metrics`` expone en formato de texto de Prometheus.
+
+Cada worker acumula en su propio proceso (con un lock, sin E/S) y un hilo
+del worker publica cada ``METRICAS_INTERVALO`` segundos una copia en la caché
+compartida (Redis con ``REDIS_URL``), fuera de las peticiones: ni bloquea el
+event loop con ASGI ni una caché caída afecta a las respuestas.
+``/api/metrics`` suma las copias de todos los workers. Sin Redis, cada
+proceso solo ve sus propias métricas.
+
+Las consultas se miden con un ``execute_wrapper`` instalado en cada conexión
+que consulta una ``ContextVar``: fuera de una petición medida no hace nada,
+y las consultas del ORM asíncrono (en otro hilo) se atribuyen a la petición
+que las hizo.
+"""
+import bisect
+import hmac
+import itertools
+import logging
+import os
+import socket
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+
+# Límites superiores (segundos) de los buckets del histograma de duración
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+PREFIJO_CACHE = 'metricas'
+
+# Etiqueta ``method``: cualquier otro método cuenta como OTHER, para que un
+# cliente no pueda crear series nuevas inventando métodos
+METODOS = frozenset(('GET', 'HEAD', 'POST', 'PUT', 'PATCH', 'DELETE', 'OPTIONS', 'TRACE', 'CONNECT'))
+
+logger = logging.getLogger(__name__)
+
+_actual = ContextVar('medicion_actual', default=None)
+
+
+class Medicion:
+    """Lo medido durante una petición"""
+    __slots__ = ('db', 'consultas', 'serializacion')
+
+    def __init__(self):
+        self.db = 0.0
+        self.consultas = 0
+        self.serializacion = 0.0
+
+
+@contextmanager
+def medir_serializacion():
+    """Suma el tiempo del bloque al de serialización de la petición en curso"""
+    medicion = _actual.get()
+    if medicion is None:
+        yield
+        return
+    inicio = time.perf_counter()
+    try:
+        yield
+    finally:
+        medicion.serializacion += time.perf_counter() - inicio
+
+
+def _medir_consulta(execute, sql, params, many, context):
+    medicion = _actual.get()
+    if medicion is None:
+        return execute(sql, params, many, context)
+    inicio = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        medicion.db += time.perf_counter() - inicio
+        medicion.consultas += 1
+
+
+def _instalar(connection, **kwargs):
+    # Primero: mide a los demás wrappers (latencia simulada, consultas lentas)
+    if _medir_consulta not in connection.execute_wrappers:
+        connection.execute_wrappers.insert(0, _medir_consulta)
+
+
+class Serie:
+    """Histograma de duración y totales de una ruta y método"""
+    __slots__ = ('buckets', 'duracion', 'db', 'consultas', 'serializacion', 'bytes')
+
+    def __init__(self):
+        # Un bucket por límite más +Inf, sin acumular (se acumulan al exponer)
+        self.buckets = [0] * (len(BUCKETS) + 1)
+        self.duracion = self.db = self.serializacion = 0.0
+        self.consultas = self.bytes = 0
+
+    @property
+    def peticiones(self):
+        return sum(self.buckets)
+
+    def sumar(self, otra):
+        self.buckets = [a + b for a, b in zip(self.buckets, otra.buckets)]
+        self.duracion += otra.duracion
+        self.db += otra.db
+        self.consultas += otra.consultas
+        self.serializacion += otra.serializacion
+        self.bytes += otra.bytes
+
+    def copia(self):
+        copia = Serie()
+        copia.sumar(self)
+        return copia
+
+    def __getstate__(self):
+        return [getattr(self, campo) for campo in self.__slots__]
+
+    def __setstate__(self, estado):
+        for campo, valor in zip(self.__slots__, estado):
+            setattr(self, campo, valor)
+
+
+class Registro:
+    """
+    Series por ``(ruta, método)`` y conteo por ``(ruta, método, estatus)``,
+    acumulados desde que arrancó el proceso.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.series = {}
+        self.estatus = {}
+        self.pid_publicador = None
+
+    @property
+    def worker(self):
+        # Se calcula cada vez: gunicorn puede importar el módulo antes del fork
+        return f'{socket.gethostname()}:{os.getpid()}'
+
+    def observar(self, ruta, metodo, estatus, duracion, medicion, tamano):
+        with self.lock:
+            serie = self.series.get((ruta, metodo))
+            if serie is None:
+                serie = self.series[(ruta, metodo)] = Serie()
+            serie.buckets[bisect.bisect_left(BUCKETS, duracion)] += 1
+            serie.duracion += duracion
+            serie.db += medicion.db
+            serie.consultas += medicion.consultas
+            serie.serializacion += medicion.serializacion
+            serie.bytes += tamano
+            clave = (ruta, metodo, estatus)
+            self.estatus[clave] = self.estatus.get(clave, 0) + 1
+
+    def copia(self):
+        with self.lock:
+            return {
+                'series': {clave: serie.copia() for clave, serie in self.series.items()},
+                'estatus': dict(self.estatus),
+            }
+
+    def iniciar_publicacion(self):
+        """Arranca, una vez por proceso, el hilo que publica cada ``METRICAS_INTERVALO`` s"""
+        pid = os.getpid()
+        if self.pid_publicador == pid:
+            return
+        with self.lock:
+            # Tras el fork de gunicorn el hilo del proceso padre no existe
+            if self.pid_publicador == pid:
+                return
+            self.pid_publicador = pid
+        threading.Thread(target=self._publicar_cada_intervalo, name='metricas', daemon=True).start()
+
+    def _publicar_cada_intervalo(self):
+        while True:
+            time.sleep(settings.METRICAS_INTERVALO)
+            self.publicar()
+
+    def publicar(self):
+        """Copia las métricas del proceso a la caché. Si la caché falla, se registra y se sigue"""
+        try:
+            duracion = max(3600, settings.METRICAS_INTERVALO * 10)
+            cache.set(f'{PREFIJO_CACHE}:{self.worker}', self.copia(), duracion)
+            workers = cache.get(f'{PREFIJO_CACHE}:workers') or set()
+            if self.worker not in workers:
+                cache.set(f'{PREFIJO_CACHE}:workers', workers | {self.worker}, None)
+        except Exception:
+            logger.exception('No se pudieron publicar las métricas en la caché')
+
+    def reunir(self):
+        """
+        Suma las métricas publicadas por todos los workers (incluido este). Si
+        la caché no responde, devuelve solo las de este proceso.
+        """
+        self.publicar()
+        try:
+            workers = cache.get(f'{PREFIJO_CACHE}:workers') or {self.worker}
+            copias = cache.get_many([f'{PREFIJO_CACHE}:{worker}' for worker in workers])
+            vivos = {clave.split(':', 1)[1] for clave in copias}
+            if vivos != workers:
+                # Workers que ya no existen (su copia expiró)
+                cache.set(f'{PREFIJO_CACHE}:workers', vivos | {self.worker}, None)
+        except Exception:
+            logger.exception('No se pudieron leer las métricas de la caché')
+            copias = {self.worker: self.copia()}
+
+        series, estatus = {}, {}
+        for copia in copias.values():
+            for clave, serie in copia['series'].items():
+                series.setdefault(clave, Serie()).sumar(serie)
+            for clave, total in copia['estatus'].items():
+                estatus[clave] = estatus.get(clave, 0) + total
+        return series, estatus
+
+
+registro = Registro()
+
+
+class MetricasMiddleware:
+    """
+    Mide cada petición (ver el docstring del módulo). Va primero en
+    ``MIDDLEWARE`` para incluir el tiempo del resto de los middlewares. Se
+    desactiva con ``METRICAS=False``.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not settings.METRICAS:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+        connection_created.connect(_instalar, dispatch_uid='metricas')
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self._acall(request)
+        inicio, medicion, token = self._empezar()
+        try:
+            response = self.get_response(request)
+        finally:
+            _actual.reset(token)
+        return self._terminar(request, response, inicio, medicion)
+
+    async def _acall(self, request):
+        inicio, medicion, token = self._empezar()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _actual.reset(token)
+        return self._terminar(request, response, inicio, medicion)
+
+    def _empezar(self):
+        for connection in connections.all(initialized_only=True):
+            _instalar(connection)
+        medicion = Medicion()
+        return time.perf_counter(), medicion, _actual.set(medicion)
+
+    def _terminar(self, request, response, inicio, medicion):
+        duracion = time.perf_counter() - inicio
+        tamano = 0 if response.streaming else len(response.content)
+        response['Server-Timing'] = (
+            f'db;dur={medicion.db * 1000:.1f};desc="{medicion.consultas} consultas", '
+            f'ser;dur={medicion.serializacion * 1000:.1f}, '
+            f'total;dur={duracion * 1000:.1f}'
+        )
+        coincidencia = request.resolver_match
+        ruta = coincidencia.view_name if coincidencia else 'sin_ruta'
+        metodo = request.method if request.method in METODOS else 'OTHER'
+        registro.observar(ruta, metodo, response.status_code, duracion, medicion, tamano)
+        registro.iniciar_publicacion()
+        return response
+
+
+def _etiquetas(**valores):
+    return ','.join(f'{nombre}="{valor}"' for nombre, valor in valores.items())
+
+
+def exposicion(series, estatus):
+    """Métricas en formato de texto de Prometheus (0.0.4)"""
+    lineas = [
+        '# HELP http_requests_total Peticiones atendidas por ruta, método y estatus.',
+        '# TYPE http_requests_total counter',
+    ]
+    for (ruta, metodo, codigo), total in sorted(estatus.items()):
+        lineas.append(f'http_requests_total{{{_etiquetas(route=ruta, method=metodo, status=codigo)}}} {total}')
+
+    lineas += [
+        '# HELP http_request_duration_seconds Duración total de la petición.',
+        '# TYPE http_request_duration_seconds histogram',
+    ]
+    for (ruta, metodo), serie in sorted(series.items()):
+        etiquetas = _etiquetas(route=ruta, method=metodo)
+        for limite, total in zip([*BUCKETS, '+Inf'], itertools.accumulate(serie.buckets)):
+            lineas.append(f'http_request_duration_seconds_bucket{{{etiquetas},le="{limite}"}} {total}')
+        lineas.append(f'http_request_duration_seconds_sum{{{etiquetas}}} {serie.duracion:.6f}')
+        lineas.append(f'http_request_duration_seconds_count{{{etiquetas}}} {serie.peticiones}')
+
+    totales = [
+        ('http_request_db_seconds_total', 'Tiempo en consultas SQL.', 'db', '.6f'),
+        ('http_request_db_queries_total', 'Consultas SQL ejecutadas.', 'consultas', 'd'),
+        ('http_request_serialization_seconds_total', 'Tiempo de representación y renderizado.',
+         'serializacion', '.6f'),
+        ('http_response_size_bytes_total', 'Bytes de respuesta (sin contar streaming).', 'bytes', 'd'),
+    ]
+    for nombre, ayuda, campo, formato in totales:
+        lineas += [f'# HELP {nombre} {ayuda}', f'# TYPE {nombre} counter']
+        for (ruta, metodo), serie in sorted(series.items()):
+            valor = format(getattr(serie, campo), formato)
+            lineas.append(f'{nombre}{{{_etiquetas(route=ruta, method=metodo)}}} {valor}')
+    return '\n'.join(lineas) + '\n'
+
+
+def metricas(request):
+    """
+    Métricas de todos los workers en formato Prometheus.
+    GET /api/metrics
+
+    Con ``METRICAS_TOKEN`` se exige ``Authorization: Bearer <token>``. Sin
+    token solo responde con ``METRICAS_PUBLICAS`` (por defecto, solo con
+    ``DEBUG``): en producción, sin token configurado, responde 403.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return HttpResponse(status=405, headers={'Allow': 'GET, HEAD'})
+    token = settings.METRICAS_TOKEN
+    if token:
+        autorizacion = request.headers.get('Authorization', '').encode('utf-8')
+        if not hmac.compare_digest(autorizacion, f'Bearer {token}'.encode('utf-8')):
+            return HttpResponse(status=401)
+    elif not settings.METRICAS_PUBLICAS:
+        return HttpResponse('# Configura METRICAS_TOKEN (o METRICAS_PUBLICAS=True)\n', status=403)
+    if not settings.METRICAS:
+        return HttpResponse('# Métricas desactivadas (METRICAS=False)\n', status=404)
+    return HttpResponse(
+        exposicion(*registro.reunir()), content_type='text/plain; version=0.0.4; charset=utf-8'
+    )
@@ -0,0 +1,251 @@
+"""
+Paginación de la API.
+
+Por defecto las listas se paginan por número de página (``?page=``). Con
+``?paginacion=cursor`` se activa la paginación keyset: cada página se obtiene
+filtrando a partir de los valores de ordenación de la última fila de la página
+anterior, por lo que no hay ``COUNT(*)`` ni ``OFFSET`` y el costo de una página
+profunda es el mismo que el de la primera.
+"""
+import base64
+import binascii
+import datetime
+import decimal
+import functools
+import json
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.core.paginator import InvalidPage, Paginator as DjangoPaginator
+from django.db.models import Q
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+def _valor_json(valor):
+    """
+    Serializa los valores de ordenación sin perder precisión (a diferencia de
+    ``DjangoJSONEncoder``, que recorta los microsegundos).
+    """
+    if isinstance(valor, (datetime.date, datetime.time)):
+        return valor.isoformat()
+    if isinstance(valor, decimal.Decimal):
+        return str(valor)
+    raise TypeError(f'Tipo no serializable en cursor: {type(valor).__name__}')
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación keyset (cursor) sobre la ordenación efectiva del queryset.
+
+    La ordenación se toma del queryset ya filtrado (``ordenar_por``,
+    ``ordering`` o el ``Meta.ordering`` del modelo) y se completa con ``id``
+    como desempate, de modo que la posición de cada fila es única.
+    """
+    cursor_query_param = 'cursor'
+    page_size = api_settings.PAGE_SIZE
+    invalid_cursor_message = 'Cursor inválido'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self.preparar_queryset(queryset, request)
+        return self.recortar_pagina(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Versión asíncrona de ``paginate_queryset``"""
+        queryset = self.preparar_queryset(queryset, request)
+        return self.recortar_pagina([fila async for fila in queryset[:self.page_size + 1]])
+
+    def preparar_queryset(self, queryset, request):
+        """Ordena el queryset y, si hay cursor, lo filtra a partir de él"""
+        self.request = request
+        self.ordering = self.get_ordering(queryset)
+        self.fields = [self._resolver_campo(queryset, campo) for campo, _ in self.ordering]
+
+        queryset = queryset.order_by(*[
+            f'-{campo}' if descendente else campo
+            for campo, descendente in self.ordering
+        ])
+
+        posicion = self.decode_cursor(request)
+        if posicion is not None:
+            queryset = queryset.filter(self.build_filter(posicion))
+        return queryset
+
+    def recortar_pagina(self, resultados):
+        """``resultados`` trae una fila de más para saber si hay página siguiente"""
+        self.has_next = len(resultados) > self.page_size
+        self.page = resultados[:self.page_size]
+        return self.page
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'results': data,
+        })
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, 'page')
+        url = remove_query_param(url, 'paginacion')
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(self.page[-1]))
+
+    def get_ordering(self, queryset):
+        """
+        Devuelve la ordenación como lista de tuplas ``(campo, descendente)``,
+        terminando siempre en ``id``.
+        """
+        query = queryset.query
+        if query.order_by:
+            ordering = list(query.order_by)
+        elif query.default_ordering:
+            ordering = list(queryset.model._meta.ordering)
+        else:
+            ordering = []
+
+        resultado = []
+        for campo in ordering:
+            if not isinstance(campo, str) or campo == '?' or '__' in campo:
+                raise ImproperlyConfigured(
+                    f'KeysetPagination no soporta la ordenación {campo!r}.'
+                )
+            descendente = campo.startswith('-')
+            campo = campo.lstrip('-')
+            if campo == 'pk':
+                campo = queryset.model._meta.pk.name
+            resultado.append((campo, descendente))
+
+        pk = queryset.model._meta.pk.name
+        if pk not in [campo for campo, _ in resultado]:
+            resultado.append((pk, False))
+        return resultado
+
+    def build_filter(self, posicion):
+        """
+        Construye la condición "fila posterior a ``posicion``" para la
+        ordenación actual:
+
+            (a > x) OR (a = x AND b > y) OR (a = x AND b = y AND c > z)
+
+        precedida de ``a >= x`` para que el primer campo pueda resolverse con
+        un rango sobre su índice.
+        """
+        condicion = Q()
+        iguales = Q()
+        for (campo, descendente), valor in zip(self.ordering, posicion):
+            lookup = 'lt' if descendente else 'gt'
+            condicion |= iguales & Q(**{f'{campo}__{lookup}': valor})
+            iguales &= Q(**{campo: valor})
+
+        primer_campo, descendente = self.ordering[0]
+        rango = Q(**{f'{primer_campo}__{"lte" if descendente else "gte"}': posicion[0]})
+        return rango & condicion
+
+    def encode_cursor(self, fila):
+        valores = [self._valor(fila, campo) for campo, _ in self.ordering]
+        datos = {
+            'o': [f'-{campo}' if descendente else campo for campo, descendente in self.ordering],
+            'v': valores,
+        }
+        crudo = json.dumps(datos, default=_valor_json, separators=(',', ':'))
+        return base64.urlsafe_b64encode(crudo.encode('utf-8')).decode('ascii').rstrip('=')
+
+    def decode_cursor(self, request):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None
+
+        try:
+            relleno = '=' * (-len(token) % 4)
+            datos = json.loads(base64.urlsafe_b64decode(token + relleno).decode('utf-8'))
+            ordering = [f'-{campo}' if descendente else campo for campo, descendente in self.ordering]
+            if datos['o'] != ordering or len(datos['v']) != len(self.fields):
+                raise ValueError('La ordenación del cursor no coincide')
+            return [campo.to_python(valor) for campo, valor in zip(self.fields, datos['v'])]
+        except (binascii.Error, UnicodeDecodeError, KeyError, TypeError, ValueError,
+                DjangoValidationError):
+            raise ValidationError({self.cursor_query_param: self.invalid_cursor_message})
+
+    def _resolver_campo(self, queryset, nombre):
+        if nombre in queryset.query.annotations:
+            return queryset.query.annotations[nombre].output_field
+        try:
+            return queryset.model._meta.get_field(nombre)
+        except FieldDoesNotExist:
+            raise ImproperlyConfigured(f'KeysetPagination no puede ordenar por {nombre!r}.')
+
+    def _valor(self, fila, campo):
+        if isinstance(fila, dict):
+            return fila[campo]
+        return getattr(fila, campo)
+
+
+class TotalConocidoPaginator(DjangoPaginator):
+    """Paginator de Django que reutiliza un total ya calculado en vez de un COUNT"""
+
+    def __init__(self, *args, total=None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if total is not None:
+            self.count = total
+
+
+class DefaultPagination(PageNumberPagination):
+    """
+    Paginación por número de página con modo cursor opcional.
+
+    ``?paginacion=cursor`` pide la primera página en modo keyset; las páginas
+    siguientes se piden con el enlace ``next``, que lleva ``?cursor=``.
+    """
+    keyset_pagination_class = KeysetPagination
+    mode_query_param = 'paginacion'
+
+    def paginate_queryset(self, queryset, request, view=None, total=None):
+        """
+        ``total`` permite pasar el número de filas si la vista ya lo calculó,
+        para no repetir el ``COUNT(*)``.
+        """
+        if self.usa_cursor(request):
+            self.keyset = self.keyset_pagination_class()
+            return self.keyset.paginate_queryset(queryset, request, view)
+        self.keyset = None
+        self.django_paginator_class = functools.partial(TotalConocidoPaginator, total=total)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None, total=None):
+        """
+        Versión asíncrona de ``paginate_queryset`` para las vistas ASGI: la
+        página se lee con el ORM asíncrono.
+        """
+        if self.usa_cursor(request):
+            self.keyset = self.keyset_pagination_class()
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        self.keyset = None
+        if total is None:
+            total = await queryset.acount()
+
+        self.request = request
+        paginator = TotalConocidoPaginator(queryset, self.get_page_size(request), total=total)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=page_number, message=str(exc)
+            ))
+        self.page.object_list = [fila async for fila in self.page.object_list]
+        return self.page.object_list
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def usa_cursor(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == 'cursor'
+            or self.keyset_pagination_class.cursor_query_param in request.query_params
+        )
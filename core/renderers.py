@@ -0,0 +1,53 @@
+"""
+Renderers de la API.
+"""
+from rest_framework.renderers import JSONRenderer
+
+from .metricas import medir_serializacion
+
+try:
+    import orjson
+except ImportError:  # orjson es opcional: sin él se usa el JSONRenderer de DRF
+    orjson = None
+
+
+class FastJSONRenderer(JSONRenderer):
+    """
+    ``JSONRenderer`` que codifica con orjson cuando está instalado.
+
+    La salida es idéntica byte a byte a la de ``JSONRenderer`` con la
+    configuración de la API (``UNICODE_JSON``, ``COMPACT_JSON`` y
+    ``STRICT_JSON`` activos): las fechas, decimales y demás tipos que no son
+    JSON nativo pasan por el mismo ``JSONEncoder`` de DRF. Si se pide
+    indentación, si la configuración es otra o si orjson no puede codificar
+    los datos (enteros de más de 64 bits, claves que no son texto...), se usa
+    ``JSONRenderer``. La API no devuelve floats (los decimales van como
+    texto); orjson escribe algunos exponentes distinto que ``json``.
+    """
+    opciones_orjson = 0
+    if orjson is not None:
+        opciones_orjson = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with medir_serializacion():
+            return self._render(data, accepted_media_type, renderer_context)
+
+    def _render(self, data, accepted_media_type=None, renderer_context=None):
+        if (
+            orjson is None
+            or data is None
+            or self.ensure_ascii
+            or not self.compact
+            or not self.strict
+            or self.get_indent(accepted_media_type, renderer_context or {}) is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=self.encoder_class().default, option=self.opciones_orjson)
+        except (TypeError, orjson.JSONEncodeError):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # Igual que JSONRenderer: U+2028 y U+2029 se escapan para poder
+        # incrustar la respuesta en JavaScript
+        return ret.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
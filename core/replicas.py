@@ -0,0 +1,95 @@
+"""
+Lecturas en una réplica de la base de datos.
+
+Con ``DATABASE_REPLICA_URL`` se agrega la base ``replica`` y se instala
+``ReplicaRouter``. Solo van a la réplica las lecturas de las peticiones
+``GET``/``HEAD``/``OPTIONS`` atendidas por una vista con
+``LecturasEnReplicaMixin``. Todo lo demás (escrituras, lecturas dentro de
+una escritura, comandos, otras vistas) usa la primaria.
+
+Para que un cliente vea sus propias escrituras a pesar del retraso de la
+réplica, tras una escritura exitosa su IP (la misma que usan los límites de
+peticiones, ver ``NUM_PROXIES``) queda fijada a la primaria durante
+``REPLICA_FIJAR_SEGUNDOS``. La marca vive en la caché compartida, así que
+vale para todos los workers con ``REDIS_URL``.
+"""
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS, router
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.throttling import BaseThrottle
+
+REPLICA = 'replica'
+
+_peticion = ContextVar('replica_peticion', default=None)
+
+
+def _clave(request):
+    return f'replica_fijar_{BaseThrottle().get_ident(request)}'
+
+
+def fijar_primaria(request):
+    """Envía las lecturas del cliente de ``request`` a la primaria por un rato"""
+    cache.set(_clave(request), 1, settings.REPLICA_FIJAR_SEGUNDOS)
+
+
+def fijada(request):
+    """Si el cliente de ``request`` escribió hace poco (una consulta a la caché por petición)"""
+    if not hasattr(request, '_fijada_a_primaria'):
+        request._fijada_a_primaria = cache.get(_clave(request)) is not None
+    return request._fijada_a_primaria
+
+
+class ReplicaRouter:
+    """Router de ``DATABASE_ROUTERS`` cuando hay réplica configurada"""
+
+    def db_for_read(self, model, **hints):
+        request = _peticion.get()
+        if request is None or request.method not in SAFE_METHODS or fijada(request):
+            return DEFAULT_DB_ALIAS
+        return REPLICA
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Las dos bases tienen los mismos datos
+        if {obj1._state.db, obj2._state.db} <= {DEFAULT_DB_ALIAS, REPLICA}:
+            return True
+        return None
+
+
+class LecturasEnReplicaMixin:
+    """
+    Para vistas de DRF o ``View`` asíncronas: sus lecturas pueden ir a la
+    réplica, y sus escrituras exitosas fijan al cliente a la primaria.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        if getattr(self, 'view_is_async', False):
+            return self._adispatch(request, *args, **kwargs)
+        token = _peticion.set(request)
+        try:
+            response = super().dispatch(request, *args, **kwargs)
+        finally:
+            _peticion.reset(token)
+        return self._despues_de_responder(request, response)
+
+    async def _adispatch(self, request, *args, **kwargs):
+        token = _peticion.set(request)
+        try:
+            response = await super().dispatch(request, *args, **kwargs)
+        finally:
+            _peticion.reset(token)
+        return self._despues_de_responder(request, response)
+
+    def _despues_de_responder(self, request, response):
+        if (
+            request.method not in SAFE_METHODS
+            and response.status_code < 400
+            and any(isinstance(r, ReplicaRouter) for r in router.routers)
+        ):
+            fijar_primaria(request)
+        return response
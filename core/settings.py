@@ -50,6 +50,11 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    # Primero, para medir también el resto de los middlewares
+    'core.metricas.MetricasMiddleware',
+    'core.consultas_lentas.ConsultasLentasMiddleware',
+    # Antes de los que leen o modifican el cuerpo de la respuesta
+    'core.compresion.CompresionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -92,15 +97,26 @@ DATABASES = {
     }
 }
 
+# Conexiones persistentes: cada hilo de un worker conserva su conexión
+# DB_CONN_MAX_AGE segundos y la verifica antes de reutilizarla. El máximo de
+# conexiones abiertas es workers × hilos, que gunicorn.conf.py limita a
+# DB_MAX_CONEXIONES en el perfil wsgi (el default). Con ASGI, core/asgi.py
+# sobreescribe DB_CONN_MAX_AGE con 0: ese perfil no reutiliza ni limita las
+# conexiones (hace falta un pooler externo)
+DB_CONN_MAX_AGE = int(os.getenv('DB_CONN_MAX_AGE', '600'))
+DB_CONNECT_TIMEOUT = int(os.getenv('DB_CONNECT_TIMEOUT', '5'))
+
 # Use PostgreSQL in production if DATABASE_URL is set
 DATABASE_URL = os.getenv('DATABASE_URL')
 if DATABASE_URL:
     try:
         DATABASES['default'] = dj_database_url.config(
             default=DATABASE_URL,
-            conn_max_age=600,
+            conn_max_age=DB_CONN_MAX_AGE,
             conn_health_checks=True,
         )
+        if DATABASES['default']['ENGINE'] == 'django.db.backends.postgresql':
+            DATABASES['default'].setdefault('OPTIONS', {})['connect_timeout'] = DB_CONNECT_TIMEOUT
     except Exception as e:
         print(f"Warning: Error al configurar DATABASE_URL: {e}")
         print("Usando SQLite como fallback")
@@ -119,8 +135,26 @@ else:
             'PASSWORD': os.getenv('POSTGRES_PASSWORD', ''),
             'HOST': os.getenv('POSTGRES_HOST', 'localhost'),
             'PORT': os.getenv('POSTGRES_PORT', '5432'),
+            'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+            'CONN_HEALTH_CHECKS': True,
+            'OPTIONS': {'connect_timeout': DB_CONNECT_TIMEOUT},
         }
 
+# Réplica de lectura opcional (ver core/replicas.py): las lecturas de
+# ServicioViewSet y SolicitudClienteViewSet van a ella, y tras escribir, el
+# cliente lee de la primaria durante REPLICA_FIJAR_SEGUNDOS
+DATABASE_REPLICA_URL = os.getenv('DATABASE_REPLICA_URL')
+REPLICA_FIJAR_SEGUNDOS = int(os.getenv('REPLICA_FIJAR_SEGUNDOS', '5'))
+if DATABASE_REPLICA_URL:
+    DATABASES['replica'] = dj_database_url.parse(
+        DATABASE_REPLICA_URL,
+        conn_max_age=DB_CONN_MAX_AGE,
+        conn_health_checks=True,
+        # En los tests la réplica es la misma base de datos de prueba
+        test_options={'MIRROR': 'default'},
+    )
+    DATABASE_ROUTERS = ['core.replicas.ReplicaRouter']
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
@@ -166,17 +200,88 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 
 # Django REST Framework
 REST_FRAMEWORK = {
-    'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.PageNumberPagination',
+    'DEFAULT_PAGINATION_CLASS': 'core.pagination.DefaultPagination',
     'PAGE_SIZE': 20,
     'DEFAULT_RENDERER_CLASSES': [
-        'rest_framework.renderers.JSONRenderer',
+        # JSONRenderer con orjson; misma salida byte a byte
+        'core.renderers.FastJSONRenderer',
     ],
     'DEFAULT_PARSER_CLASSES': [
         'rest_framework.parsers.JSONParser',
     ],
     'EXCEPTION_HANDLER': 'core.exceptions.custom_exception_handler',
+    # Token bucket "capacidad/periodo" para la creación pública de
+    # solicitudes (ver services/throttling.py); vacío = sin límite
+    'DEFAULT_THROTTLE_RATES': {
+        'solicitudes_ip': os.getenv('THROTTLE_SOLICITUDES_IP') or None,
+        'solicitudes_servicio': os.getenv('THROTTLE_SOLICITUDES_SERVICIO') or None,
+    },
+    # Número de proxies delante de la app (Render/Railway: 1), para tomar
+    # la IP del cliente de X-Forwarded-For
+    'NUM_PROXIES': int(os.getenv('NUM_PROXIES')) if os.getenv('NUM_PROXIES') else None,
 }
 
+# Caché compartida por los workers (estado de los límites de peticiones).
+# Sin REDIS_URL, caché en memoria de cada proceso
+REDIS_URL = os.getenv('REDIS_URL')
+if REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': REDIS_URL,
+        }
+    }
+
+# Lecturas del catálogo (GET /api/servicios/ y /api/health) con vistas
+# asíncronas; gunicorn.conf.py las activa con el perfil asgi
+ASYNC_CATALOG = os.getenv('ASYNC_CATALOG', 'True') == 'True'
+
+# PUT/PATCH de servicios sin If-Match responden 428 (con If-Match, una
+# versión vieja responde 412 siempre; ver services/conditional.py)
+EXIGIR_IF_MATCH = os.getenv('EXIGIR_IF_MATCH', 'False') == 'True'
+
+# Compresión negociada (brotli si está instalado, si no gzip) de las
+# respuestas de COMPRESION_TIPOS desde COMPRESION_MINIMO_BYTES. Los bytes
+# comprimidos de las respuestas con ETag se reutilizan desde la caché
+# COMPRESION_CACHE durante COMPRESION_CACHE_SEGUNDOS (0 no los guarda); ver
+# core/compresion.py
+COMPRESION = os.getenv('COMPRESION', 'True') == 'True'
+COMPRESION_MINIMO_BYTES = int(os.getenv('COMPRESION_MINIMO_BYTES', '1024'))
+COMPRESION_NIVEL_GZIP = int(os.getenv('COMPRESION_NIVEL_GZIP', '6'))
+COMPRESION_NIVEL_BROTLI = int(os.getenv('COMPRESION_NIVEL_BROTLI', '5'))
+COMPRESION_CACHE = 'default'
+COMPRESION_CACHE_SEGUNDOS = int(os.getenv('COMPRESION_CACHE_SEGUNDOS', '300'))
+COMPRESION_TIPOS = {
+    'application/json',
+    'application/x-ndjson',
+    'text/csv',
+    'text/plain',
+}
+
+# Encolar las solicitudes públicas (202) en lugar de insertarlas en la
+# petición; las inserta en lotes `python manage.py procesar_pendientes`
+SOLICITUDES_EN_COLA = os.getenv('SOLICITUDES_EN_COLA', 'False') == 'True'
+
+# Métricas por petición (header Server-Timing y GET /api/metrics, ver
+# core/metricas.py). Con METRICAS_TOKEN el endpoint exige
+# "Authorization: Bearer <token>"; sin token solo es público con
+# METRICAS_PUBLICAS (por defecto, solo con DEBUG). Cada worker publica sus
+# métricas en la caché cada METRICAS_INTERVALO segundos, en un hilo aparte
+METRICAS = os.getenv('METRICAS', 'True') == 'True'
+METRICAS_TOKEN = os.getenv('METRICAS_TOKEN', '')
+METRICAS_PUBLICAS = os.getenv('METRICAS_PUBLICAS', str(DEBUG)) == 'True'
+METRICAS_INTERVALO = int(os.getenv('METRICAS_INTERVALO', '10'))
+
+# Registro de consultas SQL lentas (ver core/consultas_lentas.py): las que
+# tardan CONSULTAS_LENTAS_MS o más se escriben, con su EXPLAIN, en un
+# archivo rotado; CONSULTAS_LENTAS_MUESTREO es la fracción que se registra
+CONSULTAS_LENTAS = os.getenv('CONSULTAS_LENTAS', 'True') == 'True'
+CONSULTAS_LENTAS_MS = float(os.getenv('CONSULTAS_LENTAS_MS', '200'))
+CONSULTAS_LENTAS_MUESTREO = float(os.getenv('CONSULTAS_LENTAS_MUESTREO', '1'))
+CONSULTAS_LENTAS_ARCHIVO = os.getenv('CONSULTAS_LENTAS_ARCHIVO', str(BASE_DIR / 'logs' / 'consultas_lentas.log'))
+CONSULTAS_LENTAS_MAX_BYTES = 5 * 1024 * 1024
+CONSULTAS_LENTAS_RESPALDOS = 3
+
 
 # CORS Settings
 CORS_ALLOWED_ORIGINS_STR = os.getenv(
@@ -211,12 +316,21 @@ CORS_ALLOW_HEADERS = [
     'authorization',
     'content-type',
     'dnt',
+    'if-match',
+    'if-modified-since',
+    'if-none-match',
     'origin',
     'user-agent',
     'x-csrftoken',
     'x-requested-with',
 ]
 
+CORS_EXPOSE_HEADERS = [
+    'etag',
+    'last-modified',
+    'retry-after',
+]
+
 # CSRF Trusted Origins
 CSRF_TRUSTED_ORIGINS = CORS_ALLOWED_ORIGINS
 
@@ -0,0 +1,135 @@
+"""
+Límites de peticiones con token bucket sobre la caché compartida.
+
+Las tasas se configuran como en DRF, en ``DEFAULT_THROTTLE_RATES``
+(``"30/min"``): la capacidad del bucket es el número de peticiones y se
+rellena a esa tasa a lo largo del periodo. A diferencia de
+``SimpleRateThrottle``, que guarda en la caché la lista de tiempos de cada
+cliente, el estado es un solo entero por clave (GCRA: el instante teórico en
+que el bucket vuelve a estar lleno). Leerlo, reiniciarlo si el bucket ya se
+rellenó y sumarle el costo es un solo paso atómico: un script Lua en Redis
+(una operación de caché por petición) y, con la caché en memoria de cada
+proceso, un candado del proceso. ``get_cargos`` permite cobrar varias fichas
+por petición (una por elemento de un lote).
+"""
+import math
+import threading
+import time
+
+from django.core.cache import caches
+from django.core.cache.backends.redis import RedisCache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+# Las claves de clientes inactivos expiran; mientras tanto su bucket ya se
+# rellenó por completo, así que expirar no cambia el resultado.
+DURACION_MINIMA_CLAVE = 3600
+
+# KEYS[1]: clave; ARGV: ahora, costo, tolerancia (ms) y duración de la clave (s).
+# Devuelve {permitido, lleno}; si no se permite, no escribe nada.
+_GCRA_LUA = """
+local ahora = tonumber(ARGV[1])
+local lleno = math.max(tonumber(redis.call('GET', KEYS[1]) or ahora), ahora) + tonumber(ARGV[2])
+if lleno - ahora > tonumber(ARGV[3]) then
+    return {0, lleno}
+end
+redis.call('SET', KEYS[1], string.format('%d', lleno), 'EX', ARGV[4])
+return {1, lleno}
+"""
+
+_candado = threading.Lock()
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    Base de los límites por token bucket. Las subclases definen ``scope`` y
+    ``get_cache_key``; sin tasa configurada para el scope no se limita nada.
+    Una petición cuesta una ficha; las que crean varios objetos a la vez
+    (lotes) cobran las de ``get_cargos``.
+    """
+    cache_format = 'throttle_%(scope)s_%(ident)s'
+    cache_alias = 'default'
+
+    def __init__(self):
+        self.cache = caches[self.cache_alias]
+        super().__init__()
+
+    def get_rate(self):
+        # Se lee en cada petición (y no de THROTTLE_RATES, fijado al importar)
+        # para respetar override_settings
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_cargos(self, request, view):
+        """Pares ``(clave, fichas)`` que cuesta la petición: una ficha de ``get_cache_key``"""
+        clave = self.get_cache_key(request, view)
+        return [] if clave is None else [(clave, 1)]
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        tomadas = []
+        for clave, fichas in self.get_cargos(request, view):
+            if not self._tomar(clave, fichas):
+                # Se devuelven las fichas ya tomadas de las otras claves
+                for tomada, costo in tomadas:
+                    self._devolver(tomada, costo)
+                return False
+            tomadas.append((clave, self._intervalo() * fichas))
+        return True
+
+    def _intervalo(self):
+        return math.ceil(self.duration * 1000 / self.num_requests)
+
+    def _tomar(self, clave, fichas):
+        intervalo = self._intervalo()
+        costo = intervalo * fichas
+        tolerancia = intervalo * self.num_requests
+        ahora = int(time.time() * 1000)
+        duracion_clave = max(DURACION_MINIMA_CLAVE, math.ceil(tolerancia / 1000))
+
+        permitido, lleno = self._gcra(clave, costo, ahora, tolerancia, duracion_clave)
+        if permitido:
+            return True
+        # Espera hasta que haya fichas. Si se piden más fichas de las que caben
+        # en el bucket, esperar no sirve.
+        self.espera = (lleno - tolerancia - ahora) / 1000 if fichas <= self.num_requests else None
+        return False
+
+    def _gcra(self, clave, costo, ahora, tolerancia, duracion_clave):
+        """
+        Paso atómico de GCRA: ``lleno = max(guardado, ahora) + costo``, que se
+        guarda solo si no pasa de ``ahora + tolerancia``. Devuelve
+        ``(permitido, lleno)``.
+        """
+        if isinstance(self.cache, RedisCache):
+            clave = self.cache.make_and_validate_key(clave)
+            cliente = self.cache._cache.get_client(clave, write=True)
+            permitido, lleno = cliente.register_script(_GCRA_LUA)(
+                keys=[clave], args=[ahora, costo, tolerancia, duracion_clave]
+            )
+            return bool(permitido), lleno
+        # La caché en memoria es del proceso: basta con que sus hilos no
+        # intercalen la lectura y la escritura
+        with _candado:
+            lleno = max(self.cache.get(clave, ahora), ahora) + costo
+            if lleno - ahora > tolerancia:
+                return False, lleno
+            self.cache.set(clave, lleno, duracion_clave)
+            return True, lleno
+
+    def _devolver(self, clave, costo):
+        if isinstance(self.cache, RedisCache):
+            self.cache.decr(clave, costo)
+            return
+        with _candado:
+            self.cache.decr(clave, costo)
+
+    def wait(self):
+        return getattr(self, 'espera', None)
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """Límite por dirección IP del cliente (respeta ``NUM_PROXIES``)"""
+
+    def get_cache_key(self, request, view):
+        return self.cache_format % {'scope': self.scope, 'ident': self.get_ident(request)}
@@ -1,6 +1,7 @@
 """
 URL configuration for core project.
 """
+from django.conf import settings
 from django.contrib import admin
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
@@ -8,12 +9,15 @@ from rest_framework.decorators import api_view
 from rest_framework.response import Response
 from rest_framework import status
 
-from services.views import ServicioViewSet, SolicitudClienteViewSet
+from core.metricas import metricas
+from services import async_views
+from services.views import ServicioViewSet, SolicitudClienteViewSet, SolicitudPendienteViewSet
 
 # Router para ViewSets
 router = DefaultRouter()
 router.register(r'servicios', ServicioViewSet, basename='servicio')
 router.register(r'solicitudes', SolicitudClienteViewSet, basename='solicitud')
+router.register(r'solicitudes-pendientes', SolicitudPendienteViewSet, basename='solicitud-pendiente')
 
 
 @api_view(['GET'])
@@ -25,9 +29,24 @@ def health_check(request):
     return Response({'status': 'ok'}, status=status.HTTP_200_OK)
 
 
+if settings.ASYNC_CATALOG:
+    # Van antes que las rutas del router: los GET usan el ORM asíncrono y el
+    # resto de los métodos se delegan a ServicioViewSet
+    catalogo = [
+        path('api/health', async_views.health_check, name='health-check'),
+        path('api/servicios/', async_views.ServicioListAsyncView.as_view(), name='servicio-list'),
+        path('api/servicios/<int:pk>/', async_views.ServicioDetailAsyncView.as_view(),
+             name='servicio-detail'),
+    ]
+else:
+    catalogo = [
+        path('api/health', health_check, name='health-check'),
+    ]
+
 urlpatterns = [
     path('admin/', admin.site.urls),
-    path('api/health', health_check, name='health-check'),
+    *catalogo,
+    path('api/metrics', metricas, name='metrics'),
     path('api/', include(router.urls)),
 ]
 
@@ -0,0 +1,78 @@
+"""
+Configuración de gunicorn (la carga sola desde la raíz del proyecto).
+
+Dos perfiles, según ``GUNICORN_PERFIL``:
+
+- ``wsgi`` (default): workers ``gthread`` con ``core.wsgi``. Cada hilo
+  conserva su conexión ``DB_CONN_MAX_AGE`` segundos, así que el pool de
+  conexiones de un worker son sus hilos, y el número de workers se limita
+  para que ``workers × hilos`` no pase de ``DB_MAX_CONEXIONES``.
+- ``asgi``: workers de uvicorn con ``core.asgi``. Django atiende cada
+  petición en un hilo nuevo, así que las conexiones a la base de datos no se
+  reutilizan entre peticiones: ``core/asgi.py`` sobreescribe
+  ``DB_CONN_MAX_AGE`` con 0, tenga el valor que tenga. Cada petición en curso
+  abre su conexión, así que ``DB_MAX_CONEXIONES`` no las limita. Este perfil
+  necesita un pooler externo (PgBouncer) delante de la base.
+
+Sin ``ASYNC_CATALOG`` en el entorno, las vistas asíncronas del catálogo solo
+se activan con el perfil ``asgi``. Todo se puede sobreescribir con variables
+de entorno o con argumentos de gunicorn.
+"""
+import multiprocessing
+import os
+
+perfil = os.getenv('GUNICORN_PERFIL') or 'wsgi'
+if perfil not in ('asgi', 'wsgi'):
+    raise ValueError(f'GUNICORN_PERFIL inválido: {perfil} (use asgi o wsgi)')
+os.environ.setdefault('ASYNC_CATALOG', str(perfil == 'asgi'))
+
+cpus = multiprocessing.cpu_count()
+max_conexiones = int(os.getenv('DB_MAX_CONEXIONES', '20'))
+
+if perfil == 'asgi':
+    wsgi_app = 'core.asgi:application'
+    worker_class = 'uvicorn.workers.UvicornWorker'
+    threads = 1
+    workers = int(os.getenv('GUNICORN_WORKERS', cpus * 2 + 1))
+else:
+    wsgi_app = 'core.wsgi:application'
+    worker_class = 'gthread'
+    threads = int(os.getenv('GUNICORN_HILOS', '4'))
+    workers = int(os.getenv('GUNICORN_WORKERS', cpus + 1))
+    workers = max(1, min(workers, max_conexiones // threads))
+
+bind = f'0.0.0.0:{os.getenv("PORT", "8000")}'
+
+# Se importa la aplicación una vez, antes del fork: arranque más rápido y
+# memoria compartida entre workers
+preload_app = os.getenv('GUNICORN_PRELOAD', 'True') == 'True'
+
+# Reiniciar cada worker tras unas mil peticiones (con variación, para que no
+# reinicien todos a la vez) acota cualquier fuga de memoria
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '1000'))
+max_requests_jitter = max_requests // 10
+
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '30'))
+graceful_timeout = timeout
+keepalive = 5
+accesslog = '-'
+
+
+def post_fork(server, worker):
+    # Con preload_app, una conexión abierta antes del fork quedaría
+    # compartida entre procesos
+    if preload_app:
+        from django.db import connections
+        connections.close_all()
+
+
+def when_ready(server):
+    server.log.info(
+        f'Perfil {perfil}: {workers} workers × {threads} hilos '
+        f'({cpus} CPUs, DB_MAX_CONEXIONES={max_conexiones})'
+    )
+    if perfil == 'asgi':
+        server.log.warning(
+            'Perfil asgi: una conexión por petición en curso, sin límite de '
+            'DB_MAX_CONEXIONES (use un pooler externo)'
+        )
@@ -42,4 +42,8 @@ class SolicitudClienteAdmin(admin.ModelAdmin):
         }),
     )
 
+    def get_queryset(self, request):
+        # __str__ usa servicio.nombre: se trae en el mismo JOIN, sin la descripción
+        return super().get_queryset(request).select_related('servicio').defer('servicio__descripcion')
+
 
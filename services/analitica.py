@@ -0,0 +1,135 @@
+"""
+Analítica de solicitudes por día, categoría y estatus.
+
+Los días ya terminados se leen de ``ResumenDiarioSolicitudes``, que llena
+``python manage.py resumir_solicitudes`` de forma incremental: cada ejecución
+solo agrupa las solicitudes creadas después del último día resumido
+(``MarcaResumen.procesado_hasta``) y hasta ayer. Al consultar, solo los días
+posteriores a la marca (normalmente, solo hoy) se cuentan en vivo sobre
+``SolicitudCliente``, así que el costo no crece con la historia.
+
+Los días se cortan en la zona horaria del proyecto y el estatus de cada
+solicitud es el que tenía al resumir su día; ``--desde`` vuelve a resumir
+días anteriores para reflejar cambios de estatus posteriores.
+"""
+import datetime
+
+from django.db import transaction
+from django.db.models import Count
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from .models import MarcaResumen, ResumenDiarioSolicitudes, SolicitudCliente
+
+MARCA = 'solicitudes_diarias'
+
+
+def inicio_del_dia(fecha):
+    return timezone.make_aware(datetime.datetime.combine(fecha, datetime.time.min))
+
+
+def contar_por_dia(desde, hasta=None, categoria=None, estatus=None):
+    """
+    Solicitudes por día, categoría y estatus creadas desde el día ``desde``
+    y antes del día ``hasta`` (sin límite si es ``None``), contadas en vivo
+    """
+    queryset = SolicitudCliente.objects.filter(fecha_creacion__gte=inicio_del_dia(desde))
+    if hasta is not None:
+        queryset = queryset.filter(fecha_creacion__lt=inicio_del_dia(hasta))
+    if categoria:
+        queryset = queryset.filter(servicio__categoria=categoria)
+    if estatus:
+        queryset = queryset.filter(estatus=estatus)
+    return list(
+        queryset.annotate(fecha=TruncDate('fecha_creacion', tzinfo=timezone.get_current_timezone()))
+        .values_list('fecha', 'servicio__categoria', 'estatus')
+        .annotate(total=Count('pk'))
+        .order_by()
+    )
+
+
+def resumir(desde=None, hasta=None):
+    """
+    Agrega a ``ResumenDiarioSolicitudes`` los días terminados posteriores a
+    la marca (o desde ``desde``, reemplazando lo ya resumido) hasta ``hasta``
+    (a lo más, ayer: hoy siempre se cuenta en vivo). Devuelve
+    ``(días, filas)`` escritos.
+    """
+    ayer = timezone.localdate() - datetime.timedelta(days=1)
+    hasta = min(hasta or ayer, ayer)
+    with transaction.atomic():
+        # La marca bloqueada evita que dos ejecuciones resuman lo mismo
+        marca, _ = MarcaResumen.objects.get_or_create(nombre=MARCA)
+        marca = MarcaResumen.objects.select_for_update().get(pk=marca.pk)
+        if desde is None:
+            if marca.procesado_hasta is not None:
+                desde = marca.procesado_hasta + datetime.timedelta(days=1)
+            else:
+                primera = SolicitudCliente.objects.order_by('fecha_creacion').values_list(
+                    'fecha_creacion', flat=True
+                ).first()
+                desde = timezone.localdate(primera) if primera else hasta + datetime.timedelta(days=1)
+        if desde > hasta:
+            return 0, 0
+
+        filas = contar_por_dia(desde, hasta + datetime.timedelta(days=1))
+        ResumenDiarioSolicitudes.objects.filter(fecha__gte=desde, fecha__lte=hasta).delete()
+        ResumenDiarioSolicitudes.objects.bulk_create(
+            [
+                ResumenDiarioSolicitudes(fecha=fecha, categoria=categoria, estatus=estatus, total=total)
+                for fecha, categoria, estatus, total in filas
+            ],
+            batch_size=1000,
+        )
+        if marca.procesado_hasta is None or marca.procesado_hasta < hasta:
+            marca.procesado_hasta = hasta
+        marca.save()
+    return (hasta - desde).days + 1, len(filas)
+
+
+def reabrir(fecha):
+    """
+    Si el día ``fecha`` ya estaba resumido, mueve la marca al día anterior:
+    ese día y los siguientes se cuentan en vivo hasta el próximo ``resumir``,
+    que los vuelve a resumir. Lo usa la cola, que inserta solicitudes con la
+    fecha en que llegaron.
+    """
+    MarcaResumen.objects.filter(nombre=MARCA, procesado_hasta__gte=fecha).update(
+        procesado_hasta=fecha - datetime.timedelta(days=1)
+    )
+
+
+def consultar(dias, categoria=None, estatus=None):
+    """
+    Solicitudes por día, categoría y estatus de los últimos ``dias`` días
+    (incluido hoy): resúmenes hasta la marca y conteo en vivo después.
+    """
+    hoy = timezone.localdate()
+    desde = hoy - datetime.timedelta(days=dias - 1)
+    procesado_hasta = (
+        MarcaResumen.objects.filter(nombre=MARCA).values_list('procesado_hasta', flat=True).first()
+    )
+
+    filas = []
+    if procesado_hasta is not None and procesado_hasta >= desde:
+        resumenes = ResumenDiarioSolicitudes.objects.filter(fecha__gte=desde, fecha__lte=procesado_hasta)
+        if categoria:
+            resumenes = resumenes.filter(categoria=categoria)
+        if estatus:
+            resumenes = resumenes.filter(estatus=estatus)
+        filas.extend(resumenes.values_list('fecha', 'categoria', 'estatus', 'total').order_by())
+        en_vivo_desde = procesado_hasta + datetime.timedelta(days=1)
+    else:
+        en_vivo_desde = desde
+    filas.extend(contar_por_dia(en_vivo_desde, categoria=categoria, estatus=estatus))
+
+    return {
+        'desde': desde,
+        'hasta': hoy,
+        'procesado_hasta': procesado_hasta,
+        'total': sum(total for *_, total in filas),
+        'resultados': [
+            {'fecha': fecha, 'categoria': categoria, 'estatus': estatus, 'total': total}
+            for fecha, categoria, estatus, total in sorted(filas)
+        ],
+    }
@@ -0,0 +1,162 @@
+"""
+Vistas asíncronas (ASGI) para las lecturas del catálogo público.
+
+``GET /api/servicios/`` y ``GET /api/servicios/{id}/`` se atienden con el ORM
+asíncrono de Django, de modo que mientras una consulta espera a la base de
+datos el worker sigue atendiendo otras peticiones. El resto de los métodos
+(POST, PUT, PATCH, DELETE, OPTIONS) se delegan a ``ServicioViewSet``, que
+sigue siendo síncrono.
+
+Las respuestas son las mismas que las del ViewSet: cada vista crea un
+``ServicioViewSet`` para la petición y toma de él el queryset, los filtros,
+la paginación, la representación y los campos de versión; solo las lecturas
+de la base de datos son asíncronas. Los validadores HTTP (ETag /
+Last-Modified) se calculan con las mismas funciones de
+``services.conditional`` y los errores tienen el formato de
+``custom_exception_handler``. Se activan con ``ASYNC_CATALOG`` (ver
+``core/urls.py``).
+"""
+from asgiref.sync import sync_to_async
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.http import Http404
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.exceptions import APIException, MethodNotAllowed
+from rest_framework.request import Request
+from rest_framework.response import Response
+from rest_framework.settings import api_settings
+
+from core.exceptions import custom_exception_handler
+from core.replicas import LecturasEnReplicaMixin
+from .conditional import (
+    agregados_de_version,
+    agregar_validadores,
+    respuesta_condicional,
+    validadores_de_lista,
+    validadores_de_pagina,
+)
+from .models import Servicio
+from .views import ServicioViewSet
+
+
+def respuesta_json(datos, status=200):
+    """``Response`` de DRF ya renderizada con el renderer JSON de la API, como la del ViewSet"""
+    renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+    response = Response(datos, status=status)
+    response.accepted_renderer = renderer
+    response.accepted_media_type = renderer.media_type
+    response.renderer_context = {}
+    return response.render()
+
+
+def respuesta_error(exc, request):
+    """Respuesta de error con el mismo formato que ``custom_exception_handler``"""
+    response = custom_exception_handler(exc, {'request': request, 'view': None})
+    return respuesta_json(response.data, status=response.status_code)
+
+
+class CatalogoAsyncView(LecturasEnReplicaMixin, View):
+    """
+    Base de las vistas asíncronas del catálogo: ``get`` es asíncrono y los
+    demás métodos se delegan a ``vista_sincrona``.
+    """
+    vista_sincrona = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        # Igual que en las vistas de DRF, el CSRF lo resuelve la autenticación
+        return csrf_exempt(super().as_view(**initkwargs))
+
+    async def dispatch(self, request, *args, **kwargs):
+        try:
+            return await super().dispatch(request, *args, **kwargs)
+        except (APIException, Http404) as exc:
+            return respuesta_error(exc, request)
+
+    def lectura(self, request, accion, **kwargs):
+        """
+        ``ServicioViewSet`` preparado para atender ``accion`` con ``request``,
+        como lo haría su ``as_view``, para usar sus métodos de lectura
+        """
+        return ServicioViewSet(
+            action=accion, request=Request(request), args=(), kwargs=kwargs, format_kwarg=None,
+        )
+
+    async def delegar(self, request, *args, **kwargs):
+        return await sync_to_async(self.vista_sincrona)(request, *args, **kwargs)
+
+    post = put = patch = delete = options = delegar
+
+
+class ServicioListAsyncView(CatalogoAsyncView):
+    """GET /api/servicios/ asíncrono; POST se delega a ``ServicioViewSet.create``"""
+    vista_sincrona = staticmethod(ServicioViewSet.as_view(
+        {'get': 'list', 'post': 'create'}, basename='servicio', detail=False
+    ))
+    http_method_names = ['get', 'post', 'head', 'options']
+
+    async def get(self, request):
+        vista = self.lectura(request, 'list')
+        request = vista.request
+        queryset = vista.filter_queryset(vista.get_queryset())
+        campos = vista.get_campos_version()
+        representacion = vista.get_values_representation()
+        paginator = vista.paginator
+        if paginator.usa_cursor(request):
+            # Sin COUNT: los validadores salen de la página (como en el ViewSet)
+            page = await paginator.apaginate_queryset(
+                representacion.preparar(queryset, columnas_extra=campos), request
+            )
+            etag, ultima = validadores_de_pagina(request, page, campos, paginator.keyset.has_next)
+            response = respuesta_condicional(request, etag, ultima)
+            if response is None:
+                response = respuesta_json(paginator.get_paginated_response(representacion.many(page)).data)
+            return agregar_validadores(response, etag, ultima)
+
+        agregado = await queryset.order_by().aaggregate(**agregados_de_version(campos))
+        etag, ultima = validadores_de_lista(request, agregado, campos)
+
+        response = respuesta_condicional(request, etag, ultima)
+        if response is None:
+            page = await paginator.apaginate_queryset(
+                representacion.preparar(queryset), request, total=agregado['total']
+            )
+            response = respuesta_json(paginator.get_paginated_response(representacion.many(page)).data)
+        return agregar_validadores(response, etag, ultima)
+
+
+class ServicioDetailAsyncView(CatalogoAsyncView):
+    """GET /api/servicios/{id}/ asíncrono; PUT, PATCH y DELETE se delegan al ViewSet"""
+    vista_sincrona = staticmethod(ServicioViewSet.as_view(
+        {'get': 'retrieve', 'put': 'update', 'patch': 'partial_update', 'delete': 'destroy'},
+        basename='servicio', detail=True,
+    ))
+
+    async def get(self, request, pk):
+        vista = self.lectura(request, 'retrieve', pk=pk)
+        request = vista.request
+        # Como ServicioViewSet.get_object, con el ORM asíncrono
+        queryset = vista.filter_queryset(vista.get_queryset())
+        try:
+            instance = await queryset.aget(pk=pk)
+        except (Servicio.DoesNotExist, TypeError, ValueError, DjangoValidationError):
+            raise Http404
+        vista.check_object_permissions(request, instance)
+        version = vista.version_de(instance)
+        etag = vista.etag_de(instance, version)
+
+        response = respuesta_condicional(request, etag, version)
+        if response is None:
+            response = respuesta_json(vista.get_values_representation().instance(instance))
+        return agregar_validadores(response, etag, version)
+
+
+async def health_check(request):
+    """
+    Health check asíncrono.
+    GET /api/health
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return respuesta_error(MethodNotAllowed(request.method), request)
+    return respuesta_json({'status': 'ok'})
@@ -0,0 +1,230 @@
+"""
+Operaciones en lote para los ViewSets.
+
+Un lote es una lista JSON de objetos con el mismo formato que acepta el
+serializer del ViewSet. Primero se validan todos los elementos, con una sola
+instancia del serializer y las relaciones precargadas en una consulta, y
+después se escriben juntos en una transacción con ``bulk_create`` o
+``bulk_update``.
+
+El parámetro ``?modo=`` elige qué pasa si algún elemento es inválido:
+
+- ``atomico`` (por defecto): no se escribe nada y se responde 400.
+- ``parcial``: se escriben los elementos válidos y se responde 207
+  Multi-Status (o 400 si no hubo ninguno válido).
+
+En ambos casos la respuesta lleva los errores de cada elemento junto con su
+índice en el lote.
+"""
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db import transaction
+from rest_framework import serializers, status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+MODO_ATOMICO = 'atomico'
+MODO_PARCIAL = 'parcial'
+MODOS = (MODO_ATOMICO, MODO_PARCIAL)
+
+TAMANO_LOTE = 500
+
+
+def leer_modo(request):
+    modo = request.query_params.get('modo', MODO_ATOMICO)
+    if modo not in MODOS:
+        raise ValidationError({'modo': f'Modo inválido, use uno de: {", ".join(MODOS)}.'})
+    return modo
+
+
+def leer_elementos(request, maximo, tipo=dict):
+    """Valida que el cuerpo sea una lista no vacía de a lo más ``maximo`` elementos ``tipo``"""
+    elementos = request.data
+    if not isinstance(elementos, list) or not all(
+        isinstance(e, tipo) and not isinstance(e, bool) for e in elementos
+    ):
+        esperado = 'objetos' if tipo is dict else 'ids'
+        raise ValidationError({'non_field_errors': f'Se esperaba una lista de {esperado}.'})
+    if not elementos:
+        raise ValidationError({'non_field_errors': 'El lote está vacío.'})
+    if len(elementos) > maximo:
+        raise ValidationError(
+            {'non_field_errors': f'El lote no puede tener más de {maximo} elementos.'}
+        )
+    return elementos
+
+
+def precargar_relaciones(serializer, elementos):
+    """
+    Carga en una consulta por campo los objetos referenciados por los
+    ``PrimaryKeyRelatedField`` del serializer, para que validar el lote no
+    haga una consulta por elemento.
+    """
+    precargados = {}
+    for nombre, campo in serializer.fields.items():
+        if campo.read_only or not isinstance(campo, serializers.PrimaryKeyRelatedField):
+            continue
+        modelo_pk = campo.get_queryset().model._meta.pk
+        pks = set()
+        for elemento in elementos:
+            valor = elemento.get(nombre)
+            if valor is None or isinstance(valor, (bool, dict, list)):
+                continue
+            try:
+                pks.add(modelo_pk.to_python(valor))
+            except DjangoValidationError:
+                continue
+        precargados[nombre] = campo.get_queryset().in_bulk(pks) if pks else {}
+    return precargados
+
+
+class ResultadoLote:
+    """Elementos válidos y errores de un lote, por índice"""
+
+    def __init__(self):
+        self.validos = []
+        self.errores = []
+
+    def agregar_error(self, indice, errores):
+        self.errores.append({'indice': indice, 'errores': errores})
+
+    def se_escribe(self, modo):
+        """En modo atómico solo se escribe si no hubo ningún error"""
+        return bool(self.validos) and (modo == MODO_PARCIAL or not self.errores)
+
+    def respuesta(self, ids, status_exito, campo='id'):
+        """
+        Respuesta del lote. ``ids`` son los ids escritos, en el orden de
+        ``validos``; vacío si no se escribió nada. En los resultados van
+        como ``campo``.
+        """
+        cuerpo = {
+            'total': len(self.validos) + len(self.errores),
+            'exitosos': len(ids),
+            'fallidos': len(self.errores),
+            'resultados': [
+                {'indice': indice, campo: pk}
+                for (indice, _), pk in zip(self.validos, ids)
+            ],
+            'errores': sorted(self.errores, key=lambda e: e['indice']),
+        }
+        if not ids:
+            codigo = status.HTTP_400_BAD_REQUEST
+        elif self.errores:
+            codigo = status.HTTP_207_MULTI_STATUS
+        else:
+            codigo = status_exito
+        return Response(cuerpo, status=codigo)
+
+
+class BulkMixin:
+    """
+    Agrega operaciones en lote a un ModelViewSet.
+
+    POST  /api/<recurso>/bulk/ - Crea los elementos del lote
+    PATCH /api/<recurso>/bulk/ - Actualiza parcialmente; cada elemento lleva su ``id``
+
+    Los modelos se escriben con ``bulk_create``/``bulk_update``, que no llaman
+    a ``save()`` ni envían señales: lo que hagan las señales del modelo debe
+    repetirse en ``perform_bulk_create``/``perform_bulk_update``.
+    """
+    max_lote = 1000
+
+    @action(detail=False, methods=['post', 'patch'], url_path='bulk')
+    def bulk(self, request):
+        modo = leer_modo(request)
+        elementos = leer_elementos(request, self.max_lote)
+        if request.method == 'POST':
+            return self.bulk_create(elementos, modo)
+        return self.bulk_update(elementos, modo)
+
+    def get_bulk_serializer(self, elementos, **kwargs):
+        """Serializer compartido por todos los elementos del lote"""
+        serializer = self.get_serializer(**kwargs)
+        serializer.context['precargados'] = precargar_relaciones(serializer, elementos)
+        return serializer
+
+    def validar_lote(self, serializer, elementos, resultado):
+        for indice, elemento in enumerate(elementos):
+            try:
+                datos = serializer.run_validation(elemento)
+            except ValidationError as exc:
+                resultado.agregar_error(indice, serializers.as_serializer_error(exc))
+            else:
+                resultado.validos.append((indice, datos))
+
+    def bulk_create(self, elementos, modo):
+        resultado = ResultadoLote()
+        serializer = self.get_bulk_serializer(elementos)
+        self.validar_lote(serializer, elementos, resultado)
+
+        objetos = []
+        if resultado.se_escribe(modo):
+            modelo = self.get_queryset().model
+            objetos = [modelo(**datos) for _, datos in resultado.validos]
+            with transaction.atomic():
+                self.perform_bulk_create(objetos)
+        return resultado.respuesta([o.pk for o in objetos], status.HTTP_201_CREATED)
+
+    def bulk_update(self, elementos, modo):
+        resultado = ResultadoLote()
+        modelo = self.get_queryset().model
+        pk = modelo._meta.pk
+
+        ids = {}
+        por_validar = []
+        for indice, elemento in enumerate(elementos):
+            try:
+                valor = pk.to_python(elemento.get('id'))
+            except DjangoValidationError:
+                valor = None
+            if valor is None:
+                resultado.agregar_error(indice, {'id': ['Se requiere un id válido.']})
+            elif valor in ids.values():
+                resultado.agregar_error(indice, {'id': ['Id repetido en el lote.']})
+            else:
+                ids[indice] = valor
+                por_validar.append(indice)
+
+        instancias = self.get_queryset().in_bulk({ids[indice] for indice in por_validar})
+        serializer = self.get_bulk_serializer(
+            [elementos[indice] for indice in por_validar], partial=True
+        )
+        for indice in por_validar:
+            if ids[indice] not in instancias:
+                resultado.agregar_error(indice, {'id': ['No existe un objeto con este id.']})
+                continue
+            elemento = {k: v for k, v in elementos[indice].items() if k != 'id'}
+            try:
+                datos = serializer.run_validation(elemento)
+            except ValidationError as exc:
+                resultado.agregar_error(indice, serializers.as_serializer_error(exc))
+            else:
+                resultado.validos.append((indice, datos))
+
+        objetos = []
+        if resultado.se_escribe(modo):
+            campos = set()
+            for indice, datos in resultado.validos:
+                objeto = instancias[ids[indice]]
+                for campo, valor in datos.items():
+                    setattr(objeto, campo, valor)
+                campos.update(datos)
+                objetos.append(objeto)
+            with transaction.atomic():
+                self.perform_bulk_update(objetos, campos)
+        return resultado.respuesta([o.pk for o in objetos], status.HTTP_200_OK)
+
+    def perform_bulk_create(self, objetos):
+        self.get_queryset().model._default_manager.bulk_create(objetos, batch_size=TAMANO_LOTE)
+
+    def perform_bulk_update(self, objetos, campos):
+        modelo = self.get_queryset().model
+        # bulk_update no llama a pre_save: los campos auto_now se fijan aquí
+        for campo in modelo._meta.concrete_fields:
+            if getattr(campo, 'auto_now', False):
+                for objeto in objetos:
+                    campo.pre_save(objeto, add=False)
+                campos = set(campos) | {campo.name}
+        if campos:
+            modelo._default_manager.bulk_update(objetos, sorted(campos), batch_size=TAMANO_LOTE)
@@ -0,0 +1,68 @@
+"""
+Selección de campos de las lecturas (sparse fieldsets).
+
+``?fields=nombre,categoria`` devuelve solo esos campos e ``?omit=descripcion``
+todos menos esos; ``id`` se devuelve siempre. En las lecturas rápidas
+(``services.fast``) la selección también recorta el SQL: solo se leen las
+columnas de los campos pedidos, así que el ``descripcion`` de un listado con
+``?fields=nombre`` no se lee de la base ni se envía.
+"""
+import functools
+
+from rest_framework.exceptions import ValidationError
+
+PARAMETRO_CAMPOS = 'fields'
+PARAMETRO_OMITIR = 'omit'
+
+
+@functools.lru_cache(maxsize=None)
+def campos_legibles(serializer_class):
+    """Nombres de los campos que ``serializer_class`` representa, en orden"""
+    return tuple(nombre for nombre, campo in serializer_class().fields.items() if not campo.write_only)
+
+
+def campos_seleccionados(request, serializer_class):
+    """
+    ``frozenset`` de los campos de ``serializer_class`` que pide ``request``,
+    o ``None`` si no pide una selección. Un campo desconocido es un 400.
+    """
+    if request is None:
+        return None
+    parametros = getattr(request, 'query_params', request.GET)
+    pedidos = _lista(parametros.get(PARAMETRO_CAMPOS))
+    omitidos = _lista(parametros.get(PARAMETRO_OMITIR))
+    if pedidos is None and omitidos is None:
+        return None
+
+    legibles = campos_legibles(serializer_class)
+    errores = {}
+    for parametro, nombres in ((PARAMETRO_CAMPOS, pedidos), (PARAMETRO_OMITIR, omitidos)):
+        desconocidos = [nombre for nombre in nombres or () if nombre not in legibles]
+        if desconocidos:
+            errores[parametro] = [f'Campos desconocidos: {", ".join(desconocidos)}.']
+    if errores:
+        raise ValidationError(errores)
+
+    seleccion = set(legibles if pedidos is None else pedidos) - set(omitidos or ())
+    return frozenset(seleccion | {'id'} & set(legibles))
+
+
+def _lista(valor):
+    if valor is None:
+        return None
+    return [nombre for nombre in (parte.strip() for parte in valor.split(',')) if nombre]
+
+
+class CamposSeleccionablesMixin:
+    """
+    Serializer que respeta ``?fields=``/``?omit=`` de la petición de su
+    contexto. Solo recorta la representación: las escrituras validan todos
+    los campos como siempre.
+    """
+
+    def to_representation(self, instance):
+        datos = super().to_representation(instance)
+        seleccion = campos_seleccionados(self.context.get('request'), type(self))
+        if seleccion is None:
+            return datos
+        return {nombre: valor for nombre, valor in datos.items() if nombre in seleccion}
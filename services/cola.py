@@ -0,0 +1,146 @@
+"""
+Cola de escritura diferida (write-behind) para las solicitudes públicas.
+
+Con ``SOLICITUDES_EN_COLA`` activo, ``POST /api/solicitudes/``,
+``POST /api/servicios/{id}/solicitudes/`` y ``POST /api/solicitudes/bulk/``
+validan el cuerpo igual que siempre, pero en lugar de crear las solicitudes
+(INSERT con sus contadores y bloqueos) guardan los datos validados en
+``SolicitudPendiente`` y responden 202 con un id de seguimiento por
+solicitud. ``python manage.py procesar_pendientes`` vacía la cola en lotes:
+un ``bulk_create`` y un ajuste de contadores por lote.
+
+La cola es una tabla y no un archivo local porque los contenedores de
+Render/Railway no tienen disco persistente ni compartido entre procesos.
+"""
+from collections import Counter
+from dataclasses import dataclass
+
+from django.conf import settings
+from django.db import models, transaction
+from django.db.models import Count, Max, Min
+from django.utils import timezone
+
+from . import analitica, contadores
+from .models import Servicio, SolicitudCliente, SolicitudPendiente
+from .sinteticos import sin_auto_now
+
+TAMANO_LOTE = 500
+
+
+def activa():
+    """``True`` si las solicitudes públicas se encolan en vez de insertarse"""
+    return settings.SOLICITUDES_EN_COLA
+
+
+def _valores(datos):
+    return {
+        campo: valor.pk if isinstance(valor, models.Model) else valor
+        for campo, valor in datos.items()
+    }
+
+
+def encolar(datos):
+    """Encola los datos validados de ``SolicitudClienteSerializer``"""
+    return SolicitudPendiente.objects.create(datos=_valores(datos))
+
+
+def encolar_lote(lista_datos):
+    """Como ``encolar``, para los elementos válidos de un lote, con un solo INSERT"""
+    return SolicitudPendiente.objects.bulk_create(
+        [SolicitudPendiente(datos=_valores(datos)) for datos in lista_datos], batch_size=TAMANO_LOTE
+    )
+
+
+@dataclass
+class Lote:
+    procesadas: int = 0
+    descartadas: int = 0
+    retraso_segundos: float = 0.0
+
+    @property
+    def tamano(self):
+        return self.procesadas + self.descartadas
+
+
+def procesar_lote(tamano=TAMANO_LOTE):
+    """
+    Inserta hasta ``tamano`` solicitudes pendientes, las más antiguas
+    primero. Las filas tomadas quedan bloqueadas (``SKIP LOCKED`` en
+    PostgreSQL), así que varios workers pueden vaciar la cola a la vez.
+    """
+    with transaction.atomic():
+        pendientes = list(
+            SolicitudPendiente.objects.select_for_update(skip_locked=True)
+            .filter(procesada__isnull=True)
+            .order_by('id')[:tamano]
+        )
+        if not pendientes:
+            return Lote()
+
+        # El servicio pudo eliminarse mientras la solicitud esperaba
+        existentes = set(
+            Servicio.objects.filter(
+                pk__in={pendiente.datos['servicio'] for pendiente in pendientes}
+            ).values_list('pk', flat=True)
+        )
+        validas = [p for p in pendientes if p.datos['servicio'] in existentes]
+        # La solicitud se creó cuando llegó, no cuando se vacía la cola: así
+        # cae en su día en la analítica y en los filtros desde/hasta
+        solicitudes = [
+            SolicitudCliente(
+                servicio_id=pendiente.datos['servicio'],
+                fecha_creacion=pendiente.recibida,
+                **{campo: valor for campo, valor in pendiente.datos.items() if campo != 'servicio'},
+            )
+            for pendiente in validas
+        ]
+        with sin_auto_now(SolicitudCliente, 'fecha_creacion'):
+            SolicitudCliente.objects.bulk_create(solicitudes, batch_size=TAMANO_LOTE)
+        contadores.ajustar(Counter(contadores.posiciones(solicitudes)))
+        if validas:
+            analitica.reabrir(timezone.localdate(min(p.recibida for p in validas)))
+
+        ahora = timezone.now()
+        for pendiente, solicitud in zip(validas, solicitudes):
+            pendiente.solicitud_id = solicitud.pk
+        for pendiente in pendientes:
+            pendiente.procesada = ahora
+            if pendiente.solicitud_id is None:
+                pendiente.error = 'El servicio ya no existe.'
+        SolicitudPendiente.objects.bulk_update(
+            pendientes, ['procesada', 'solicitud', 'error'], batch_size=TAMANO_LOTE
+        )
+
+    return Lote(
+        procesadas=len(validas),
+        descartadas=len(pendientes) - len(validas),
+        retraso_segundos=(ahora - pendientes[0].recibida).total_seconds(),
+    )
+
+
+def purgar(antes_de):
+    """Elimina las pendientes ya procesadas antes de ``antes_de``"""
+    eliminadas, _ = SolicitudPendiente.objects.filter(procesada__lt=antes_de).delete()
+    return eliminadas
+
+
+def estado():
+    """Profundidad de la cola, retraso de la más antigua y último lote procesado"""
+    en_cola = SolicitudPendiente.objects.filter(procesada__isnull=True).aggregate(
+        total=Count('pk'), mas_antigua=Min('recibida')
+    )
+    ultimo = SolicitudPendiente.objects.aggregate(procesada=Max('procesada'))['procesada']
+    # Todas las filas de un lote comparten su fecha de procesamiento
+    tamano_ultimo = (
+        SolicitudPendiente.objects.filter(procesada=ultimo).count() if ultimo else 0
+    )
+    mas_antigua = en_cola['mas_antigua']
+    return {
+        'activa': activa(),
+        'en_cola': en_cola['total'],
+        'mas_antigua': mas_antigua,
+        'retraso_segundos': (
+            round((timezone.now() - mas_antigua).total_seconds(), 3) if mas_antigua else 0
+        ),
+        'ultimo_lote': {'procesado': ultimo, 'tamano': tamano_ultimo},
+    }
@@ -0,0 +1,222 @@
+"""
+Validadores HTTP (ETag / Last-Modified) para las lecturas del catálogo, e
+``If-Match`` para sus escrituras.
+"""
+import hashlib
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date, parse_etags
+from rest_framework import status
+from rest_framework.exceptions import APIException
+from rest_framework.response import Response
+
+from .fast import FastReadMixin
+
+
+def calcular_etag(*partes):
+    """ETag fuerte a partir de los valores que determinan la respuesta"""
+    crudo = '|'.join('' if parte is None else str(parte) for parte in partes)
+    return '"%s"' % hashlib.sha1(crudo.encode('utf-8')).hexdigest()
+
+
+class ConditionalGetMixin(FastReadMixin):
+    """
+    Agrega ETag y Last-Modified a ``list`` y ``retrieve``.
+
+    Los validadores se calculan desde la base de datos y no desde el cuerpo de
+    la respuesta: en el listado, con el valor más reciente de los campos de
+    ``get_campos_version()`` (por defecto ``campo_version``) y el número de
+    filas del queryset filtrado; en el detalle, con esos campos del objeto.
+    Si ``If-None-Match``/``If-Modified-Since`` indican que el cliente ya tiene
+    esa versión, se responde 304 sin serializar.
+
+    Con ``?paginacion=cursor`` el listado no cuenta las filas (la paginación
+    por cursor existe para evitar ese ``COUNT``): los validadores salen de la
+    página misma, ver ``validadores_de_pagina``.
+    """
+    campo_version = 'ultima_actualizacion'
+
+    def get_campos_version(self):
+        """Campos cuyo valor más reciente es la versión de la respuesta"""
+        return [self.campo_version]
+
+    def get_columnas_requeridas(self):
+        return [*super().get_columnas_requeridas(), *self.get_campos_version()]
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        campos = self.get_campos_version()
+        if self.paginator.usa_cursor(request):
+            return self.listar_por_cursor(request, queryset, campos)
+        agregado = queryset.order_by().aggregate(**agregados_de_version(campos))
+        etag, ultima = validadores_de_lista(request, agregado, campos)
+
+        response = self.respuesta_condicional(request, etag, ultima)
+        if response is None:
+            response = self.listar(queryset, total=agregado['total'])
+        return self.agregar_validadores(response, etag, ultima)
+
+    def listar_por_cursor(self, request, queryset, campos):
+        representacion = self.get_values_representation()
+        page = self.paginator.paginate_queryset(
+            representacion.preparar(queryset, columnas_extra=campos), request, view=self
+        )
+        etag, ultima = validadores_de_pagina(request, page, campos, self.paginator.keyset.has_next)
+
+        response = self.respuesta_condicional(request, etag, ultima)
+        if response is None:
+            response = self.get_paginated_response(representacion.many(page))
+        return self.agregar_validadores(response, etag, ultima)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        version = self.version_de(instance)
+        etag = self.etag_de(instance, version)
+
+        response = self.respuesta_condicional(request, etag, version)
+        if response is None:
+            response = Response(self.get_values_representation().instance(instance))
+        return self.agregar_validadores(response, etag, version)
+
+    def version_de(self, instance):
+        return version_mas_reciente(
+            valor_de_campo(instance, campo) for campo in self.get_campos_version()
+        )
+
+    def etag_de(self, instance, version):
+        """ETag del detalle; es también el que se compara con ``If-Match``"""
+        return calcular_etag('detail', instance.pk, version)
+
+    def respuesta_condicional(self, request, etag, ultima_modificacion):
+        return respuesta_condicional(request, etag, ultima_modificacion)
+
+    def agregar_validadores(self, response, etag, ultima_modificacion):
+        return agregar_validadores(response, etag, ultima_modificacion)
+
+
+class PreconditionFailed(APIException):
+    status_code = status.HTTP_412_PRECONDITION_FAILED
+    default_detail = 'El recurso cambió desde que se leyó. Vuelve a leerlo y reintenta.'
+    default_code = 'precondition_failed'
+
+
+class PreconditionRequired(APIException):
+    status_code = status.HTTP_428_PRECONDITION_REQUIRED
+    default_detail = 'Se requiere el header If-Match con el ETag del recurso.'
+    default_code = 'precondition_required'
+
+
+class ConditionalUpdateMixin(ConditionalGetMixin):
+    """
+    Control de concurrencia optimista en ``PUT``/``PATCH`` del detalle.
+
+    Si la petición trae ``If-Match``, el objeto se lee bloqueado (``SELECT
+    ... FOR UPDATE``, dentro de la transacción de la escritura) y se compara
+    su ETag, el mismo del ``GET``: si no coincide se responde 412 sin validar
+    ni escribir nada. Con ``EXIGIR_IF_MATCH`` las escrituras sin el header
+    responden 428. La respuesta lleva el ETag de la versión nueva.
+    """
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action in ('update', 'partial_update') and 'If-Match' in self.request.headers:
+            # Nadie más puede escribir la fila entre la comparación y el UPDATE
+            queryset = queryset.select_for_update()
+        return queryset
+
+    def update(self, request, *args, **kwargs):
+        with transaction.atomic():
+            response = super().update(request, *args, **kwargs)
+        instance = self._instancia_actualizada
+        version = self.version_de(instance)
+        return self.agregar_validadores(response, self.etag_de(instance, version), version)
+
+    def get_object(self):
+        instance = super().get_object()
+        if self.action in ('update', 'partial_update'):
+            self.verificar_if_match(instance)
+            self._instancia_actualizada = instance
+        return instance
+
+    def verificar_if_match(self, instance):
+        encabezado = self.request.headers.get('If-Match')
+        if encabezado is None:
+            if settings.EXIGIR_IF_MATCH:
+                raise PreconditionRequired()
+            return
+        if not cumple_if_match(encabezado, self.etag_de(instance, self.version_de(instance))):
+            raise PreconditionFailed()
+
+
+def cumple_if_match(encabezado, etag):
+    """Si ``etag`` es uno de los de ``If-Match`` (o el header es ``*``)"""
+    etags = parse_etags(encabezado)
+    if etags == ['*']:
+        return True
+    # El ETag se calcula de la versión en la base, no de los bytes de la
+    # respuesta: la versión débil que deja la compresión vale igual
+    return etag in (candidato.removeprefix('W/') for candidato in etags)
+
+
+def agregados_de_version(campos):
+    """
+    Argumentos de ``aggregate()`` para los validadores de un listado: el valor
+    más reciente de cada campo de ``campos`` y el número de filas
+    """
+    return {**{f'{campo}__max': Max(campo) for campo in campos}, 'total': Count('pk')}
+
+
+def validadores_de_lista(request, agregado, campos):
+    """ETag y última modificación de un listado a partir de ``agregados_de_version``"""
+    ultima = version_mas_reciente(agregado[f'{campo}__max'] for campo in campos)
+    etag = calcular_etag('list', request.get_full_path(), ultima, agregado['total'])
+    return etag, ultima
+
+
+def validadores_de_pagina(request, filas, campos, hay_siguiente):
+    """
+    ETag y última modificación de una página por cursor, a partir de sus filas
+    (ids y campos de versión) y de si hay página siguiente, sin contar todo el
+    queryset filtrado. Una fila que cambia, entra o sale de la página cambia
+    el ETag.
+    """
+    ultima = version_mas_reciente(fila[campo] for fila in filas for campo in campos)
+    ids = ','.join(str(fila['id']) for fila in filas)
+    etag = calcular_etag('cursor', request.get_full_path(), ultima, ids, hay_siguiente)
+    return etag, ultima
+
+
+def version_mas_reciente(valores):
+    """La fecha más reciente de ``valores`` (``None`` si no hay ninguna)"""
+    return max((valor for valor in valores if valor is not None), default=None)
+
+
+def valor_de_campo(instance, campo):
+    """Valor de ``campo`` (con ``__`` para relaciones) en ``instance``"""
+    for parte in campo.split('__'):
+        instance = getattr(instance, parte, None)
+    return instance
+
+
+def respuesta_condicional(request, etag, ultima_modificacion):
+    """Devuelve un 304 si el cliente ya tiene esta versión, si no ``None``"""
+    return get_conditional_response(
+        request,
+        etag=etag,
+        last_modified=_timestamp(ultima_modificacion),
+    )
+
+
+def agregar_validadores(response, etag, ultima_modificacion):
+    response.headers.setdefault('ETag', etag)
+    timestamp = _timestamp(ultima_modificacion)
+    if timestamp is not None and not response.has_header('Last-Modified'):
+        response.headers['Last-Modified'] = http_date(timestamp)
+    return response
+
+
+def _timestamp(fecha):
+    return int(fecha.timestamp()) if fecha is not None else None
@@ -0,0 +1,147 @@
+"""
+Contadores de solicitudes por servicio y estatus (``ContadorSolicitudes``).
+
+En lugar de un ``COUNT ... GROUP BY`` sobre las solicitudes en cada lectura,
+cada alta, cambio de estatus (o de servicio) y baja de una solicitud suma o
+resta en el contador de su servicio con un ``UPDATE`` atómico
+(``SET nuevo = nuevo + 1``), de modo que escrituras concurrentes no se pisan.
+Las altas y cambios individuales pasan por las señales de
+``SolicitudCliente``; las escrituras en lote por ``ajustar()`` en el ViewSet.
+Lo que se salte ambos caminos (``queryset.update()``, SQL directo) se corrige
+con ``python manage.py reconciliar_contadores``.
+"""
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, Count, F, Value, When
+from django.utils import timezone
+
+from .models import ContadorSolicitudes, Servicio, SolicitudCliente
+
+ESTATUS = [valor for valor, _ in SolicitudCliente.ESTATUS_CHOICES]
+
+# Campos de la solicitud que determinan en qué contador se cuenta
+CAMPOS_SOLICITUD = {'servicio', 'servicio_id', 'estatus'}
+
+# Campo que cambia con los contadores; forma parte de la versión (ETag /
+# Last-Modified) de las lecturas de servicios que los incluyen
+CAMPO_VERSION = 'contador__actualizado'
+
+
+def pide_contadores(request):
+    """``True`` si la lectura de servicios pide los contadores (``?contadores=true``)"""
+    return request.GET.get('contadores', '').lower() in ('1', 'true')
+
+
+def crear_contadores(servicios):
+    """Contadores en cero para servicios recién creados (una sola consulta)"""
+    ContadorSolicitudes.objects.bulk_create(
+        [ContadorSolicitudes(servicio_id=servicio.pk) for servicio in servicios],
+        ignore_conflicts=True,
+    )
+
+
+def ajustar(cambios, reconstruir_faltantes=True):
+    """
+    Aplica ``cambios`` (``{(servicio_id, estatus): delta}``) con un solo
+    ``UPDATE`` (``SET nuevo = nuevo + CASE servicio_id WHEN ... END``). Si a
+    algún servicio le falta su contador, se reconstruye desde las solicitudes
+    (que ya incluyen el cambio), salvo con ``reconstruir_faltantes=False``.
+    """
+    por_estatus = defaultdict(dict)
+    for (servicio_id, estatus), delta in cambios.items():
+        if delta and estatus in ESTATUS:
+            por_estatus[estatus][servicio_id] = delta
+    servicio_ids = {servicio_id for deltas in por_estatus.values() for servicio_id in deltas}
+    if not servicio_ids:
+        return
+
+    valores = {
+        estatus: F(estatus) + Case(
+            *[When(servicio_id=servicio_id, then=Value(delta)) for servicio_id, delta in deltas.items()],
+            default=Value(0),
+        )
+        for estatus, deltas in por_estatus.items()
+    }
+    contadores = ContadorSolicitudes.objects.filter(servicio_id__in=servicio_ids)
+    actualizados = contadores.update(actualizado=timezone.now(), **valores)
+    if actualizados < len(servicio_ids) and reconstruir_faltantes:
+        existentes = set(contadores.values_list('servicio_id', flat=True))
+        reconciliar(servicio_ids - existentes)
+
+
+def posiciones(solicitudes):
+    """``(servicio_id, estatus)`` de cada solicitud, como las usa ``ajustar``"""
+    return [(solicitud.servicio_id, solicitud.estatus) for solicitud in solicitudes]
+
+
+def leer_posiciones(pks):
+    """
+    ``{pk: (servicio_id, estatus)}`` guardados en la base de datos, con las
+    filas bloqueadas hasta el final de la transacción
+    """
+    filas = (
+        SolicitudCliente.objects.select_for_update()
+        .filter(pk__in=pks)
+        .values_list('pk', 'servicio_id', 'estatus')
+    )
+    return {pk: (servicio_id, estatus) for pk, servicio_id, estatus in filas}
+
+
+def cambios_entre(anteriores, actuales):
+    """
+    Cambios en los contadores de pasar de ``anteriores`` a ``actuales``
+    (iterables de pares ``(servicio_id, estatus)``; ``None`` si no existía)
+    """
+    cambios = Counter()
+    for anterior, actual in zip(anteriores, actuales):
+        if anterior == actual:
+            continue
+        if anterior is not None:
+            cambios[anterior] -= 1
+        if actual is not None:
+            cambios[actual] += 1
+    return cambios
+
+
+def reconciliar(servicio_ids=None):
+    """
+    Reconstruye los contadores de ``servicio_ids`` (o de todos) desde las
+    solicitudes y devuelve cuántos cambiaron.
+
+    Las filas de los contadores quedan bloqueadas (``SELECT ... FOR UPDATE``)
+    mientras se cuenta, así que los ajustes concurrentes esperan y se
+    aplican sobre el valor ya reconstruido.
+    """
+    servicios = Servicio.objects.all()
+    if servicio_ids is not None:
+        servicios = servicios.filter(pk__in=servicio_ids)
+
+    with transaction.atomic():
+        crear_contadores(servicios.only('pk'))
+        contadores = ContadorSolicitudes.objects.select_for_update().filter(
+            servicio__in=servicios.values('pk')
+        )
+        contadores = {contador.servicio_id: contador for contador in contadores}
+
+        conteos = defaultdict(dict)
+        filas = (
+            SolicitudCliente.objects.filter(servicio_id__in=list(contadores))
+            .order_by()
+            .values_list('servicio_id', 'estatus')
+            .annotate(total=Count('pk'))
+        )
+        for servicio_id, estatus, total in filas:
+            conteos[servicio_id][estatus] = total
+
+        ahora = timezone.now()
+        cambiados = []
+        for servicio_id, contador in contadores.items():
+            valores = {estatus: conteos[servicio_id].get(estatus, 0) for estatus in ESTATUS}
+            if any(getattr(contador, estatus) != valor for estatus, valor in valores.items()):
+                for estatus, valor in valores.items():
+                    setattr(contador, estatus, valor)
+                contador.actualizado = ahora
+                cambiados.append(contador)
+        ContadorSolicitudes.objects.bulk_update(cambiados, [*ESTATUS, 'actualizado'], batch_size=1000)
+    return len(cambiados)
@@ -0,0 +1,243 @@
+"""
+Ruta rápida de solo lectura para ``list`` y ``retrieve``.
+
+En lugar de instanciar modelos y pasar cada campo por el ``to_representation``
+de DRF, las listas se leen con ``.values()`` y cada fila se convierte con
+funciones precalculadas a partir de los campos del serializer. El resultado
+es el mismo que el de ``serializer.data``: decimales como texto con sus
+decimales fijos, fechas ISO 8601 y fechas-hora en la zona horaria actual
+(``Z`` si es UTC). Con ``?fields=``/``?omit=`` (ver ``services.campos``)
+solo se leen y se representan las columnas de los campos pedidos.
+"""
+import decimal
+import operator
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured, ObjectDoesNotExist
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.fields import empty
+from rest_framework.response import Response
+from rest_framework.settings import ISO_8601, api_settings
+
+from core.metricas import medir_serializacion
+from .campos import campos_seleccionados
+
+# Campos cuyo to_representation devuelve el mismo valor que da la base de datos
+_CAMPOS_DIRECTOS = (
+    serializers.BooleanField,
+    serializers.CharField,
+    serializers.ChoiceField,
+    serializers.IntegerField,
+    serializers.PrimaryKeyRelatedField,
+)
+
+
+def _conversor_decimal(campo):
+    exponente = -campo.decimal_places
+
+    def convertir(valor):
+        # Los valores de la base de datos ya vienen con sus decimales fijos
+        if isinstance(valor, decimal.Decimal) and valor.as_tuple().exponent == exponente:
+            return '{:f}'.format(valor)
+        return campo.to_representation(valor)
+    return convertir
+
+
+def _conversor_fecha_hora(campo, zona):
+    def convertir(valor):
+        if timezone.is_naive(valor):
+            return campo.to_representation(valor)
+        valor = valor.astimezone(zona).isoformat()
+        if valor.endswith('+00:00'):
+            valor = valor[:-6] + 'Z'
+        return valor
+    return convertir
+
+
+def _fecha_iso(valor):
+    return valor.isoformat()
+
+
+class ValuesRepresentation:
+    """
+    Representación de solo lectura de un ``ModelSerializer`` a partir de
+    filas de ``.values()`` (o de instancias del modelo).
+
+    Solo admite campos cuya representación se puede calcular sin DRF (ver
+    ``_CAMPOS_DIRECTOS``, decimales y fechas en ISO 8601); con cualquier otro
+    campo se lanza ``ImproperlyConfigured`` al crearla. ``seleccion`` limita
+    los campos (y las columnas) a esos nombres.
+    """
+    _cache = {}
+
+    @classmethod
+    def para(cls, serializer_class, seleccion=None):
+        clave = (serializer_class, seleccion)
+        if clave not in cls._cache:
+            cls._cache[clave] = cls(serializer_class, seleccion)
+        return cls._cache[clave]
+
+    def __init__(self, serializer_class, seleccion=None):
+        self.serializer_class = serializer_class
+        self.seleccion = seleccion
+        self.modelo = serializer_class.Meta.model
+        self.campos = [
+            campo for campo in serializer_class().fields.values()
+            if not campo.write_only and (seleccion is None or campo.field_name in seleccion)
+        ]
+        for campo in self.campos:
+            self._validar(campo)
+        self.columnas = ['__'.join(campo.source_attrs) for campo in self.campos]
+
+    def _validar(self, campo):
+        if campo.source == '*' or not campo.source_attrs:
+            raise ImproperlyConfigured(f'{campo.field_name}: campo sin columna')
+        if isinstance(campo, serializers.DecimalField):
+            coerce = getattr(campo, 'coerce_to_string', api_settings.COERCE_DECIMAL_TO_STRING)
+            if not coerce or campo.localize or campo.decimal_places is None:
+                raise ImproperlyConfigured(f'{campo.field_name}: formato decimal no soportado')
+        elif isinstance(campo, (serializers.DateTimeField, serializers.DateField)):
+            formato = getattr(campo, 'format', empty)
+            if formato is empty:
+                formato = (
+                    api_settings.DATETIME_FORMAT
+                    if isinstance(campo, serializers.DateTimeField)
+                    else api_settings.DATE_FORMAT
+                )
+            if not isinstance(formato, str) or formato.lower() != ISO_8601:
+                raise ImproperlyConfigured(f'{campo.field_name}: formato de fecha no soportado')
+        elif not isinstance(campo, _CAMPOS_DIRECTOS):
+            raise ImproperlyConfigured(
+                f'{campo.field_name}: {type(campo).__name__} no tiene representación rápida'
+            )
+
+    def preparar(self, queryset, columnas_extra=()):
+        """
+        ``queryset.values()`` con las columnas del serializer, las de la
+        ordenación y las anotaciones del queryset (p. ej. ``relevancia``):
+        la paginación por cursor las necesita aunque no se representen.
+        ``columnas_extra`` se leen también (p. ej. las de la versión).
+        """
+        extra = [a for a in queryset.query.annotations if a not in self.columnas]
+        for columna in [*self._columnas_de_orden(queryset), *columnas_extra]:
+            if columna not in self.columnas and columna not in extra:
+                extra.append(columna)
+        return queryset.values(*self.columnas, *extra)
+
+    def _columnas_de_orden(self, queryset):
+        query = queryset.query
+        if query.order_by:
+            orden = query.order_by
+        elif query.default_ordering:
+            orden = self.modelo._meta.ordering
+        else:
+            orden = ()
+        columnas = [c.lstrip('-') for c in orden if isinstance(c, str) and c != '?' and '__' not in c]
+        pk = self.modelo._meta.pk.name
+        return [pk if columna == 'pk' else columna for columna in [*columnas, pk]]
+
+    def _conversores(self, instancias):
+        zona = timezone.get_current_timezone() if settings.USE_TZ else None
+        conversores = []
+        for campo, columna in zip(self.campos, self.columnas):
+            if instancias:
+                obtener = self._atributo(campo)
+            else:
+                obtener = operator.itemgetter(columna)
+
+            if isinstance(campo, serializers.DecimalField):
+                convertir = _conversor_decimal(campo)
+            elif isinstance(campo, serializers.DateTimeField):
+                if zona is None or hasattr(campo, 'timezone'):
+                    convertir = campo.to_representation
+                else:
+                    convertir = _conversor_fecha_hora(campo, zona)
+            elif isinstance(campo, serializers.DateField):
+                convertir = _fecha_iso
+            else:
+                convertir = None
+            conversores.append((campo.field_name, obtener, convertir))
+        return conversores
+
+    def _atributo(self, campo):
+        atributos = list(campo.source_attrs)
+        if isinstance(campo, serializers.PrimaryKeyRelatedField) and len(atributos) == 1:
+            # servicio -> servicio_id, sin cargar el objeto relacionado
+            atributos = [self.modelo._meta.get_field(atributos[0]).attname]
+        obtener = operator.attrgetter('.'.join(atributos))
+        if len(atributos) == 1:
+            return obtener
+
+        def obtener_relacionado(instancia):
+            # Como DRF: si falta el objeto relacionado, el valor es None
+            try:
+                return obtener(instancia)
+            except ObjectDoesNotExist:
+                return None
+        return obtener_relacionado
+
+    def _representar(self, fila, conversores):
+        datos = {}
+        for nombre, obtener, convertir in conversores:
+            valor = obtener(fila)
+            if valor is not None and convertir is not None:
+                valor = convertir(valor)
+            datos[nombre] = valor
+        return datos
+
+    def many(self, filas):
+        """Representa una lista de filas de ``preparar()``"""
+        with medir_serializacion():
+            return list(self.iterar(filas))
+
+    def iterar(self, filas):
+        """Como ``many``, pero fila por fila (para iteradores largos)"""
+        conversores = self._conversores(instancias=False)
+        for fila in filas:
+            yield self._representar(fila, conversores)
+
+    def instance(self, instancia):
+        """Representa una instancia del modelo"""
+        with medir_serializacion():
+            return self._representar(instancia, self._conversores(instancias=True))
+
+
+class FastReadMixin:
+    """
+    ``list`` y ``retrieve`` con ``ValuesRepresentation`` del
+    ``serializer_class`` del ViewSet y los campos de ``?fields=``/``?omit=``;
+    las escrituras siguen usando el serializer.
+    """
+
+    def get_values_representation(self):
+        serializer_class = self.get_serializer_class()
+        return ValuesRepresentation.para(serializer_class, campos_seleccionados(self.request, serializer_class))
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        if self.action == 'retrieve':
+            representacion = self.get_values_representation()
+            if representacion.seleccion is not None:
+                # Del objeto solo se cargan las columnas que se representan
+                queryset = queryset.only(*representacion.columnas, *self.get_columnas_requeridas())
+        return queryset
+
+    def get_columnas_requeridas(self):
+        """Columnas que el detalle lee además de las que representa"""
+        return []
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        return self.listar(queryset)
+
+    def retrieve(self, request, *args, **kwargs):
+        return Response(self.get_values_representation().instance(self.get_object()))
+
+    def listar(self, queryset, total=None):
+        """Página de ``queryset`` representada con ``ValuesRepresentation``"""
+        representacion = self.get_values_representation()
+        page = self.paginator.paginate_queryset(
+            representacion.preparar(queryset), self.request, view=self, total=total
+        )
+        return self.get_paginated_response(representacion.many(page))
@@ -1,32 +1,136 @@
+import datetime
+import decimal
+import hashlib
+
 import django_filters
-from django.db import models
+from django.utils import timezone
+from django_filters.rest_framework import DjangoFilterBackend, FilterSet
+from django_filters.utils import translate_validation
+from django_filters.widgets import BooleanWidget
 from .models import Servicio, SolicitudCliente
+from .search import buscar_servicios
+
+
+class HuellaConsulta(tuple):
+    """
+    Huella canónica de una consulta: tupla ordenada de pares
+    ``(filtro, valor normalizado)`` con los filtros activos.
+
+    Es hashable y no depende del orden de los parámetros, así que sirve como
+    clave para caché, logs y métricas.
+    """
+
+    @property
+    def clave(self):
+        """Representación corta y estable de la huella"""
+        return hashlib.sha1(repr(tuple(self)).encode('utf-8')).hexdigest()[:16]
+
+    def como_dict(self):
+        return dict(self)
+
+
+def _normalizar_valor(valor):
+    if isinstance(valor, bool):
+        return 'true' if valor else 'false'
+    if isinstance(valor, decimal.Decimal):
+        return format(valor.normalize(), 'f')
+    if isinstance(valor, (list, tuple)):
+        return tuple(_normalizar_valor(v) for v in valor)
+    if isinstance(valor, str):
+        return ' '.join(valor.split())
+    return str(valor)
+
+
+class BooleanoWidget(BooleanWidget):
+    """
+    ``BooleanWidget`` (true/false y 1/0, sin distinguir mayúsculas) que además
+    acepta los valores del ``NullBooleanSelect`` que se usaba antes (2/3) y
+    yes/no, para no romper a los clientes que ya los envían.
+    """
+    VALORES_COMPATIBLES = {'2': True, '3': False, 'yes': True, 'no': False}
+
+    def value_from_datadict(self, data, files, name):
+        valor = data.get(name)
+        if isinstance(valor, str) and valor.lower() in self.VALORES_COMPATIBLES:
+            return self.VALORES_COMPATIBLES[valor.lower()]
+        return super().value_from_datadict(data, files, name)
+
 
+class CanonicalFilterSet(FilterSet):
+    """
+    FilterSet base: valida los parámetros una sola vez (con el formulario del
+    FilterSet) y expone la huella canónica de los filtros aplicados.
+    """
+
+    def huella(self):
+        if not self.is_valid():
+            return HuellaConsulta()
+        return HuellaConsulta(sorted(
+            (nombre, _normalizar_valor(valor))
+            for nombre, valor in self.form.cleaned_data.items()
+            if valor not in (None, '', [], ())
+        ))
+
+
+class CanonicalFilterBackend(DjangoFilterBackend):
+    """
+    Único backend de filtrado de los ViewSets: aplica el FilterSet y deja la
+    huella de la consulta en ``request.huella_consulta``.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        filterset = self.get_filterset(request, queryset, view)
+        if filterset is None:
+            return queryset
+        return aplicar_filterset(request, filterset)
 
-class ServicioFilter(django_filters.FilterSet):
+
+def aplicar_filterset(request, filterset):
+    """Valida ``filterset``, registra su huella en la petición y devuelve el queryset"""
+    if not filterset.is_valid():
+        raise translate_validation(filterset.errors)
+    # Se guarda en la HttpRequest para que también la vean los middlewares
+    getattr(request, '_request', request).huella_consulta = filterset.huella()
+    return filterset.qs
+
+
+class ServicioFilter(CanonicalFilterSet):
     """
     Filtros para el modelo Servicio.
     """
+    ORDENAR_POR_CHOICES = [
+        ('precio_asc', 'Precio ascendente'),
+        ('precio_desc', 'Precio descendente'),
+        ('fecha_asc', 'Fecha ascendente'),
+        ('fecha_desc', 'Fecha descendente'),
+    ]
+
     categoria = django_filters.ChoiceFilter(choices=Servicio.CATEGORIA_CHOICES)
-    activo = django_filters.BooleanFilter()
+    activo = django_filters.BooleanFilter(widget=BooleanoWidget(), method='filter_activo')
     min_precio = django_filters.NumberFilter(field_name='precio_mxn', lookup_expr='gte')
     max_precio = django_filters.NumberFilter(field_name='precio_mxn', lookup_expr='lte')
     search = django_filters.CharFilter(method='filter_search')
-    ordenar_por = django_filters.CharFilter(method='filter_ordenar')
+    ordenar_por = django_filters.ChoiceFilter(choices=ORDENAR_POR_CHOICES, method='filter_ordenar')
+    # Se declara después de ordenar_por: si llegan ambos, gana ordering
+    ordering = django_filters.OrderingFilter(fields=['precio_mxn', 'fecha_publicacion', 'nombre'])
 
     class Meta:
         model = Servicio
         fields = ['categoria', 'activo', 'min_precio', 'max_precio']
 
+    def filter_activo(self, queryset, name, value):
+        """``activo=true`` es el catálogo público (``Servicio.activos``)"""
+        return queryset.activos() if value else queryset.filter(activo=False)
+
     def filter_search(self, queryset, name, value):
         """
-        Búsqueda por nombre o descripción.
+        Búsqueda de texto completo por nombre o descripción, ordenada por
+        relevancia salvo que se pida otra ordenación (ver ``services.search``).
         """
         if value:
-            return queryset.filter(
-                models.Q(nombre__icontains=value) |
-                models.Q(descripcion__icontains=value)
-            )
+            datos = self.form.cleaned_data
+            otro_orden = datos.get('ordenar_por') or datos.get('ordering')
+            return buscar_servicios(queryset, value, ordenar=not otro_orden)
         return queryset
 
     def filter_ordenar(self, queryset, name, value):
@@ -45,15 +149,29 @@ class ServicioFilter(django_filters.FilterSet):
         return queryset
 
 
-class SolicitudClienteFilter(django_filters.FilterSet):
+class SolicitudClienteFilter(CanonicalFilterSet):
     """
     Filtros para el modelo SolicitudCliente.
+
+    ``desde`` y ``hasta`` son fechas (inclusive) en la zona horaria del
+    proyecto; se traducen a un rango sobre ``fecha_creacion`` para que pueda
+    usarse su índice.
     """
     estatus = django_filters.ChoiceFilter(choices=SolicitudCliente.ESTATUS_CHOICES)
-    servicio = django_filters.NumberFilter(field_name='servicio__id')
+    servicio = django_filters.NumberFilter(field_name='servicio_id')
+    desde = django_filters.DateFilter(method='filter_desde')
+    hasta = django_filters.DateFilter(method='filter_hasta')
 
     class Meta:
         model = SolicitudCliente
         fields = ['estatus', 'servicio']
 
+    def filter_desde(self, queryset, name, value):
+        return queryset.filter(fecha_creacion__gte=_inicio_del_dia(value))
+
+    def filter_hasta(self, queryset, name, value):
+        return queryset.filter(fecha_creacion__lt=_inicio_del_dia(value + datetime.timedelta(days=1)))
+
 
+def _inicio_del_dia(fecha):
+    return timezone.make_aware(datetime.datetime.combine(fecha, datetime.time.min))
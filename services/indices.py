@@ -0,0 +1,215 @@
+"""
+Asesor de índices.
+
+Ejecuta contra la base de datos configurada las lecturas que hacen los
+ViewSets (``FORMAS``: cada combinación de filtros y ordenación que se usa en
+la práctica) con el cliente de pruebas de Django, captura sus consultas y
+revisa el plan de cada una (``EXPLAIN``, o ``EXPLAIN QUERY PLAN`` en SQLite).
+De ahí salen:
+
+- índices de las tablas que consultan que ningún plan usa (pueden usarlos
+  otras consultas, como las de los comandos);
+- consultas que recorren una tabla completa teniendo filtros, o que ordenan
+  sin índice, con una sugerencia de ``models.Index`` (igualdades del WHERE y
+  después las columnas del ORDER BY).
+
+En PostgreSQL agrega además los índices con ``idx_scan = 0`` en
+``pg_stat_user_indexes``, es decir, sin uso real desde el último reinicio de
+las estadísticas. Lo usa ``python manage.py asesor_indices``.
+"""
+import re
+from contextlib import ExitStack
+from dataclasses import dataclass, field
+
+from django.apps import apps
+from django.db import connection, connections
+from django.test import Client, override_settings
+from django.urls import reverse
+
+from core.consultas_lentas import huella, plan
+
+# (ruta, parámetros) de las lecturas de los ViewSets. ``{servicio}`` se
+# reemplaza por el id de un servicio con solicitudes, igual que el ``pk`` de
+# las rutas de detalle
+FORMAS = [
+    ('servicio-list', {}),
+    ('servicio-list', {'activo': 'true'}),
+    ('servicio-list', {'categoria': 'Web'}),
+    ('servicio-list', {'categoria': 'Web', 'activo': 'true'}),
+    ('servicio-list', {'ordenar_por': 'precio_desc'}),
+    ('servicio-list', {'min_precio': '10000', 'ordenar_por': 'precio_asc'}),
+    ('servicio-list', {'search': 'nube'}),
+    ('servicio-list', {'contadores': 'true'}),
+    ('servicio-list', {'paginacion': 'cursor'}),
+    ('servicio-estadisticas', {}),
+    ('servicio-detail', {}),
+    ('servicio-solicitudes', {}),
+    ('solicitud-list', {}),
+    ('solicitud-list', {'paginacion': 'cursor'}),
+    ('solicitud-list', {'estatus': 'nuevo'}),
+    ('solicitud-list', {'servicio': '{servicio}'}),
+]
+
+# Planes de SQLite y de PostgreSQL
+_USO_SQLITE = re.compile(r'\b(?:SCAN|SEARCH) (\w+)(?: AS \w+)? USING (?:COVERING )?INDEX (\w+)')
+_RECORRIDO_SQLITE = re.compile(r'\bSCAN (\w+)(?: AS \w+)?$')
+_USO_PG = re.compile(r'(?:Index (?:Only )?Scan(?: Backward)? using (\w+) on (\w+)|Bitmap Index Scan on (\w+))')
+_RECORRIDO_PG = re.compile(r'Seq Scan on (\w+)')
+_ORDEN = re.compile(r'USE TEMP B-TREE FOR ORDER BY|^\s*(?:->\s*)?Sort\b')
+
+
+@dataclass
+class Consulta:
+    """Una consulta distinta, con las formas que la ejecutan y su plan"""
+    sql: str
+    params: tuple
+    alias: str
+    formas: list = field(default_factory=list)
+    plan: list = field(default_factory=list)
+    indices: set = field(default_factory=set)
+    problemas: list = field(default_factory=list)
+
+    @property
+    def sugerencia(self):
+        return sugerir_indice(self.sql)
+
+
+def tablas_de_la_app():
+    return {modelo._meta.db_table for modelo in apps.get_app_config('services').get_models()}
+
+
+def indices_existentes():
+    """``{(tabla, índice): columnas}`` de los índices de la app (sin llaves primarias, únicos ni FKs)"""
+    indices = {}
+    with connection.cursor() as cursor:
+        for tabla in sorted(tablas_de_la_app() & set(connection.introspection.table_names(cursor))):
+            relaciones = connection.introspection.get_relations(cursor, tabla)
+            for nombre, restriccion in connection.introspection.get_constraints(cursor, tabla).items():
+                if not restriccion['index'] or restriccion['primary_key'] or restriccion['unique']:
+                    continue
+                columnas = restriccion['columns']
+                if len(columnas) == 1 and columnas[0] in relaciones:
+                    continue  # El de la llave foránea, necesario para los borrados en cascada
+                indices[tabla, nombre] = columnas
+    return indices
+
+
+def sin_uso_en_estadisticas():
+    """Índices de la app con ``idx_scan = 0`` en PostgreSQL (vacío en otras bases)"""
+    if connection.vendor != 'postgresql':
+        return set()
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT relname, indexrelname FROM pg_stat_user_indexes WHERE idx_scan = 0')
+        return {(tabla, indice) for tabla, indice in cursor.fetchall() if tabla in tablas_de_la_app()}
+
+
+def capturar(formas=FORMAS):
+    """``{huella: Consulta}`` de los SELECT que ejecutan las ``formas``"""
+    from services.models import Servicio, SolicitudCliente
+
+    servicio = (
+        SolicitudCliente.objects.order_by('id').values_list('servicio_id', flat=True).first()
+        or Servicio.objects.order_by('id').values_list('pk', flat=True).first()
+    )
+    consultas = {}
+    actual = None
+
+    def registrar(execute, sql, params, many, context):
+        if sql.lstrip().upper().startswith(('SELECT', 'WITH')):
+            consulta = consultas.setdefault(
+                huella(sql), Consulta(sql, tuple(params or ()), context['connection'].alias)
+            )
+            if actual not in consulta.formas:
+                consulta.formas.append(actual)
+        return execute(sql, params, many, context)
+
+    client = Client()
+    with ExitStack() as pila:
+        pila.enter_context(override_settings(ALLOWED_HOSTS=['testserver']))
+        # Todas las conexiones: con réplica, las lecturas van a ella
+        for conexion in connections.all():
+            pila.enter_context(conexion.execute_wrapper(registrar))
+        for ruta, parametros in formas:
+            con_pk = ruta in ('servicio-detail', 'servicio-solicitudes')
+            if servicio is None and (con_pk or '{servicio}' in parametros.values()):
+                continue
+            parametros = {clave: valor.format(servicio=servicio) for clave, valor in parametros.items()}
+            actual = describir(ruta, parametros)
+            client.get(reverse(ruta, kwargs={'pk': servicio} if con_pk else {}), parametros)
+    return consultas
+
+
+def describir(ruta, parametros):
+    if not parametros:
+        return ruta
+    return f'{ruta} ?' + '&'.join(f'{clave}={valor}' for clave, valor in parametros.items())
+
+
+def revisar(consulta):
+    """Llena ``plan``, ``indices`` y ``problemas`` de la consulta"""
+    consulta.plan = plan(connections[consulta.alias], consulta.sql, consulta.params)
+    tablas = tablas_de_la_app()
+    filtra = ' WHERE ' in consulta.sql
+    for linea in consulta.plan:
+        for uso in _USO_SQLITE.findall(linea):
+            consulta.indices.add((uso[0], uso[1]))
+        for indice, tabla, bitmap in _USO_PG.findall(linea):
+            if bitmap:
+                consulta.indices.add((None, bitmap))
+            else:
+                consulta.indices.add((tabla, indice))
+        recorrido = _RECORRIDO_SQLITE.search(linea.strip()) or _RECORRIDO_PG.search(linea)
+        if recorrido and recorrido[1] in tablas and filtra:
+            consulta.problemas.append(f'recorre {recorrido[1]} completa')
+        # Ordenar por una expresión (p. ej. la relevancia de la búsqueda) no
+        # tiene arreglo con un índice
+        if _ORDEN.search(linea) and ' ORDER BY "' in consulta.sql:
+            consulta.problemas.append('ordena sin índice')
+    return consulta
+
+
+def sugerir_indice(sql):
+    """
+    ``models.Index`` para la consulta: las columnas comparadas por igualdad en
+    el WHERE de la tabla principal y después las del ORDER BY. Es una
+    sugerencia para revisar, no un índice listo para copiar.
+    """
+    principal = re.search(r'\bFROM "(\w+)"', sql)
+    if principal is None:
+        return None
+    tabla = principal[1]
+    donde = re.search(r'\bWHERE (.*?)(?: ORDER BY | LIMIT | GROUP BY |$)', sql)
+    orden = re.search(r' ORDER BY (.*?)(?: LIMIT | OFFSET |$)', sql)
+
+    campos = []
+    if donde:
+        for columna in re.findall(rf'"{tabla}"\."(\w+)" (?:= |IN \()', donde[1]):
+            if columna not in campos:
+                campos.append(columna)
+    if orden:
+        for columna, sentido in re.findall(rf'"{tabla}"\."(\w+)"(?: (ASC|DESC))?', orden[1]):
+            if columna not in campos and f'-{columna}' not in campos:
+                campos.append(f'-{columna}' if sentido == 'DESC' else columna)
+    if not campos:
+        return None
+    campos = [campo[:-3] if campo.endswith('_id') else campo for campo in campos]
+    return f'{tabla}: models.Index(fields={campos!r})'
+
+
+def analizar(formas=FORMAS):
+    """
+    Devuelve ``(consultas, sin_uso, sin_uso_estadisticas)``: las consultas
+    revisadas, los índices de las tablas consultadas que ningún plan usa y,
+    en PostgreSQL, los de la app que no se han usado según sus estadísticas.
+    """
+    consultas = [revisar(consulta) for consulta in capturar(formas).values()]
+    usados = set()
+    for consulta in consultas:
+        usados |= {indice for _, indice in consulta.indices}
+    consultadas = {tabla for tabla in tablas_de_la_app() if any(f'"{tabla}"' in c.sql for c in consultas)}
+    sin_uso = {
+        (tabla, indice): columnas
+        for (tabla, indice), columnas in indices_existentes().items()
+        if tabla in consultadas and indice not in usados
+    }
+    return consultas, sin_uso, sin_uso_en_estadisticas()
@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+
+from services.indices import analizar
+
+
+class Command(BaseCommand):
+    help = (
+        'Revisa el plan de las consultas que hacen los ViewSets y reporta índices '
+        'sin uso y consultas sin índice adecuado'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--planes', action='store_true', help='Mostrar el plan de cada consulta')
+
+    def handle(self, *args, **options):
+        consultas, sin_uso, sin_uso_estadisticas = analizar()
+        formas = {forma for consulta in consultas for forma in consulta.formas}
+        self.stdout.write(f'{len(formas)} formas de consulta, {len(consultas)} consultas distintas\n')
+
+        con_problemas = [consulta for consulta in consultas if consulta.problemas]
+        if con_problemas:
+            self.stdout.write(self.style.WARNING(f'Consultas sin índice adecuado ({len(con_problemas)}):'))
+            for consulta in con_problemas:
+                self.stdout.write(f'  {", ".join(consulta.formas)}')
+                self.stdout.write(f'    {"; ".join(dict.fromkeys(consulta.problemas))}')
+                if consulta.sugerencia:
+                    self.stdout.write(f'    sugerencia: {consulta.sugerencia}')
+        else:
+            self.stdout.write(self.style.SUCCESS('✓ Todas las consultas usan un índice adecuado'))
+
+        if sin_uso:
+            self.stdout.write(self.style.WARNING(f'\nÍndices que no usa ninguna de estas consultas ({len(sin_uso)}):'))
+            for (tabla, indice), columnas in sorted(sin_uso.items()):
+                self.stdout.write(f'  {tabla}.{indice} ({", ".join(columnas)})')
+        if sin_uso_estadisticas:
+            self.stdout.write(self.style.WARNING('\nÍndices con idx_scan = 0 en pg_stat_user_indexes:'))
+            for tabla, indice in sorted(sin_uso_estadisticas):
+                self.stdout.write(f'  {tabla}.{indice}')
+
+        if options['planes']:
+            self.stdout.write('\nPlanes:')
+            for consulta in consultas:
+                self.stdout.write(f'\n  {", ".join(consulta.formas)}\n  {consulta.sql}')
+                for linea in consulta.plan:
+                    self.stdout.write(f'    {linea}')
@@ -0,0 +1,49 @@
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.consultas_lentas import leer, resumir
+
+
+class Command(BaseCommand):
+    help = 'Resume el registro de consultas lentas: las peores por ruta y consulta, con su plan'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--archivo', default=settings.CONSULTAS_LENTAS_ARCHIVO,
+            help='Registro a leer, junto con sus respaldos rotados (default: CONSULTAS_LENTAS_ARCHIVO)',
+        )
+        parser.add_argument('--top', type=int, default=10, help='Número de consultas a mostrar (default: 10)')
+        parser.add_argument(
+            '--orden', choices=['total', 'max', 'veces'], default='total',
+            help='Tiempo total, peor tiempo o número de veces (default: total)',
+        )
+        parser.add_argument('--sin-plan', action='store_true', help='No mostrar el EXPLAIN')
+
+    def handle(self, *args, **options):
+        if options['top'] < 1:
+            raise CommandError('--top debe ser mayor que 0')
+        archivo = Path(options['archivo'])
+        resumen = resumir(leer(archivo), options['orden'])
+        if not resumen:
+            self.stdout.write(f'Sin consultas lentas en {archivo}')
+            return
+
+        self.stdout.write(f'{len(resumen)} consultas distintas en {archivo}\n')
+        for posicion, grupo in enumerate(resumen[:options['top']], start=1):
+            peor = grupo['peor']
+            self.stdout.write(self.style.WARNING(
+                f'{posicion}. {grupo["ruta"]} {peor["metodo"]}: {grupo["veces"]} veces, '
+                f'total {grupo["total_ms"]:.1f} ms, promedio {grupo["promedio_ms"]:.1f} ms, '
+                f'peor {grupo["max_ms"]:.1f} ms'
+            ))
+            if grupo['parametros']:
+                parametros = '&'.join(f'{clave}={valor}' for clave, valor in grupo['parametros'].items())
+                self.stdout.write(f'   parámetros: {parametros}')
+            self.stdout.write(f'   {grupo["huella"]}')
+            if peor['plan'] and not options['sin_plan']:
+                self.stdout.write('   plan (peor ejecución):')
+                for linea in peor['plan']:
+                    self.stdout.write(f'     {linea}')
+            self.stdout.write('')
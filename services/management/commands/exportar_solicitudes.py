@@ -0,0 +1,44 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from services import export
+from services.filters import SolicitudClienteFilter
+from services.models import SolicitudCliente
+
+
+class Command(BaseCommand):
+    help = 'Exporta las solicitudes en NDJSON o CSV, en streaming y con memoria constante'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--formato', choices=list(export.FORMATOS), default='ndjson')
+        parser.add_argument('--estatus', help='Filtrar por estatus')
+        parser.add_argument('--servicio', help='Filtrar por id de servicio')
+        parser.add_argument('--desde', help='Fecha inicial (YYYY-MM-DD, inclusive)')
+        parser.add_argument('--hasta', help='Fecha final (YYYY-MM-DD, inclusive)')
+        parser.add_argument(
+            '--salida', help='Archivo de salida (default: salida estándar)',
+        )
+        parser.add_argument(
+            '--lote', type=int, default=export.TAMANO_BLOQUE,
+            help=f'Filas leídas por lote (default: {export.TAMANO_BLOQUE})',
+        )
+
+    def handle(self, *args, **options):
+        filtros = {
+            nombre: options[nombre]
+            for nombre in ('estatus', 'servicio', 'desde', 'hasta')
+            if options[nombre] is not None
+        }
+        filterset = SolicitudClienteFilter(filtros, queryset=SolicitudCliente.objects.all())
+        if not filterset.is_valid():
+            errores = '; '.join(f'{campo}: {" ".join(e)}' for campo, e in filterset.errors.items())
+            raise CommandError(f'Filtros inválidos: {errores}')
+
+        bloques = export.generar(filterset.qs, options['formato'], options['lote'])
+        if options['salida']:
+            with open(options['salida'], 'w', encoding='utf-8', newline='') as archivo:
+                for bloque in bloques:
+                    archivo.write(bloque)
+            self.stderr.write(self.style.SUCCESS(f'✓ Exportación guardada en {options["salida"]}'))
+        else:
+            for bloque in bloques:
+                self.stdout.write(bloque, ending='')
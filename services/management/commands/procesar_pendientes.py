@@ -0,0 +1,61 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from services import cola
+
+
+class Command(BaseCommand):
+    help = 'Inserta en lotes las solicitudes encoladas (SOLICITUDES_EN_COLA)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote', type=int, default=cola.TAMANO_LOTE,
+            help=f'Solicitudes insertadas por lote (default: {cola.TAMANO_LOTE})',
+        )
+        parser.add_argument(
+            '--continuo', action='store_true',
+            help='No terminar al vaciar la cola: esperar nuevas solicitudes',
+        )
+        parser.add_argument(
+            '--intervalo', type=float, default=1.0,
+            help='Segundos de espera con la cola vacía en modo continuo (default: 1)',
+        )
+        parser.add_argument(
+            '--purgar-dias', type=int,
+            help='Eliminar las pendientes procesadas hace más de estos días',
+        )
+        parser.add_argument(
+            '--purgar-cada', type=float, default=60.0,
+            help='Minutos entre purgas en modo continuo (default: 60)',
+        )
+
+    def handle(self, *args, **options):
+        total = 0
+        ultima_purga = time.monotonic()
+        while True:
+            lote = cola.procesar_lote(options['lote'])
+            if lote.tamano:
+                total += lote.tamano
+                self.stdout.write(
+                    f'lote={lote.tamano} insertadas={lote.procesadas} '
+                    f'descartadas={lote.descartadas} retraso={lote.retraso_segundos:.3f}s'
+                )
+            if lote.tamano < options['lote']:
+                if not options['continuo']:
+                    break
+                # En modo continuo el ciclo no termina: se purga cada tanto
+                if time.monotonic() - ultima_purga >= options['purgar_cada'] * 60:
+                    self.purgar(options)
+                    ultima_purga = time.monotonic()
+                time.sleep(options['intervalo'])
+
+        self.purgar(options)
+        self.stdout.write(self.style.SUCCESS(f'✓ Cola vaciada: {total} solicitudes procesadas'))
+
+    def purgar(self, options):
+        if options['purgar_dias'] is not None:
+            antes_de = timezone.now() - datetime.timedelta(days=options['purgar_dias'])
+            self.stdout.write(f'Purgadas: {cola.purgar(antes_de)}')
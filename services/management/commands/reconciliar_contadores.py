@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from services.contadores import reconciliar
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye los contadores de solicitudes por servicio y estatus desde las solicitudes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--servicio', type=int, nargs='+',
+            help='Ids de los servicios a reconciliar (default: todos)',
+        )
+
+    def handle(self, *args, **options):
+        corregidos = reconciliar(options['servicio'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Contadores reconciliados: {corregidos} corregidos'))
@@ -0,0 +1,17 @@
+from django.core.management.base import BaseCommand
+
+from services.search import reindexar_todo
+
+
+class Command(BaseCommand):
+    help = 'Reconstruye el índice de búsqueda de texto completo de los servicios'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--lote', type=int, default=2000,
+            help='Servicios procesados por lote (default: 2000)',
+        )
+
+    def handle(self, *args, **options):
+        total = reindexar_todo(tamano_lote=options['lote'])
+        self.stdout.write(self.style.SUCCESS(f'✓ Índice de búsqueda reconstruido: {total} servicios'))
@@ -0,0 +1,29 @@
+import datetime
+
+from django.core.management.base import BaseCommand, CommandError
+
+from services.analitica import resumir
+
+
+def _fecha(valor):
+    try:
+        return datetime.date.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f'Fecha inválida: {valor} (use YYYY-MM-DD)')
+
+
+class Command(BaseCommand):
+    help = 'Resume por día, categoría y estatus las solicitudes de los días aún no resumidos'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--desde',
+            help='Volver a resumir desde este día (YYYY-MM-DD) aunque ya esté resumido',
+        )
+        parser.add_argument('--hasta', help='Último día a resumir (YYYY-MM-DD, default: ayer)')
+
+    def handle(self, *args, **options):
+        desde = _fecha(options['desde']) if options['desde'] else None
+        hasta = _fecha(options['hasta']) if options['hasta'] else None
+        dias, filas = resumir(desde, hasta)
+        self.stdout.write(self.style.SUCCESS(f'✓ Resumen actualizado: {dias} días, {filas} filas'))
@@ -1,193 +1,97 @@
-from django.core.management.base import BaseCommand
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
 from django.utils import timezone
-from datetime import timedelta
-import random
-from services.models import Servicio, SolicitudCliente
 
+from services.sinteticos import TAMANO_LOTE, GeneradorSintetico, puede_copiar
 
-class Command(BaseCommand):
-    help = 'Crea 10 servicios variados y 20 solicitudes de prueba'
 
-    def handle(self, *args, **options):
-        self.stdout.write(self.style.SUCCESS('Iniciando seed de datos...'))
+def _fecha(valor):
+    try:
+        return datetime.date.fromisoformat(valor)
+    except ValueError:
+        raise CommandError(f'Fecha inválida: {valor} (use YYYY-MM-DD)')
 
-        # Limpiar datos existentes (opcional, comentar si no se desea)
-        # Servicio.objects.all().delete()
-        # SolicitudCliente.objects.all().delete()
 
-        # Crear 10 servicios variados
-        servicios_data = [
-            {
-                'nombre': 'Desarrollo Web Full Stack',
-                'categoria': 'Web',
-                'descripcion': 'Desarrollo completo de aplicaciones web modernas con React y Django',
-                'precio_mxn': 75000.00,
-                'nivel_prioridad': 5,
-                'responsable_email': 'web@empresa.com',
-                'tiempo_estimado_dias': 60,
-            },
-            {
-                'nombre': 'App Móvil iOS y Android',
-                'categoria': 'Móvil',
-                'descripcion': 'Desarrollo de aplicaciones móviles nativas para iOS y Android',
-                'precio_mxn': 120000.00,
-                'nivel_prioridad': 5,
-                'responsable_email': 'mobile@empresa.com',
-                'tiempo_estimado_dias': 90,
-            },
-            {
-                'nombre': 'Migración a AWS',
-                'categoria': 'Cloud',
-                'descripcion': 'Migración completa de infraestructura a Amazon Web Services',
-                'precio_mxn': 95000.00,
-                'nivel_prioridad': 4,
-                'responsable_email': 'cloud@empresa.com',
-                'tiempo_estimado_dias': 45,
-            },
-            {
-                'nombre': 'Análisis de Big Data',
-                'categoria': 'Data',
-                'descripcion': 'Análisis y procesamiento de grandes volúmenes de datos con Python y Spark',
-                'precio_mxn': 85000.00,
-                'nivel_prioridad': 4,
-                'responsable_email': 'data@empresa.com',
-                'tiempo_estimado_dias': 50,
-            },
-            {
-                'nombre': 'Auditoría de Seguridad',
-                'categoria': 'Seguridad',
-                'descripcion': 'Auditoría completa de seguridad informática y recomendaciones',
-                'precio_mxn': 65000.00,
-                'nivel_prioridad': 5,
-                'responsable_email': 'security@empresa.com',
-                'tiempo_estimado_dias': 30,
-            },
-            {
-                'nombre': 'Consultoría Estratégica IT',
-                'categoria': 'Consultoría',
-                'descripcion': 'Consultoría estratégica para transformación digital',
-                'precio_mxn': 55000.00,
-                'nivel_prioridad': 3,
-                'responsable_email': 'consultoria@empresa.com',
-                'tiempo_estimado_dias': 20,
-            },
-            {
-                'nombre': 'E-commerce Platform',
-                'categoria': 'Web',
-                'descripcion': 'Plataforma completa de comercio electrónico con pasarela de pagos',
-                'precio_mxn': 110000.00,
-                'nivel_prioridad': 4,
-                'responsable_email': 'ecommerce@empresa.com',
-                'tiempo_estimado_dias': 75,
-            },
-            {
-                'nombre': 'App React Native',
-                'categoria': 'Móvil',
-                'descripcion': 'Aplicación móvil multiplataforma desarrollada con React Native',
-                'precio_mxn': 70000.00,
-                'nivel_prioridad': 3,
-                'responsable_email': 'react@empresa.com',
-                'tiempo_estimado_dias': 55,
-            },
-            {
-                'nombre': 'Data Warehouse en Azure',
-                'categoria': 'Cloud',
-                'descripcion': 'Implementación de almacén de datos en Microsoft Azure',
-                'precio_mxn': 90000.00,
-                'nivel_prioridad': 4,
-                'responsable_email': 'azure@empresa.com',
-                'tiempo_estimado_dias': 40,
-            },
-            {
-                'nombre': 'Penetration Testing',
-                'categoria': 'Seguridad',
-                'descripcion': 'Pruebas de penetración y análisis de vulnerabilidades',
-                'precio_mxn': 50000.00,
-                'nivel_prioridad': 3,
-                'responsable_email': 'pentest@empresa.com',
-                'tiempo_estimado_dias': 25,
-            },
-        ]
+class Command(BaseCommand):
+    help = (
+        'Crea servicios y solicitudes de prueba (por defecto 10 servicios y 20 solicitudes). '
+        'Con --servicios y --solicitudes genera tablas del tamaño de producción.'
+    )
 
-        servicios_creados = []
-        for data in servicios_data:
-            servicio = Servicio.objects.create(**data)
-            servicios_creados.append(servicio)
-            self.stdout.write(
-                self.style.SUCCESS(f'✓ Servicio creado: {servicio.nombre}')
-            )
+    def add_arguments(self, parser):
+        parser.add_argument('--servicios', type=int, default=10, help='Servicios a crear (default: 10)')
+        parser.add_argument('--solicitudes', type=int, default=20, help='Solicitudes a crear (default: 20)')
+        parser.add_argument(
+            '--semilla', type=int,
+            help='Semilla del generador; con la misma semilla y --hasta los datos son idénticos',
+        )
+        parser.add_argument('--hasta', help='Último día con datos (YYYY-MM-DD, default: hoy)')
+        parser.add_argument(
+            '--dias', type=int, default=365,
+            help='Días hacia atrás en que se publican los servicios (default: 365)',
+        )
+        parser.add_argument(
+            '--lote', type=int, default=TAMANO_LOTE,
+            help=f'Filas por lote y transacción (default: {TAMANO_LOTE})',
+        )
+        parser.add_argument(
+            '--sin-copy', action='store_true',
+            help='Usar bulk_create también en PostgreSQL en lugar de COPY',
+        )
 
-        # Crear 20 solicitudes distribuidas entre los servicios
-        nombres_clientes = [
-            'Juan Pérez', 'María González', 'Carlos Rodríguez', 'Ana Martínez',
-            'Luis Hernández', 'Laura Sánchez', 'Roberto López', 'Patricia García',
-            'Fernando Ramírez', 'Sofía Torres', 'Miguel Díaz', 'Carmen Flores',
-            'Jorge Morales', 'Isabel Ruiz', 'Ricardo Vargas', 'Elena Castro',
-            'Daniel Jiménez', 'Adriana Mendoza', 'Alejandro Ortega', 'Lucía Ríos',
-        ]
+    def handle(self, *args, **options):
+        for opcion, minimo in (('servicios', 0), ('solicitudes', 0), ('dias', 1), ('lote', 1)):
+            if options[opcion] < minimo:
+                raise CommandError(f'--{opcion} debe ser al menos {minimo}')
+        if options['solicitudes'] and not options['servicios']:
+            raise CommandError('Las solicitudes necesitan al menos un servicio (--servicios)')
 
-        emails_clientes = [
-            'juan.perez@email.com', 'maria.gonzalez@email.com', 'carlos.rodriguez@email.com',
-            'ana.martinez@email.com', 'luis.hernandez@email.com', 'laura.sanchez@email.com',
-            'roberto.lopez@email.com', 'patricia.garcia@email.com', 'fernando.ramirez@email.com',
-            'sofia.torres@email.com', 'miguel.diaz@email.com', 'carmen.flores@email.com',
-            'jorge.morales@email.com', 'isabel.ruiz@email.com', 'ricardo.vargas@email.com',
-            'elena.castro@email.com', 'daniel.jimenez@email.com', 'adriana.mendoza@email.com',
-            'alejandro.ortega@email.com', 'lucia.rios@email.com',
-        ]
+        hasta = _fecha(options['hasta']) if options['hasta'] else None
+        if hasta and hasta > timezone.localdate():
+            raise CommandError('--hasta no puede ser una fecha futura')
 
-        mensajes = [
-            'Me interesa contratar este servicio para mi empresa',
-            'Necesito más información sobre los detalles y el proceso',
-            '¿Cuál es el tiempo de entrega estimado?',
-            'Quiero agendar una reunión para discutir el proyecto',
-            'Estoy interesado en conocer los precios y paquetes disponibles',
-            'Necesito una solución urgente para mi negocio',
-            'Me gustaría recibir una propuesta personalizada',
-            '¿Ofrecen soporte post-implementación?',
-            'Tengo un proyecto grande y necesito cotización',
-            'Busco una solución escalable y moderna',
-            'Necesito integrar esto con mis sistemas existentes',
-            '¿Pueden trabajar con mi equipo interno?',
-            'Quiero saber más sobre la metodología de trabajo',
-            'Necesito una demo o prueba del servicio',
-            'Estoy evaluando varias opciones, ¿qué me recomiendan?',
-            'Tengo un presupuesto limitado, ¿hay opciones flexibles?',
-            'Necesito implementación rápida, ¿es posible?',
-            'Quiero conocer casos de éxito similares',
-            '¿Ofrecen capacitación para mi equipo?',
-            'Necesito una solución personalizada para mi industria',
-        ]
+        self.verbosity = options['verbosity']
+        self.inicio_tabla = time.perf_counter()
+        self.ultimo_reporte = 0
+        generador = GeneradorSintetico(
+            semilla=options['semilla'],
+            hasta=hasta,
+            dias=options['dias'],
+            tamano_lote=options['lote'],
+            usar_copy=False if options['sin_copy'] else puede_copiar(),
+            al_avanzar=self.reportar,
+        )
+        self.stdout.write(self.style.SUCCESS(
+            f'Iniciando seed de datos (semilla {generador.semilla}, '
+            f'{"COPY" if generador.usar_copy else "bulk_create"}, lotes de {options["lote"]:,})...'
+        ))
 
-        estatus_opciones = ['nuevo', 'en_proceso', 'cerrado']
+        inicio = time.perf_counter()
+        servicios = generador.servicios(options['servicios'])
+        self.inicio_tabla = time.perf_counter()
+        solicitudes = generador.solicitudes(servicios, options['solicitudes'])
+        segundos = time.perf_counter() - inicio
 
-        for i in range(20):
-            servicio = random.choice(servicios_creados)
-            estatus = random.choice(estatus_opciones)
-            
-            # Crear fecha de creación variada (últimos 30 días)
-            fecha_creacion = timezone.now() - timedelta(days=random.randint(0, 30))
-            
-            solicitud = SolicitudCliente.objects.create(
-                servicio=servicio,
-                cliente_nombre=nombres_clientes[i],
-                cliente_email=emails_clientes[i],
-                mensaje=mensajes[i],
-                estatus=estatus,
-            )
-            # Actualizar fecha_creacion manualmente
-            SolicitudCliente.objects.filter(id=solicitud.id).update(fecha_creacion=fecha_creacion)
-            
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✓ Seed completado: {len(servicios):,} servicios y {solicitudes:,} solicitudes creadas '
+            f'en {segundos:.1f} s'
+        ))
+        if solicitudes:
             self.stdout.write(
-                self.style.SUCCESS(
-                    f'✓ Solicitud creada: {solicitud.cliente_nombre} - {servicio.nombre}'
-                )
+                'Si ya había resúmenes diarios, actualízalos con '
+                '`python manage.py resumir_solicitudes --desde <fecha>`'
             )
 
+    def reportar(self, tabla, insertadas, total):
+        """Avance y filas por segundo, como mucho una vez por segundo por tabla"""
+        ahora = time.perf_counter()
+        if self.verbosity < 1 or (insertadas < total and ahora - self.ultimo_reporte < 1):
+            return
+        self.ultimo_reporte = ahora
+        segundos = max(ahora - self.inicio_tabla, 1e-9)
         self.stdout.write(
-            self.style.SUCCESS(
-                f'\n✓ Seed completado: {len(servicios_creados)} servicios y 20 solicitudes creadas'
-            )
+            f'  {tabla}: {insertadas:,}/{total:,} ({insertadas / total:.0%}) '
+            f'{insertadas / segundos:,.0f} filas/s'
         )
-
-
@@ -0,0 +1,62 @@
+"""
+Operaciones de migración propias.
+
+``AgregarIndiceConcurrente`` y ``QuitarIndiceConcurrente`` son ``AddIndex`` y
+``RemoveIndex`` que en PostgreSQL usan ``CREATE/DROP INDEX CONCURRENTLY``,
+que no bloquean las escrituras de la tabla mientras se construye el índice.
+En las demás bases se comportan como las originales. Como ``CONCURRENTLY`` no
+puede correr dentro de una transacción, la migración que las use debe
+declarar ``atomic = False``; si una falla en PostgreSQL puede quedar un
+índice ``INVALID`` que hay que borrar antes de reintentar.
+"""
+from django.db import NotSupportedError, migrations
+
+
+def _concurrente(schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return False
+    if schema_editor.connection.in_atomic_block:
+        raise NotSupportedError('Los índices concurrentes requieren una migración con atomic = False')
+    return True
+
+
+class AgregarIndiceConcurrente(migrations.AddIndex):
+    """``AddIndex`` con ``CREATE INDEX CONCURRENTLY`` en PostgreSQL"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if _concurrente(schema_editor):
+                schema_editor.add_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.add_index(model, self.index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            if _concurrente(schema_editor):
+                schema_editor.remove_index(model, self.index, concurrently=True)
+            else:
+                schema_editor.remove_index(model, self.index)
+
+
+class QuitarIndiceConcurrente(migrations.RemoveIndex):
+    """``RemoveIndex`` con ``DROP INDEX CONCURRENTLY`` en PostgreSQL"""
+
+    def database_forwards(self, app_label, schema_editor, from_state, to_state):
+        model = from_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = from_state.models[app_label, self.model_name_lower].get_index_by_name(self.name)
+            if _concurrente(schema_editor):
+                schema_editor.remove_index(model, index, concurrently=True)
+            else:
+                schema_editor.remove_index(model, index)
+
+    def database_backwards(self, app_label, schema_editor, from_state, to_state):
+        model = to_state.apps.get_model(app_label, self.model_name)
+        if self.allow_migrate_model(schema_editor.connection.alias, model):
+            index = to_state.models[app_label, self.model_name_lower].get_index_by_name(self.name)
+            if _concurrente(schema_editor):
+                schema_editor.add_index(model, index, concurrently=True)
+            else:
+                schema_editor.add_index(model, index)
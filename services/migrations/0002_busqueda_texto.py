@@ -0,0 +1,64 @@
+# Generated manually
+
+from django.db import migrations
+
+
+def crear_indice_busqueda(apps, schema_editor):
+    from services.search import TABLA_FTS, VECTOR_PG, texto_indexable
+
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS unaccent')
+        schema_editor.execute("""
+            DO $$
+            BEGIN
+                IF NOT EXISTS (SELECT 1 FROM pg_ts_config WHERE cfgname = 'spanish_unaccent') THEN
+                    CREATE TEXT SEARCH CONFIGURATION spanish_unaccent (COPY = spanish);
+                    ALTER TEXT SEARCH CONFIGURATION spanish_unaccent
+                        ALTER MAPPING FOR hword, hword_part, word WITH unaccent, spanish_stem;
+                END IF;
+            END
+            $$;
+        """)
+        schema_editor.execute('ALTER TABLE services_servicio ADD COLUMN search_vector tsvector')
+        schema_editor.execute(
+            'CREATE INDEX services_servicio_search_idx ON services_servicio USING gin (search_vector)'
+        )
+        schema_editor.execute(f'UPDATE services_servicio SET search_vector = {VECTOR_PG}')
+
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(
+            f"CREATE VIRTUAL TABLE {TABLA_FTS} USING fts5("
+            f"nombre, descripcion, tokenize='unicode61 remove_diacritics 2')"
+        )
+        Servicio = apps.get_model('services', 'Servicio')
+        filas = [
+            (s.id, texto_indexable(s.nombre), texto_indexable(s.descripcion))
+            for s in Servicio.objects.only('id', 'nombre', 'descripcion')
+        ]
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f'INSERT INTO {TABLA_FTS} (rowid, nombre, descripcion) VALUES (%s, %s, %s)', filas
+            )
+
+
+def eliminar_indice_busqueda(apps, schema_editor):
+    from services.search import TABLA_FTS
+
+    connection = schema_editor.connection
+    if connection.vendor == 'postgresql':
+        schema_editor.execute('DROP INDEX IF EXISTS services_servicio_search_idx')
+        schema_editor.execute('ALTER TABLE services_servicio DROP COLUMN IF EXISTS search_vector')
+    elif connection.vendor == 'sqlite':
+        schema_editor.execute(f'DROP TABLE IF EXISTS {TABLA_FTS}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(crear_indice_busqueda, eliminar_indice_busqueda),
+    ]
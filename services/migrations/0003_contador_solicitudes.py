@@ -0,0 +1,47 @@
+# Generated manually
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def poblar_contadores(apps, schema_editor):
+    Servicio = apps.get_model('services', 'Servicio')
+    SolicitudCliente = apps.get_model('services', 'SolicitudCliente')
+    ContadorSolicitudes = apps.get_model('services', 'ContadorSolicitudes')
+
+    contadores = {
+        servicio_id: ContadorSolicitudes(servicio_id=servicio_id)
+        for servicio_id in Servicio.objects.values_list('id', flat=True)
+    }
+    filas = SolicitudCliente.objects.values('servicio_id', 'estatus').annotate(total=Count('id'))
+    for fila in filas.order_by():
+        setattr(contadores[fila['servicio_id']], fila['estatus'], fila['total'])
+    ContadorSolicitudes.objects.bulk_create(contadores.values(), batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0002_busqueda_texto'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ContadorSolicitudes',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('servicio', models.OneToOneField(help_text='Servicio al que pertenecen los contadores', on_delete=django.db.models.deletion.CASCADE, related_name='contador', to='services.servicio')),
+                ('nuevo', models.IntegerField(default=0, help_text='Solicitudes con estatus nuevo')),
+                ('en_proceso', models.IntegerField(default=0, help_text='Solicitudes con estatus en proceso')),
+                ('cerrado', models.IntegerField(default=0, help_text='Solicitudes con estatus cerrado')),
+                ('actualizado', models.DateTimeField(auto_now=True, help_text='Fecha y hora del último cambio en los contadores')),
+            ],
+            options={
+                'verbose_name': 'Contador de Solicitudes',
+                'verbose_name_plural': 'Contadores de Solicitudes',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.RunPython(poblar_contadores, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,44 @@
+# Generated manually
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0003_contador_solicitudes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MarcaResumen',
+            fields=[
+                ('nombre', models.CharField(help_text='Nombre del resumen', max_length=50, primary_key=True, serialize=False)),
+                ('procesado_hasta', models.DateField(blank=True, help_text='Último día incluido en el resumen', null=True)),
+                ('actualizado', models.DateTimeField(auto_now=True, help_text='Fecha y hora de la última ejecución')),
+            ],
+            options={
+                'verbose_name': 'Marca de Resumen',
+                'verbose_name_plural': 'Marcas de Resumen',
+            },
+        ),
+        migrations.CreateModel(
+            name='ResumenDiarioSolicitudes',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('fecha', models.DateField(help_text='Día de creación de las solicitudes (zona horaria local)')),
+                ('categoria', models.CharField(choices=[('Web', 'Web'), ('Móvil', 'Móvil'), ('Cloud', 'Cloud'), ('Data', 'Data'), ('Seguridad', 'Seguridad'), ('Consultoría', 'Consultoría')], help_text='Categoría del servicio', max_length=50)),
+                ('estatus', models.CharField(choices=[('nuevo', 'Nuevo'), ('en_proceso', 'En Proceso'), ('cerrado', 'Cerrado')], help_text='Estatus de las solicitudes al resumir el día', max_length=20)),
+                ('total', models.IntegerField(default=0, help_text='Número de solicitudes')),
+            ],
+            options={
+                'verbose_name': 'Resumen Diario de Solicitudes',
+                'verbose_name_plural': 'Resúmenes Diarios de Solicitudes',
+                'ordering': ['fecha', 'categoria', 'estatus'],
+            },
+        ),
+        migrations.AddConstraint(
+            model_name='resumendiariosolicitudes',
+            constraint=models.UniqueConstraint(fields=('fecha', 'categoria', 'estatus'), name='resumen_diario_unico'),
+        ),
+    ]
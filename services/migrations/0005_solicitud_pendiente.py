@@ -0,0 +1,44 @@
+# Generated manually
+
+import django.db.models.deletion
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('services', '0004_resumen_diario_solicitudes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SolicitudPendiente',
+            fields=[
+                ('id', models.AutoField(primary_key=True, serialize=False)),
+                ('seguimiento', models.UUIDField(default=uuid.uuid4, editable=False, help_text='Id de seguimiento que se devuelve al cliente', unique=True)),
+                ('datos', models.JSONField(help_text='Datos validados de la solicitud')),
+                ('recibida', models.DateTimeField(auto_now_add=True, help_text='Fecha y hora de recepción')),
+                ('procesada', models.DateTimeField(blank=True, help_text='Fecha y hora en que se insertó (o se descartó)', null=True)),
+                ('error', models.TextField(blank=True, default='', help_text='Motivo si no se pudo insertar')),
+            ],
+            options={
+                'verbose_name': 'Solicitud Pendiente',
+                'verbose_name_plural': 'Solicitudes Pendientes',
+                'ordering': ['id'],
+            },
+        ),
+        migrations.AddField(
+            model_name='solicitudpendiente',
+            name='solicitud',
+            field=models.ForeignKey(blank=True, help_text='Solicitud creada al procesarla', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='services.solicitudcliente'),
+        ),
+        migrations.AddIndex(
+            model_name='solicitudpendiente',
+            index=models.Index(condition=models.Q(('procesada__isnull', True)), fields=['id'], name='pendiente_en_cola_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='solicitudpendiente',
+            index=models.Index(fields=['procesada'], name='pendiente_procesada_idx'),
+        ),
+    ]
@@ -0,0 +1,52 @@
+# Generated manually
+
+from django.db import migrations, models
+
+from services.migraciones import AgregarIndiceConcurrente, QuitarIndiceConcurrente
+
+
+class Migration(migrations.Migration):
+    # CREATE/DROP INDEX CONCURRENTLY no puede correr en una transacción
+    atomic = False
+
+    dependencies = [
+        ('services', '0005_solicitud_pendiente'),
+    ]
+
+    # Primero se crean los índices nuevos y después se quitan los que
+    # reemplazan, para no dejar las consultas sin índice en medio
+    operations = [
+        AgregarIndiceConcurrente(
+            model_name='servicio',
+            index=models.Index(fields=['-fecha_publicacion', 'nombre', 'id'], name='servicio_orden_idx'),
+        ),
+        AgregarIndiceConcurrente(
+            model_name='servicio',
+            index=models.Index(
+                fields=['categoria', '-fecha_publicacion', 'nombre', 'id'], name='servicio_categoria_orden_idx'
+            ),
+        ),
+        AgregarIndiceConcurrente(
+            model_name='servicio',
+            index=models.Index(
+                condition=models.Q(('activo', True)),
+                fields=['-fecha_publicacion', 'nombre', 'id'],
+                name='servicio_activos_orden_idx',
+            ),
+        ),
+        AgregarIndiceConcurrente(
+            model_name='solicitudcliente',
+            index=models.Index(fields=['-fecha_creacion', 'id'], name='solicitud_orden_idx'),
+        ),
+        AgregarIndiceConcurrente(
+            model_name='solicitudcliente',
+            index=models.Index(fields=['servicio', '-fecha_creacion', 'id'], name='solicitud_servicio_orden_idx'),
+        ),
+        AgregarIndiceConcurrente(
+            model_name='solicitudcliente',
+            index=models.Index(fields=['estatus', '-fecha_creacion', 'id'], name='solicitud_estatus_orden_idx'),
+        ),
+        QuitarIndiceConcurrente(model_name='servicio', name='services_se_categor_idx'),
+        QuitarIndiceConcurrente(model_name='servicio', name='services_se_fecha_p_idx'),
+        QuitarIndiceConcurrente(model_name='solicitudcliente', name='services_so_fecha_c_idx'),
+    ]
@@ -1,6 +1,37 @@
-from django.db import models
+import uuid
+
+from django.db import models, router, transaction
 from django.core.validators import MinValueValidator, MaxValueValidator, EmailValidator
 from django.core.exceptions import ValidationError
+from django.utils import timezone
+
+
+class ServicioQuerySet(models.QuerySet):
+    """Consultas y cambios por conjunto de servicios"""
+
+    def activos(self):
+        return self.filter(activo=True)
+
+    def desactivar(self):
+        """Desactiva los servicios del queryset con un solo UPDATE; devuelve cuántos cambiaron"""
+        return self._cambiar_activo(False)
+
+    def reactivar(self):
+        """Reactiva los servicios del queryset con un solo UPDATE; devuelve cuántos cambiaron"""
+        return self._cambiar_activo(True)
+
+    def _cambiar_activo(self, activo):
+        # update() no llama a save(): auto_now se fija aquí. Los que ya tienen
+        # ese estado no se tocan, para no cambiar su ultima_actualizacion (ni
+        # su ETag) sin motivo
+        return self.exclude(activo=activo).update(activo=activo, ultima_actualizacion=timezone.now())
+
+
+class ServiciosActivosManager(models.Manager.from_queryset(ServicioQuerySet)):
+    """Solo los servicios activos: el catálogo público"""
+
+    def get_queryset(self):
+        return super().get_queryset().activos()
 
 
 class Servicio(models.Model):
@@ -57,14 +88,31 @@ class Servicio(models.Model):
         help_text="Tiempo estimado de entrega en días"
     )
 
+    # ``objects`` es el manager por defecto e incluye los inactivos (admin,
+    # relaciones, escrituras y las acciones masivas de la API); ``activos``
+    # es el catálogo público, lo que leen el listado, el detalle y las
+    # estadísticas de la API
+    objects = ServicioQuerySet.as_manager()
+    activos = ServiciosActivosManager()
+
     class Meta:
         verbose_name = "Servicio"
         verbose_name_plural = "Servicios"
         ordering = ['-fecha_publicacion', 'nombre']
+        # Alineados con las consultas del catálogo (ver services/indices.py):
+        # la ordenación por defecto, con id como desempate de la paginación,
+        # sola, por categoría y solo de los activos
         indexes = [
-            models.Index(fields=['categoria', 'activo']),
-            models.Index(fields=['precio_mxn']),
-            models.Index(fields=['fecha_publicacion']),
+            models.Index(fields=['-fecha_publicacion', 'nombre', 'id'], name='servicio_orden_idx'),
+            models.Index(
+                fields=['categoria', '-fecha_publicacion', 'nombre', 'id'], name='servicio_categoria_orden_idx'
+            ),
+            models.Index(
+                fields=['-fecha_publicacion', 'nombre', 'id'],
+                condition=models.Q(activo=True),
+                name='servicio_activos_orden_idx',
+            ),
+            models.Index(fields=['precio_mxn'], name='services_se_precio__idx'),
         ]
 
     def __str__(self):
@@ -121,9 +169,13 @@ class SolicitudCliente(models.Model):
         verbose_name = "Solicitud de Cliente"
         verbose_name_plural = "Solicitudes de Clientes"
         ordering = ['-fecha_creacion']
+        # Los listados se ordenan por -fecha_creacion, id (ver
+        # services/indices.py); (servicio, estatus) es para los contadores
         indexes = [
-            models.Index(fields=['servicio', 'estatus']),
-            models.Index(fields=['fecha_creacion']),
+            models.Index(fields=['-fecha_creacion', 'id'], name='solicitud_orden_idx'),
+            models.Index(fields=['servicio', '-fecha_creacion', 'id'], name='solicitud_servicio_orden_idx'),
+            models.Index(fields=['estatus', '-fecha_creacion', 'id'], name='solicitud_estatus_orden_idx'),
+            models.Index(fields=['servicio', 'estatus'], name='services_so_servici_idx'),
         ]
 
     def __str__(self):
@@ -134,4 +186,141 @@ class SolicitudCliente(models.Model):
         if not self.mensaje or not self.mensaje.strip():
             raise ValidationError({'mensaje': 'El mensaje no puede estar vacío'})
 
+    def save(self, *args, **kwargs):
+        # Los contadores por estatus se ajustan en pre_save/post_save (ver
+        # services/signals.py); la transacción mantiene bloqueada la fila
+        # desde que se lee el estatus anterior hasta que se escribe el nuevo.
+        with transaction.atomic(using=kwargs.get('using') or router.db_for_write(type(self), instance=self)):
+            super().save(*args, **kwargs)
+
+
+class ContadorSolicitudes(models.Model):
+    """
+    Número de solicitudes de un servicio por estatus.
 
+    Se mantiene de forma incremental (``UPDATE ... SET nuevo = nuevo + 1``)
+    al crear, cambiar de estatus o eliminar solicitudes; ver
+    ``services/contadores.py``. ``reconciliar_contadores`` lo reconstruye
+    desde las solicitudes.
+    """
+    id = models.AutoField(primary_key=True)
+    servicio = models.OneToOneField(
+        Servicio,
+        on_delete=models.CASCADE,
+        related_name='contador',
+        help_text="Servicio al que pertenecen los contadores"
+    )
+    nuevo = models.IntegerField(default=0, help_text="Solicitudes con estatus nuevo")
+    en_proceso = models.IntegerField(default=0, help_text="Solicitudes con estatus en proceso")
+    cerrado = models.IntegerField(default=0, help_text="Solicitudes con estatus cerrado")
+    actualizado = models.DateTimeField(
+        auto_now=True,
+        help_text="Fecha y hora del último cambio en los contadores"
+    )
+
+    class Meta:
+        verbose_name = "Contador de Solicitudes"
+        verbose_name_plural = "Contadores de Solicitudes"
+        ordering = ['id']
+
+    def __str__(self):
+        return f"Solicitudes de servicio {self.servicio_id}: {self.nuevo}/{self.en_proceso}/{self.cerrado}"
+
+
+class ResumenDiarioSolicitudes(models.Model):
+    """
+    Número de solicitudes creadas en un día, por categoría del servicio y
+    estatus. Lo llena ``python manage.py resumir_solicitudes`` solo con días
+    ya terminados (ver ``services/analitica.py``).
+    """
+    id = models.AutoField(primary_key=True)
+    fecha = models.DateField(help_text="Día de creación de las solicitudes (zona horaria local)")
+    categoria = models.CharField(
+        max_length=50,
+        choices=Servicio.CATEGORIA_CHOICES,
+        help_text="Categoría del servicio"
+    )
+    estatus = models.CharField(
+        max_length=20,
+        choices=SolicitudCliente.ESTATUS_CHOICES,
+        help_text="Estatus de las solicitudes al resumir el día"
+    )
+    total = models.IntegerField(default=0, help_text="Número de solicitudes")
+
+    class Meta:
+        verbose_name = "Resumen Diario de Solicitudes"
+        verbose_name_plural = "Resúmenes Diarios de Solicitudes"
+        ordering = ['fecha', 'categoria', 'estatus']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['fecha', 'categoria', 'estatus'], name='resumen_diario_unico'
+            ),
+        ]
+
+    def __str__(self):
+        return f"{self.fecha} {self.categoria} {self.estatus}: {self.total}"
+
+
+class MarcaResumen(models.Model):
+    """
+    Último día ya resumido (high-water mark) de un resumen incremental.
+    """
+    nombre = models.CharField(max_length=50, primary_key=True, help_text="Nombre del resumen")
+    procesado_hasta = models.DateField(
+        null=True,
+        blank=True,
+        help_text="Último día incluido en el resumen"
+    )
+    actualizado = models.DateTimeField(auto_now=True, help_text="Fecha y hora de la última ejecución")
+
+    class Meta:
+        verbose_name = "Marca de Resumen"
+        verbose_name_plural = "Marcas de Resumen"
+
+    def __str__(self):
+        return f"{self.nombre}: {self.procesado_hasta}"
+
+
+class SolicitudPendiente(models.Model):
+    """
+    Solicitud ya validada que espera en la cola de escritura diferida para
+    insertarse en ``SolicitudCliente`` (ver ``services/cola.py``).
+    """
+    id = models.AutoField(primary_key=True)
+    seguimiento = models.UUIDField(
+        default=uuid.uuid4,
+        unique=True,
+        editable=False,
+        help_text="Id de seguimiento que se devuelve al cliente"
+    )
+    datos = models.JSONField(help_text="Datos validados de la solicitud")
+    recibida = models.DateTimeField(auto_now_add=True, help_text="Fecha y hora de recepción")
+    procesada = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="Fecha y hora en que se insertó (o se descartó)"
+    )
+    solicitud = models.ForeignKey(
+        SolicitudCliente,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+',
+        help_text="Solicitud creada al procesarla"
+    )
+    error = models.TextField(blank=True, default='', help_text="Motivo si no se pudo insertar")
+
+    class Meta:
+        verbose_name = "Solicitud Pendiente"
+        verbose_name_plural = "Solicitudes Pendientes"
+        ordering = ['id']
+        indexes = [
+            # Solo las que siguen en cola: el índice no crece con las procesadas
+            models.Index(
+                fields=['id'], condition=models.Q(procesada__isnull=True), name='pendiente_en_cola_idx'
+            ),
+            models.Index(fields=['procesada'], name='pendiente_procesada_idx'),
+        ]
+
+    def __str__(self):
+        return f"Solicitud pendiente {self.seguimiento}"
@@ -0,0 +1,218 @@
+"""
+Búsqueda de texto completo para Servicio.
+
+En PostgreSQL se usa una columna ``search_vector`` (tsvector) con índice GIN,
+calculada con la configuración ``spanish_unaccent`` (stemming en español y sin
+acentos); las palabras de la búsqueda se le pasan solo normalizadas, para que
+PostgreSQL las reduzca a raíces una sola vez. En SQLite se usa una tabla FTS5
+espejo, ``services_servicio_fts``, cuyo texto se normaliza y se reduce a raíces
+en Python. En ambos casos el índice se mantiene al guardar un Servicio (ver
+``services.signals``) y los resultados se ordenan por relevancia.
+
+Ni ``search_vector`` ni la tabla FTS5 están en el modelo: se referencian con
+expresiones que toman el alias de la tabla de la consulta, así que el
+queryset filtrado sirve también como subconsulta (``pk__in``, ``values()``).
+"""
+import re
+import unicodedata
+
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVectorExact
+from django.db import connection
+from django.db.models import Expression, F, FloatField, Q
+from django.db.models.expressions import RawSQL
+
+CAMPOS_INDEXADOS = {'nombre', 'descripcion'}
+
+TABLA_FTS = 'services_servicio_fts'
+
+CONFIGURACION_PG = 'spanish_unaccent'
+
+VECTOR_PG = (
+    "setweight(to_tsvector('spanish_unaccent', coalesce(nombre, '')), 'A') || "
+    "setweight(to_tsvector('spanish_unaccent', coalesce(descripcion, '')), 'B')"
+)
+
+TAMANO_LOTE = 500
+
+_PALABRA = re.compile(r'\w+')
+
+
+def normalizar(texto):
+    """Minúsculas y sin acentos: 'Móvil' -> 'movil'"""
+    descompuesto = unicodedata.normalize('NFKD', texto or '')
+    return ''.join(c for c in descompuesto if not unicodedata.combining(c)).lower()
+
+
+def raiz(palabra):
+    """
+    Stemmer ligero para español: quita plurales y la vocal final de género,
+    p. ej. 'aplicaciones' -> 'aplicacion', 'moviles' -> 'movil',
+    'desarrollos' -> 'desarroll'.
+    """
+    if len(palabra) > 5 and palabra.endswith('ces'):
+        palabra = palabra[:-3] + 'z'
+    elif len(palabra) > 5 and palabra.endswith('es') and palabra[-3] not in 'aeiou':
+        palabra = palabra[:-2]
+    elif len(palabra) > 3 and palabra.endswith('s'):
+        palabra = palabra[:-1]
+
+    if len(palabra) > 4 and palabra[-1] in 'aeo':
+        palabra = palabra[:-1]
+    return palabra
+
+
+def palabras(texto):
+    """Palabras de ``texto`` normalizadas, en orden"""
+    return _PALABRA.findall(normalizar(texto))
+
+
+def terminos(texto):
+    """Raíces de las palabras de ``texto``, en orden"""
+    return [raiz(palabra) for palabra in palabras(texto)]
+
+
+def consulta_pg(texto):
+    """
+    tsquery de prefijos para ``texto``. Las palabras van sin reducir:
+    ``to_tsquery('spanish_unaccent', ...)`` ya las reduce a raíces, y reducir
+    dos veces pierde coincidencias.
+    """
+    return ' & '.join(f'{palabra}:*' for palabra in palabras(texto))
+
+
+def texto_indexable(texto):
+    return ' '.join(terminos(texto))
+
+
+class _ColumnaDelServicio(Expression):
+    """
+    Columna de la tabla de Servicio que no está en el modelo
+    (``search_vector``), con el alias que la tabla tenga en la consulta
+    """
+
+    def __init__(self, columna, output_field=None):
+        super().__init__(output_field=output_field)
+        self.columna = columna
+        self.pk = F('pk')
+
+    def get_source_expressions(self):
+        return [self.pk]
+
+    def set_source_expressions(self, exprs):
+        (self.pk,) = exprs
+
+    def as_sql(self, compiler, connection):
+        alias = compiler.quote_name_unless_alias(self.pk.alias)
+        return f'{alias}.{connection.ops.quote_name(self.columna)}', []
+
+
+class _RelevanciaFTS(_ColumnaDelServicio):
+    """``bm25()`` de la fila del Servicio en la tabla FTS5 (mayor es mejor)"""
+
+    def __init__(self, consulta):
+        super().__init__('id', output_field=FloatField())
+        self.consulta = consulta
+
+    def as_sql(self, compiler, connection):
+        pk, params = compiler.compile(self.pk)
+        return (
+            f'(SELECT -bm25({TABLA_FTS}, 10.0, 1.0) FROM {TABLA_FTS} '
+            f'WHERE {TABLA_FTS} MATCH %s AND {TABLA_FTS}.rowid = {pk})'
+        ), (self.consulta, *params)
+
+
+def buscar_servicios(queryset, texto, ordenar=True):
+    """
+    Filtra ``queryset`` por ``texto``.
+
+    Cada palabra de la búsqueda debe aparecer (como prefijo) en el nombre o la
+    descripción. Si ``ordenar`` es verdadero, anota ``relevancia`` y ordena
+    los resultados de mayor a menor relevancia; si no, la relevancia ni se
+    calcula.
+    """
+    raices = terminos(texto)
+    if not raices:
+        return queryset
+
+    if connection.vendor == 'postgresql':
+        vector = _ColumnaDelServicio('search_vector')
+        consulta = SearchQuery(consulta_pg(texto), config=CONFIGURACION_PG, search_type='raw')
+        queryset = queryset.filter(SearchVectorExact(vector, consulta))
+        relevancia = SearchRank(vector, consulta, cover_density=True)
+    elif connection.vendor == 'sqlite':
+        # La tabla FTS5 no tiene modelo: el filtro es un pk__in sobre su
+        # índice y la relevancia, una subconsulta por la fila de cada resultado
+        consulta = ' '.join(f'"{r}"*' for r in raices)
+        coincidencias = RawSQL(f'SELECT rowid FROM {TABLA_FTS} WHERE {TABLA_FTS} MATCH %s', (consulta,))
+        queryset = queryset.filter(pk__in=coincidencias)
+        relevancia = _RelevanciaFTS(consulta)
+    else:
+        condicion = Q()
+        for palabra in _PALABRA.findall(texto):
+            condicion &= Q(nombre__icontains=palabra) | Q(descripcion__icontains=palabra)
+        return queryset.filter(condicion)
+
+    if ordenar:
+        queryset = queryset.annotate(relevancia=relevancia).order_by('-relevancia')
+    return queryset
+
+
+def indexar_servicios(servicios):
+    """Actualiza el índice de búsqueda de los servicios dados"""
+    servicios = list(servicios)
+    for inicio in range(0, len(servicios), TAMANO_LOTE):
+        lote = servicios[inicio:inicio + TAMANO_LOTE]
+        ids = [s.pk for s in lote]
+        marcadores = ', '.join(['%s'] * len(ids))
+        with connection.cursor() as cursor:
+            if connection.vendor == 'postgresql':
+                cursor.execute(
+                    f'UPDATE services_servicio SET search_vector = {VECTOR_PG} '
+                    f'WHERE id IN ({marcadores})', ids
+                )
+            elif connection.vendor == 'sqlite':
+                cursor.execute(f'DELETE FROM {TABLA_FTS} WHERE rowid IN ({marcadores})', ids)
+                cursor.executemany(
+                    f'INSERT INTO {TABLA_FTS} (rowid, nombre, descripcion) VALUES (%s, %s, %s)',
+                    [(s.pk, texto_indexable(s.nombre), texto_indexable(s.descripcion)) for s in lote],
+                )
+
+
+def desindexar_servicios(ids):
+    """Quita servicios eliminados del índice (solo necesario en SQLite)"""
+    if connection.vendor != 'sqlite':
+        return
+    ids = list(ids)
+    for inicio in range(0, len(ids), TAMANO_LOTE):
+        lote = ids[inicio:inicio + TAMANO_LOTE]
+        marcadores = ', '.join(['%s'] * len(lote))
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLA_FTS} WHERE rowid IN ({marcadores})', lote)
+
+
+def reindexar_todo(tamano_lote=2000):
+    """Reconstruye el índice completo. Devuelve el número de servicios indexados."""
+    from .models import Servicio
+
+    if connection.vendor == 'postgresql':
+        with connection.cursor() as cursor:
+            cursor.execute(f'UPDATE services_servicio SET search_vector = {VECTOR_PG}')
+            return cursor.rowcount
+
+    if connection.vendor == 'sqlite':
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLA_FTS}')
+
+    total = 0
+    lote = []
+    servicios = Servicio.objects.only('id', 'nombre', 'descripcion').order_by().iterator(
+        chunk_size=tamano_lote
+    )
+    for servicio in servicios:
+        lote.append(servicio)
+        if len(lote) >= tamano_lote:
+            indexar_servicios(lote)
+            total += len(lote)
+            lote = []
+    indexar_servicios(lote)
+    return total + len(lote)
@@ -1,9 +1,58 @@
 from rest_framework import serializers
+from django.core.exceptions import ValidationError as DjangoValidationError
 from django.core.validators import EmailValidator
-from .models import Servicio, SolicitudCliente
+from .campos import CamposSeleccionablesMixin
+from .models import ContadorSolicitudes, Servicio, SolicitudCliente, SolicitudPendiente
 
 
-class ServicioSerializer(serializers.ModelSerializer):
+class PrecargadoPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField que, si el contexto trae ``precargados[campo]``
+    (un dict pk -> objeto), busca ahí el objeto en lugar de hacer una consulta.
+    Lo usan las operaciones en lote (ver ``services.bulk``).
+    """
+
+    def to_internal_value(self, data):
+        precargados = self.context.get('precargados', {}).get(self.field_name)
+        if precargados is None or self.pk_field is not None:
+            return super().to_internal_value(data)
+        modelo = self.get_queryset().model
+        try:
+            if isinstance(data, bool):
+                raise TypeError
+            pk = modelo._meta.pk.to_python(data)
+        except (TypeError, ValueError, DjangoValidationError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        if pk not in precargados:
+            self.fail('does_not_exist', pk_value=data)
+        return precargados[pk]
+
+
+class SoloCambiosMixin:
+    """
+    ``update()`` que escribe solo las columnas que cambiaron (más las
+    ``auto_now``) con ``save(update_fields=...)``. Si nada cambió no escribe,
+    así que tampoco cambia ``ultima_actualizacion`` ni el ETag.
+    """
+
+    def update(self, instance, validated_data):
+        serializers.raise_errors_on_nested_writes('update', self, validated_data)
+        opciones = instance._meta
+        cambiados = []
+        for campo, valor in validated_data.items():
+            field = opciones.get_field(campo)
+            # Por attname: en las FKs se compara el id sin cargar el objeto
+            nuevo = valor.pk if field.is_relation and valor is not None else valor
+            if getattr(instance, field.attname) != nuevo:
+                setattr(instance, campo, valor)
+                cambiados.append(field.name)
+        if cambiados:
+            cambiados += [f.name for f in opciones.concrete_fields if getattr(f, 'auto_now', False)]
+            instance.save(update_fields=cambiados)
+        return instance
+
+
+class ServicioSerializer(CamposSeleccionablesMixin, SoloCambiosMixin, serializers.ModelSerializer):
     """
     Serializer para el modelo Servicio con validaciones personalizadas.
     """
@@ -64,10 +113,29 @@ class ServicioSerializer(serializers.ModelSerializer):
         return data
 
 
-class SolicitudClienteSerializer(serializers.ModelSerializer):
+class ServicioConContadoresSerializer(ServicioSerializer):
+    """
+    ``ServicioSerializer`` con el número de solicitudes por estatus
+    (``ContadorSolicitudes``); se usa en las lecturas con ``?contadores=true``.
+    """
+    solicitudes_nuevo = serializers.IntegerField(source='contador.nuevo', read_only=True)
+    solicitudes_en_proceso = serializers.IntegerField(source='contador.en_proceso', read_only=True)
+    solicitudes_cerrado = serializers.IntegerField(source='contador.cerrado', read_only=True)
+
+    class Meta(ServicioSerializer.Meta):
+        fields = ServicioSerializer.Meta.fields + [
+            'solicitudes_nuevo',
+            'solicitudes_en_proceso',
+            'solicitudes_cerrado',
+        ]
+
+
+class SolicitudClienteSerializer(CamposSeleccionablesMixin, SoloCambiosMixin, serializers.ModelSerializer):
     """
     Serializer para el modelo SolicitudCliente con validaciones personalizadas.
     """
+    # Al validar solo se carga del servicio lo que se devuelve en la respuesta
+    servicio = PrecargadoPrimaryKeyRelatedField(queryset=Servicio.objects.only('id', 'nombre'))
     servicio_nombre = serializers.CharField(source='servicio.nombre', read_only=True)
     
     class Meta:
@@ -131,3 +199,54 @@ class SolicitudClienteNestedSerializer(serializers.ModelSerializer):
         read_only_fields = ['id', 'fecha_creacion']
 
 
+class AnaliticaParametrosSerializer(serializers.Serializer):
+    """
+    Parámetros de /api/solicitudes/analitica/.
+    """
+    dias = serializers.IntegerField(min_value=1, max_value=366, default=90)
+    categoria = serializers.ChoiceField(choices=Servicio.CATEGORIA_CHOICES, required=False)
+    estatus = serializers.ChoiceField(choices=SolicitudCliente.ESTATUS_CHOICES, required=False)
+
+
+class ContadorSolicitudesSerializer(serializers.ModelSerializer):
+    """
+    Serializer de solo lectura para las estadísticas de solicitudes por servicio.
+    """
+    servicio_nombre = serializers.CharField(source='servicio.nombre', read_only=True)
+
+    class Meta:
+        model = ContadorSolicitudes
+        fields = [
+            'servicio',
+            'servicio_nombre',
+            'nuevo',
+            'en_proceso',
+            'cerrado',
+            'actualizado',
+        ]
+        read_only_fields = fields
+
+
+class SolicitudPendienteSerializer(serializers.ModelSerializer):
+    """
+    Serializer de solo lectura para el seguimiento de solicitudes encoladas.
+    """
+    estatus = serializers.SerializerMethodField()
+
+    class Meta:
+        model = SolicitudPendiente
+        fields = [
+            'seguimiento',
+            'estatus',
+            'solicitud',
+            'recibida',
+            'procesada',
+            'error',
+        ]
+        read_only_fields = fields
+
+    def get_estatus(self, obj):
+        """pendiente, procesada o descartada"""
+        if obj.procesada is None:
+            return 'pendiente'
+        return 'descartada' if obj.error else 'procesada'
@@ -0,0 +1,74 @@
+"""
+Señales del app services.
+"""
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import contadores
+from .models import Servicio, SolicitudCliente
+from .search import CAMPOS_INDEXADOS, desindexar_servicios, indexar_servicios
+
+
+@receiver(post_save, sender=Servicio)
+def indexar_servicio(sender, instance, update_fields=None, **kwargs):
+    """Mantiene el índice de búsqueda al guardar un servicio"""
+    if update_fields is not None and not CAMPOS_INDEXADOS & set(update_fields):
+        return
+    indexar_servicios([instance])
+
+
+@receiver(post_delete, sender=Servicio)
+def desindexar_servicio(sender, instance, **kwargs):
+    """Quita el servicio eliminado del índice de búsqueda"""
+    desindexar_servicios([instance.pk])
+
+
+@receiver(post_save, sender=Servicio)
+def crear_contador(sender, instance, created=False, raw=False, **kwargs):
+    """Crea los contadores de solicitudes de un servicio nuevo"""
+    if created and not raw:
+        contadores.crear_contadores([instance])
+
+
+@receiver(pre_save, sender=SolicitudCliente)
+def recordar_estatus(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Guarda el estatus anterior de la solicitud para ajustar los contadores"""
+    if raw or instance._state.adding:
+        return
+    if update_fields is not None and not contadores.CAMPOS_SOLICITUD & set(update_fields):
+        return
+    instance._contador_anterior = contadores.leer_posiciones([instance.pk]).get(instance.pk)
+
+
+@receiver(post_save, sender=SolicitudCliente)
+def contar_solicitud(sender, instance, created=False, raw=False, **kwargs):
+    """Suma la solicitud nueva, o la mueve de contador si cambió de estatus"""
+    if raw:
+        return
+    actual = (instance.servicio_id, instance.estatus)
+    if created:
+        contadores.ajustar({actual: 1})
+    elif '_contador_anterior' in instance.__dict__:
+        anterior = instance.__dict__.pop('_contador_anterior')
+        if anterior is not None:
+            contadores.ajustar(contadores.cambios_entre([anterior], [actual]))
+
+
+def _borrando_servicio(origin):
+    """``True`` si las solicitudes se borran en cascada con su servicio (y su contador)"""
+    return isinstance(origin, Servicio) or getattr(origin, 'model', None) is Servicio
+
+
+@receiver(pre_delete, sender=SolicitudCliente)
+def recordar_estatus_al_eliminar(sender, instance, origin=None, **kwargs):
+    """El borrado ya corre en una transacción: se bloquea la fila y se lee su estatus"""
+    if not _borrando_servicio(origin):
+        instance._contador_anterior = contadores.leer_posiciones([instance.pk]).get(instance.pk)
+
+
+@receiver(post_delete, sender=SolicitudCliente)
+def descontar_solicitud(sender, instance, **kwargs):
+    """Resta la solicitud eliminada de su contador"""
+    anterior = instance.__dict__.pop('_contador_anterior', None)
+    if anterior is not None:
+        contadores.ajustar({anterior: -1}, reconstruir_faltantes=False)
@@ -0,0 +1,368 @@
+"""
+Datos sintéticos para desarrollo y pruebas de carga (``seed_services``).
+
+Genera servicios y solicitudes con distribuciones parecidas a las de
+producción: categorías con distinto peso, precios log-normales por
+categoría, popularidad de servicios tipo Zipf (pocos servicios reciben la
+mayoría de las solicitudes), más solicitudes recientes que antiguas, menos
+en fin de semana y en horario de oficina, y estatus que avanzan con la edad
+de la solicitud. Con la misma ``semilla`` y el mismo ``hasta`` (ya
+terminado) los datos son idénticos.
+
+Las filas se insertan en lotes con ``bulk_create`` (o ``COPY`` en
+PostgreSQL), sin señales, así que al terminar se indexan los servicios para
+la búsqueda y se reconcilian los contadores de solicitudes.
+"""
+import csv
+import datetime
+import io
+import itertools
+import math
+import random
+from contextlib import contextmanager
+from decimal import Decimal
+
+from django.db import connection, transaction
+from django.utils import timezone
+
+from . import contadores
+from .models import Servicio, SolicitudCliente
+from .search import indexar_servicios, normalizar
+
+TAMANO_LOTE = 5000
+
+# Peso de la categoría, precio mediano (MXN) y días estimados medianos
+CATEGORIAS = {
+    'Web': (30, 60000, 45),
+    'Móvil': (20, 90000, 60),
+    'Cloud': (18, 80000, 40),
+    'Data': (14, 85000, 50),
+    'Seguridad': (10, 55000, 25),
+    'Consultoría': (8, 40000, 20),
+}
+
+# Servicios curados: los primeros que se crean
+CATALOGO = [
+    {
+        'nombre': 'Desarrollo Web Full Stack',
+        'categoria': 'Web',
+        'descripcion': 'Desarrollo completo de aplicaciones web modernas con React y Django',
+        'precio_mxn': Decimal('75000.00'),
+        'nivel_prioridad': 5,
+        'responsable_email': 'web@empresa.com',
+        'tiempo_estimado_dias': 60,
+    },
+    {
+        'nombre': 'App Móvil iOS y Android',
+        'categoria': 'Móvil',
+        'descripcion': 'Desarrollo de aplicaciones móviles nativas para iOS y Android',
+        'precio_mxn': Decimal('120000.00'),
+        'nivel_prioridad': 5,
+        'responsable_email': 'mobile@empresa.com',
+        'tiempo_estimado_dias': 90,
+    },
+    {
+        'nombre': 'Migración a AWS',
+        'categoria': 'Cloud',
+        'descripcion': 'Migración completa de infraestructura a Amazon Web Services',
+        'precio_mxn': Decimal('95000.00'),
+        'nivel_prioridad': 4,
+        'responsable_email': 'cloud@empresa.com',
+        'tiempo_estimado_dias': 45,
+    },
+    {
+        'nombre': 'Análisis de Big Data',
+        'categoria': 'Data',
+        'descripcion': 'Análisis y procesamiento de grandes volúmenes de datos con Python y Spark',
+        'precio_mxn': Decimal('85000.00'),
+        'nivel_prioridad': 4,
+        'responsable_email': 'data@empresa.com',
+        'tiempo_estimado_dias': 50,
+    },
+    {
+        'nombre': 'Auditoría de Seguridad',
+        'categoria': 'Seguridad',
+        'descripcion': 'Auditoría completa de seguridad informática y recomendaciones',
+        'precio_mxn': Decimal('65000.00'),
+        'nivel_prioridad': 5,
+        'responsable_email': 'security@empresa.com',
+        'tiempo_estimado_dias': 30,
+    },
+    {
+        'nombre': 'Consultoría Estratégica IT',
+        'categoria': 'Consultoría',
+        'descripcion': 'Consultoría estratégica para transformación digital',
+        'precio_mxn': Decimal('55000.00'),
+        'nivel_prioridad': 3,
+        'responsable_email': 'consultoria@empresa.com',
+        'tiempo_estimado_dias': 20,
+    },
+    {
+        'nombre': 'E-commerce Platform',
+        'categoria': 'Web',
+        'descripcion': 'Plataforma completa de comercio electrónico con pasarela de pagos',
+        'precio_mxn': Decimal('110000.00'),
+        'nivel_prioridad': 4,
+        'responsable_email': 'ecommerce@empresa.com',
+        'tiempo_estimado_dias': 75,
+    },
+    {
+        'nombre': 'App React Native',
+        'categoria': 'Móvil',
+        'descripcion': 'Aplicación móvil multiplataforma desarrollada con React Native',
+        'precio_mxn': Decimal('70000.00'),
+        'nivel_prioridad': 3,
+        'responsable_email': 'react@empresa.com',
+        'tiempo_estimado_dias': 55,
+    },
+    {
+        'nombre': 'Data Warehouse en Azure',
+        'categoria': 'Cloud',
+        'descripcion': 'Implementación de almacén de datos en Microsoft Azure',
+        'precio_mxn': Decimal('90000.00'),
+        'nivel_prioridad': 4,
+        'responsable_email': 'azure@empresa.com',
+        'tiempo_estimado_dias': 40,
+    },
+    {
+        'nombre': 'Penetration Testing',
+        'categoria': 'Seguridad',
+        'descripcion': 'Pruebas de penetración y análisis de vulnerabilidades',
+        'precio_mxn': Decimal('50000.00'),
+        'nivel_prioridad': 3,
+        'responsable_email': 'pentest@empresa.com',
+        'tiempo_estimado_dias': 25,
+    },
+]
+
+SERVICIOS_POR_CATEGORIA = {
+    'Web': ['Sitio corporativo', 'Tienda en línea', 'Portal de clientes', 'Landing page', 'Intranet'],
+    'Móvil': ['App de pedidos', 'App de lealtad', 'App de reservaciones', 'App de campo', 'Wallet móvil'],
+    'Cloud': ['Migración a la nube', 'Kubernetes administrado', 'Respaldos en la nube', 'Arquitectura serverless'],
+    'Data': ['Tablero de indicadores', 'Data lake', 'Modelo de pronóstico', 'Integración de datos'],
+    'Seguridad': ['Auditoría de seguridad', 'Pruebas de penetración', 'Gestión de identidades', 'Monitoreo SOC'],
+    'Consultoría': ['Transformación digital', 'Arquitectura de software', 'Gobierno de TI', 'Capacitación técnica'],
+}
+
+MODIFICADORES = ['para PyMEs', 'empresarial', 'a la medida', 'express', 'premium', 'para retail', 'para gobierno']
+
+NOMBRES = [
+    'Juan', 'María', 'Carlos', 'Ana', 'Luis', 'Laura', 'Roberto', 'Patricia', 'Fernando', 'Sofía',
+    'Miguel', 'Carmen', 'Jorge', 'Isabel', 'Ricardo', 'Elena', 'Daniel', 'Adriana', 'Alejandro', 'Lucía',
+]
+
+APELLIDOS = [
+    'Pérez', 'González', 'Rodríguez', 'Martínez', 'Hernández', 'Sánchez', 'López', 'García', 'Ramírez',
+    'Torres', 'Díaz', 'Flores', 'Morales', 'Ruiz', 'Vargas', 'Castro', 'Jiménez', 'Mendoza', 'Ortega', 'Ríos',
+]
+
+DOMINIOS = ['gmail.com', 'hotmail.com', 'outlook.com', 'yahoo.com.mx', 'empresa.mx']
+
+MENSAJES = [
+    'Me interesa contratar este servicio para mi empresa',
+    'Necesito más información sobre los detalles y el proceso',
+    '¿Cuál es el tiempo de entrega estimado?',
+    'Quiero agendar una reunión para discutir el proyecto',
+    'Estoy interesado en conocer los precios y paquetes disponibles',
+    'Necesito una solución urgente para mi negocio',
+    'Me gustaría recibir una propuesta personalizada',
+    '¿Ofrecen soporte post-implementación?',
+    'Tengo un proyecto grande y necesito cotización',
+    'Busco una solución escalable y moderna',
+    'Necesito integrar esto con mis sistemas existentes',
+    '¿Pueden trabajar con mi equipo interno?',
+    'Quiero saber más sobre la metodología de trabajo',
+    'Necesito una demo o prueba del servicio',
+    'Estoy evaluando varias opciones, ¿qué me recomiendan?',
+    'Tengo un presupuesto limitado, ¿hay opciones flexibles?',
+    'Necesito implementación rápida, ¿es posible?',
+    'Quiero conocer casos de éxito similares',
+    '¿Ofrecen capacitación para mi equipo?',
+    'Necesito una solución personalizada para mi industria',
+]
+
+# Peso de cada hora del día (hora local) en que llegan las solicitudes
+PESOS_HORA = [1, 1, 1, 1, 1, 2, 3, 5, 8, 10, 11, 11, 10, 9, 10, 11, 10, 9, 7, 6, 5, 4, 3, 2]
+_HORAS_ACUMULADAS = list(itertools.accumulate(PESOS_HORA))
+
+# Exponente de la popularidad de los servicios (Zipf)
+EXPONENTE_POPULARIDAD = 1.1
+
+COLUMNAS_SOLICITUD = ['servicio_id', 'cliente_nombre', 'cliente_email', 'mensaje', 'estatus', 'fecha_creacion']
+
+
+@contextmanager
+def sin_auto_now(modelo, *campos):
+    """
+    Desactiva temporalmente ``auto_now``/``auto_now_add`` para poder insertar
+    fechas arbitrarias con ``bulk_create``.
+    """
+    originales = []
+    for nombre in campos:
+        campo = modelo._meta.get_field(nombre)
+        originales.append((campo, campo.auto_now, campo.auto_now_add))
+        campo.auto_now = campo.auto_now_add = False
+    try:
+        yield
+    finally:
+        for campo, auto_now, auto_now_add in originales:
+            campo.auto_now = auto_now
+            campo.auto_now_add = auto_now_add
+
+
+def puede_copiar():
+    """``True`` si la conexión es PostgreSQL con psycopg2 (``COPY FROM STDIN``)"""
+    if connection.vendor != 'postgresql':
+        return False
+    with connection.cursor() as cursor:
+        return hasattr(cursor.cursor, 'copy_expert')
+
+
+class GeneradorSintetico:
+    """
+    Genera e inserta servicios y solicitudes sintéticos.
+
+    ``hasta`` es el último día con datos (default: hoy) y ``dias`` el número
+    de días hacia atrás en que se publican los servicios. ``al_avanzar``, si
+    se da, se llama con ``(tabla, insertadas, total)`` después de cada lote.
+    """
+
+    def __init__(self, semilla=None, hasta=None, dias=365, tamano_lote=TAMANO_LOTE,
+                 usar_copy=None, al_avanzar=None):
+        self.semilla = semilla if semilla is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.semilla)
+        self.hasta = hasta or timezone.localdate()
+        self.dias = dias
+        self.tamano_lote = tamano_lote
+        self.usar_copy = puede_copiar() if usar_copy is None else usar_copy
+        self.al_avanzar = al_avanzar or (lambda tabla, insertadas, total: None)
+        self.zona = timezone.get_current_timezone()
+        # Nada posterior al final de ``hasta`` ni al momento actual
+        fin_del_dia = datetime.datetime.combine(
+            self.hasta + datetime.timedelta(days=1), datetime.time(), tzinfo=self.zona
+        )
+        self.limite = min(fin_del_dia, timezone.now())
+
+    def servicios(self, total):
+        """Crea ``total`` servicios (primero los del ``CATALOGO``) y los devuelve"""
+        categorias = list(CATEGORIAS)
+        pesos = [CATEGORIAS[categoria][0] for categoria in categorias]
+        creados = []
+        for inicio in range(0, total, self.tamano_lote):
+            lote = []
+            for i in range(inicio, min(inicio + self.tamano_lote, total)):
+                if i < len(CATALOGO):
+                    datos = dict(CATALOGO[i])
+                else:
+                    datos = self._servicio(self.rng.choices(categorias, weights=pesos)[0])
+                datos['fecha_publicacion'] = self.hasta - datetime.timedelta(
+                    days=self.rng.randrange(self.dias)
+                )
+                lote.append(Servicio(**datos))
+            with transaction.atomic(), sin_auto_now(Servicio, 'fecha_publicacion'):
+                creados.extend(Servicio.objects.bulk_create(lote))
+            self.al_avanzar('servicios', len(creados), total)
+        # bulk_create no envía señales: índice de búsqueda y contadores aquí
+        indexar_servicios(creados)
+        contadores.crear_contadores(creados)
+        return creados
+
+    def _servicio(self, categoria):
+        _, mediana, dias_medianos = CATEGORIAS[categoria]
+        base = self.rng.choice(SERVICIOS_POR_CATEGORIA[categoria])
+        modificador = self.rng.choice(MODIFICADORES)
+        precio = min(9_999_999, max(1000, round(self.rng.lognormvariate(math.log(mediana), 0.45), -2)))
+        return {
+            'nombre': f'{base} {modificador}',
+            'categoria': categoria,
+            'descripcion': f'{base} {modificador}: análisis, implementación y soporte del proyecto.',
+            'precio_mxn': Decimal(precio).quantize(Decimal('0.01')),
+            'activo': self.rng.random() < 0.9,
+            'nivel_prioridad': self.rng.choices([1, 2, 3, 4, 5], weights=[5, 15, 40, 25, 15])[0],
+            'responsable_email': f'{normalizar(categoria)}@empresa.com',
+            'tiempo_estimado_dias': max(
+                1, round(dias_medianos * (precio / mediana) ** 0.7 * self.rng.uniform(0.8, 1.2))
+            ),
+        }
+
+    def solicitudes(self, servicios, total):
+        """
+        Inserta ``total`` solicitudes repartidas entre ``servicios`` y
+        devuelve cuántas insertó. Ninguna es anterior a la publicación de su
+        servicio.
+        """
+        servicios = list(servicios)
+        if not servicios or not total:
+            return 0
+        # La popularidad no depende del orden de creación
+        populares = self.rng.sample(servicios, len(servicios))
+        acumulados = list(itertools.accumulate(
+            1 / rango ** EXPONENTE_POPULARIDAD for rango in range(1, len(populares) + 1)
+        ))
+
+        insertadas = 0
+        while insertadas < total:
+            tamano = min(self.tamano_lote, total - insertadas)
+            elegidos = self.rng.choices(populares, cum_weights=acumulados, k=tamano)
+            filas = [self._solicitud(servicio) for servicio in elegidos]
+            with transaction.atomic():
+                if self.usar_copy:
+                    self._copiar(filas)
+                else:
+                    self._insertar(filas)
+            insertadas += tamano
+            self.al_avanzar('solicitudes', insertadas, total)
+
+        # Todos los contadores de una vez (evita un IN con miles de ids)
+        contadores.reconciliar()
+        return insertadas
+
+    def _solicitud(self, servicio):
+        rng = self.rng
+        # Más solicitudes recientes que antiguas (densidad creciente en el
+        # tiempo) y menos en fin de semana
+        margen = (self.hasta - servicio.fecha_publicacion).days
+        for _ in range(1000):
+            edad = int(margen * (1 - math.sqrt(rng.random())))
+            dia = self.hasta - datetime.timedelta(days=edad)
+            if dia.weekday() >= 5 and rng.random() >= 0.4:
+                continue
+            hora = rng.choices(range(24), cum_weights=_HORAS_ACUMULADAS)[0]
+            fecha = datetime.datetime(
+                dia.year, dia.month, dia.day, hora, rng.randrange(60), rng.randrange(60), tzinfo=self.zona
+            )
+            if fecha < self.limite:
+                break
+        else:
+            # Servicio publicado hoy, poco después de medianoche
+            edad, fecha = 0, self.limite - datetime.timedelta(seconds=1)
+
+        u = rng.random()
+        cerrado = min(0.8, edad / 60)
+        if u < cerrado:
+            estatus = 'cerrado'
+        elif u < cerrado + min(0.25, (edad + 1) / 14) * (1 - cerrado):
+            estatus = 'en_proceso'
+        else:
+            estatus = 'nuevo'
+
+        nombre, apellido = rng.choice(NOMBRES), rng.choice(APELLIDOS)
+        email = f'{normalizar(nombre)}.{normalizar(apellido)}{rng.randrange(1000)}@{rng.choice(DOMINIOS)}'
+        return (servicio.pk, f'{nombre} {apellido}', email, rng.choice(MENSAJES), estatus, fecha)
+
+    def _insertar(self, filas):
+        with sin_auto_now(SolicitudCliente, 'fecha_creacion'):
+            SolicitudCliente.objects.bulk_create(
+                [SolicitudCliente(**dict(zip(COLUMNAS_SOLICITUD, fila))) for fila in filas],
+                batch_size=self.tamano_lote,
+            )
+
+    def _copiar(self, filas):
+        buffer = io.StringIO()
+        csv.writer(buffer).writerows(filas)
+        buffer.seek(0)
+        tabla = connection.ops.quote_name(SolicitudCliente._meta.db_table)
+        columnas = ', '.join(connection.ops.quote_name(columna) for columna in COLUMNAS_SOLICITUD)
+        with connection.cursor() as cursor:
+            cursor.cursor.copy_expert(f'COPY {tabla} ({columnas}) FROM STDIN WITH (FORMAT csv)', buffer)
+
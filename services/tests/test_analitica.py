@@ -0,0 +1,118 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from services.analitica import MARCA, inicio_del_dia, resumir
+from services.models import MarcaResumen, ResumenDiarioSolicitudes, Servicio, SolicitudCliente
+
+
+class AnaliticaSolicitudesTest(TestCase):
+    """Tests para los resúmenes diarios y /api/solicitudes/analitica/"""
+
+    def setUp(self):
+        """Configuración inicial: solicitudes repartidas en los últimos días"""
+        self.client = APIClient()
+        self.url = reverse('solicitud-analitica')
+        self.hoy = timezone.localdate()
+        self.web = Servicio.objects.create(
+            nombre='Desarrollo Web', categoria='Web', descripcion='Aplicaciones web',
+            precio_mxn=1000, responsable_email='web@example.com',
+        )
+        self.cloud = Servicio.objects.create(
+            nombre='Migración', categoria='Cloud', descripcion='Migración a la nube',
+            precio_mxn=2000, responsable_email='cloud@example.com',
+        )
+        for dias_atras, servicio, estatus in [
+            (0, self.web, 'nuevo'),
+            (1, self.web, 'nuevo'),
+            (1, self.web, 'cerrado'),
+            (1, self.cloud, 'nuevo'),
+            (3, self.cloud, 'en_proceso'),
+            (3, self.cloud, 'en_proceso'),
+            (120, self.web, 'cerrado'),
+        ]:
+            self.crear(self.hoy - datetime.timedelta(days=dias_atras), servicio, estatus)
+
+    def crear(self, dia, servicio, estatus, hora=datetime.time(12)):
+        solicitud = SolicitudCliente.objects.create(
+            servicio=servicio, cliente_nombre='Cliente', cliente_email='cliente@example.com',
+            mensaje='Mensaje', estatus=estatus,
+        )
+        fecha = timezone.make_aware(datetime.datetime.combine(dia, hora))
+        SolicitudCliente.objects.filter(pk=solicitud.pk).update(fecha_creacion=fecha)
+        return solicitud
+
+    def resultados(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response.data
+
+    def dia(self, dias_atras):
+        return self.hoy - datetime.timedelta(days=dias_atras)
+
+    def test_en_vivo_sin_resumenes(self):
+        """Test: Sin resúmenes, todo se cuenta en vivo"""
+        datos = self.resultados()
+        self.assertIsNone(datos['procesado_hasta'])
+        self.assertEqual(datos['desde'], self.dia(89))
+        self.assertEqual(datos['total'], 6)
+        self.assertIn(
+            {'fecha': self.dia(3), 'categoria': 'Cloud', 'estatus': 'en_proceso', 'total': 2},
+            datos['resultados'],
+        )
+
+    def test_resumen_incremental(self):
+        """Test: El resumen llega hasta ayer y la siguiente ejecución no repite días"""
+        en_vivo = self.resultados()
+        dias, filas = resumir()
+        self.assertEqual(MarcaResumen.objects.get(nombre=MARCA).procesado_hasta, self.dia(1))
+        self.assertEqual(dias, 120)
+        self.assertEqual(filas, 5)
+        self.assertFalse(ResumenDiarioSolicitudes.objects.filter(fecha=self.hoy).exists())
+        self.assertEqual(resumir(), (0, 0))
+
+        datos = self.resultados()
+        self.assertEqual(datos['procesado_hasta'], self.dia(1))
+        self.assertEqual(datos['resultados'], en_vivo['resultados'])
+
+        # Los días resumidos ya no se leen de las solicitudes; hoy sí
+        SolicitudCliente.objects.filter(fecha_creacion__lt=inicio_del_dia(self.hoy)).delete()
+        self.crear(self.hoy, self.cloud, 'nuevo')
+        self.assertEqual(self.resultados()['total'], en_vivo['total'] + 1)
+
+    def test_volver_a_resumir(self):
+        """Test: --desde vuelve a resumir días con los estatus actuales"""
+        resumir()
+        SolicitudCliente.objects.filter(estatus='en_proceso').update(estatus='cerrado')
+
+        salida = StringIO()
+        call_command('resumir_solicitudes', '--desde', self.dia(3).isoformat(), stdout=salida)
+        self.assertIn('3 días', salida.getvalue())
+        datos = self.resultados(estatus='cerrado', categoria='Cloud')
+        self.assertEqual(
+            datos['resultados'],
+            [{'fecha': self.dia(3), 'categoria': 'Cloud', 'estatus': 'cerrado', 'total': 2}],
+        )
+
+    def test_dias_en_zona_horaria_local(self):
+        """Test: Los días se cortan en la zona horaria del proyecto"""
+        dia = self.dia(5)
+        self.crear(dia, self.web, 'nuevo', hora=datetime.time(23, 30))
+        resumir()
+        self.assertEqual(ResumenDiarioSolicitudes.objects.get(fecha=dia).total, 1)
+
+    def test_filtros_y_validacion(self):
+        """Test: Filtros por categoría, estatus y días; parámetros inválidos → 400"""
+        self.assertEqual(self.resultados(categoria='Web')['total'], 3)
+        self.assertEqual(self.resultados(dias=1)['total'], 1)
+        self.assertEqual(self.resultados(dias=366)['total'], 7)
+
+        for params in [{'dias': 0}, {'dias': 'abc'}, {'categoria': 'Otra'}, {'estatus': 'x'}]:
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
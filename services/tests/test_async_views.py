@@ -0,0 +1,99 @@
+from unittest import mock
+
+from asgiref.sync import iscoroutinefunction
+from django.test import TestCase
+from django.urls import resolve, reverse
+from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework import status
+from services.models import Servicio
+from services.views import ServicioViewSet
+
+
+class CatalogoAsyncTest(TestCase):
+    """Tests para las vistas asíncronas del catálogo (ASYNC_CATALOG)"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.factory = APIRequestFactory()
+        for i in range(25):
+            Servicio.objects.create(
+                nombre=f'Servicio {i:02d}',
+                categoria='Web' if i % 2 else 'Cloud',
+                descripcion='Desarrollo de aplicaciones web',
+                precio_mxn=1000 * (i % 7),
+                responsable_email='web@example.com',
+            )
+        self.servicio = Servicio.objects.first()
+
+    def respuesta_sincrona(self, acciones, url, **kwargs):
+        vista = ServicioViewSet.as_view(acciones, basename='servicio', detail='pk' in kwargs)
+        return vista(self.factory.get(url), **kwargs).render()
+
+    def test_lecturas_son_asincronas(self):
+        """Test: Los GET del catálogo se resuelven a vistas asíncronas"""
+        for url in ['/api/health', reverse('servicio-list'),
+                    reverse('servicio-detail', kwargs={'pk': self.servicio.id})]:
+            with self.subTest(url=url):
+                self.assertTrue(iscoroutinefunction(resolve(url).func))
+
+    def test_misma_respuesta_que_el_viewset(self):
+        """Test: Las vistas asíncronas responden lo mismo que ServicioViewSet"""
+        casos = [
+            ({'get': 'list'}, f'{reverse("servicio-list")}?activo=true&ordenar_por=precio_desc&page=2', {}),
+            ({'get': 'list'}, f'{reverse("servicio-list")}?paginacion=cursor&ordering=-nombre', {}),
+            ({'get': 'list'}, f'{reverse("servicio-list")}?search=aplicaciones', {}),
+            ({'get': 'list'}, f'{reverse("servicio-list")}?paginacion=cursor&contadores=true', {}),
+            ({'get': 'list'}, f'{reverse("servicio-list")}?fields=nombre,precio_mxn&paginacion=cursor', {}),
+            ({'get': 'retrieve'}, f'{reverse("servicio-detail", kwargs={"pk": self.servicio.id})}?omit=descripcion',
+             {'pk': str(self.servicio.id)}),
+            ({'get': 'retrieve'}, reverse('servicio-detail', kwargs={'pk': self.servicio.id}),
+             {'pk': str(self.servicio.id)}),
+        ]
+        for acciones, url, kwargs in casos:
+            with self.subTest(url=url):
+                esperado = self.respuesta_sincrona(acciones, url, **kwargs)
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(response.content, esperado.content)
+                self.assertEqual(response['ETag'], esperado['ETag'])
+
+    def test_lecturas_del_viewset(self):
+        """Test: El queryset de las vistas asíncronas es el de ServicioViewSet"""
+        otro = Servicio.objects.exclude(pk=self.servicio.pk).first()
+        with mock.patch.object(
+            ServicioViewSet, 'get_queryset', lambda vista: Servicio.objects.filter(pk=self.servicio.pk)
+        ):
+            response = self.client.get(reverse('servicio-list'))
+            self.assertEqual([s['id'] for s in response.data['results']], [self.servicio.id])
+            response = self.client.get(reverse('servicio-detail', kwargs={'pk': otro.id}))
+            self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_errores_con_el_mismo_formato(self):
+        """Test: Los errores tienen el formato de custom_exception_handler"""
+        response = self.client.get(reverse('servicio-list'), {'min_precio': 'abc'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(response.data['message'], 'Error de validación')
+        self.assertIn('min_precio', response.data['details'])
+
+        response = self.client.get(reverse('servicio-list'), {'page': 99})
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+        response = self.client.get(reverse('servicio-detail', kwargs={'pk': 9999}))
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+        self.assertEqual(response.data['message'], 'Recurso no encontrado')
+
+    def test_escrituras_se_delegan_al_viewset(self):
+        """Test: PATCH sobre el detalle sigue funcionando (vista síncrona)"""
+        url = reverse('servicio-detail', kwargs={'pk': self.servicio.id})
+        response = self.client.patch(url, {'precio_mxn': '123.00'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.servicio.refresh_from_db()
+        self.assertEqual(str(self.servicio.precio_mxn), '123.00')
+
+    def test_health_check(self):
+        """Test: Health check asíncrono"""
+        response = self.client.get('/api/health')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.json(), {'status': 'ok'})
+        self.assertEqual(self.client.post('/api/health').status_code, status.HTTP_405_METHOD_NOT_ALLOWED)
@@ -0,0 +1,36 @@
+from django.test import SimpleTestCase
+
+from benchmarks.api import ESCENARIOS
+from benchmarks.regresiones import comparar
+from services.tests.utils import rutas_api
+
+
+def resultados(**endpoints):
+    return {'resultados': {'1000': endpoints}}
+
+
+class SuiteBenchmarksTest(SimpleTestCase):
+    """Tests para la suite de benchmarks de la API y su comparación con el baseline"""
+
+    def test_todas_las_rutas_tienen_escenario(self):
+        """Test: Cada ruta de core/urls.py tiene al menos un escenario en benchmarks/api.py"""
+        self.assertEqual(rutas_api() - {escenario.ruta for escenario in ESCENARIOS}, set())
+
+    def test_comparar(self):
+        """Test: Se marcan más consultas y latencias por encima del umbral, no el ruido"""
+        baseline = resultados(
+            lista={'p50_ms': 2.0, 'consultas': 2},
+            detalle={'p50_ms': 0.4, 'consultas': 1},
+            lote={'p50_ms': 5.0, 'consultas': 5},
+        )
+        actual = resultados(
+            lista={'p50_ms': 4.0, 'consultas': 2},    # +100 % y +2 ms
+            detalle={'p50_ms': 0.9, 'consultas': 1},  # +125 % pero solo +0.5 ms
+            lote={'p50_ms': 5.1, 'consultas': 6},
+            nuevo={'p50_ms': 1.0, 'consultas': 1},
+        )
+        self.assertEqual(
+            comparar(actual, baseline),
+            [('1000', 'lista', 'p50_ms', 2.0, 4.0), ('1000', 'lote', 'consultas', 5, 6)],
+        )
+        self.assertEqual(comparar(actual, baseline, umbral=1.5), [('1000', 'lote', 'consultas', 5, 6)])
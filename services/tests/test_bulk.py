@@ -0,0 +1,173 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from services.models import Servicio, SolicitudCliente
+from services.search import buscar_servicios
+
+
+def servicio_valido(**kwargs):
+    datos = {
+        'nombre': 'Servicio en lote',
+        'categoria': 'Data',
+        'descripcion': 'Análisis de datos',
+        'precio_mxn': '25000.00',
+        'responsable_email': 'data@example.com',
+    }
+    datos.update(kwargs)
+    return datos
+
+
+class BulkServiciosTest(TestCase):
+    """Tests para /api/servicios/bulk/"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.url = reverse('servicio-bulk')
+        self.servicio = Servicio.objects.create(
+            nombre='Desarrollo Web',
+            categoria='Web',
+            descripcion='Desarrollo de aplicaciones web',
+            precio_mxn=50000.00,
+            responsable_email='web@example.com',
+        )
+
+    def test_crear_lote_valido(self):
+        """Test: Crear un lote válido → 201 con el id de cada elemento"""
+        lote = [servicio_valido(nombre=f'Servicio {i}') for i in range(3)]
+        response = self.client.post(self.url, lote, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['exitosos'], 3)
+        ids = [r['id'] for r in response.data['resultados']]
+        self.assertEqual(
+            list(Servicio.objects.filter(id__in=ids).order_by('id').values_list('nombre', flat=True)),
+            ['Servicio 0', 'Servicio 1', 'Servicio 2'],
+        )
+
+    def test_crear_lote_atomico_con_errores(self):
+        """Test: En modo atómico un elemento inválido cancela todo el lote → 400"""
+        lote = [servicio_valido(), servicio_valido(precio_mxn='-1'), servicio_valido(nombre='')]
+        response = self.client.post(self.url, lote, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual([e['indice'] for e in response.data['errores']], [1, 2])
+        self.assertIn('precio_mxn', response.data['errores'][0]['errores'])
+        self.assertEqual(Servicio.objects.count(), 1)
+
+    def test_crear_lote_parcial(self):
+        """Test: En modo parcial se crean los válidos → 207"""
+        lote = [servicio_valido(), servicio_valido(precio_mxn='-1'), servicio_valido()]
+        response = self.client.post(f'{self.url}?modo=parcial', lote, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([r['indice'] for r in response.data['resultados']], [0, 2])
+        self.assertEqual([e['indice'] for e in response.data['errores']], [1])
+        self.assertEqual(Servicio.objects.count(), 3)
+
+    def test_lote_invalido(self):
+        """Test: Cuerpo que no es lista, lote vacío o modo desconocido → 400"""
+        casos = [
+            (self.url, servicio_valido()),
+            (self.url, []),
+            (f'{self.url}?modo=todo', [servicio_valido()]),
+        ]
+        for url, cuerpo in casos:
+            with self.subTest(url=url, cuerpo=cuerpo):
+                response = self.client.post(url, cuerpo, format='json')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_crear_lote_indexa_busqueda(self):
+        """Test: Los servicios creados en lote aparecen en la búsqueda"""
+        self.client.post(self.url, [servicio_valido(nombre='Kubernetes administrado')], format='json')
+        self.assertEqual(buscar_servicios(Servicio.objects.all(), 'kubernetes').count(), 1)
+
+    def test_actualizar_lote(self):
+        """Test: Actualizar un lote cambia solo los campos enviados"""
+        anterior = self.servicio.ultima_actualizacion
+        lote = [{'id': self.servicio.id, 'precio_mxn': '60000.00', 'nombre': 'Sitios Web'}]
+        response = self.client.patch(self.url, lote, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.servicio.refresh_from_db()
+        self.assertEqual(str(self.servicio.precio_mxn), '60000.00')
+        self.assertEqual(self.servicio.categoria, 'Web')
+        self.assertGreater(self.servicio.ultima_actualizacion, anterior)
+        self.assertEqual(buscar_servicios(Servicio.objects.all(), 'sitios').count(), 1)
+
+    def test_actualizar_lote_ids_invalidos(self):
+        """Test: Ids inexistentes, repetidos o ausentes son errores del elemento"""
+        lote = [
+            {'id': self.servicio.id, 'activo': False},
+            {'id': self.servicio.id, 'activo': True},
+            {'id': 9999, 'activo': False},
+            {'activo': False},
+        ]
+        response = self.client.patch(f'{self.url}?modo=parcial', lote, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([e['indice'] for e in response.data['errores']], [1, 2, 3])
+        self.servicio.refresh_from_db()
+        self.assertFalse(self.servicio.activo)
+
+    def test_desactivar_lote(self):
+        """Test: Desactivar un lote de servicios"""
+        otro = Servicio.objects.create(
+            nombre='Cloud Service',
+            categoria='Cloud',
+            descripcion='Servicios en la nube',
+            precio_mxn=30000.00,
+            responsable_email='cloud@example.com',
+        )
+        url = reverse('servicio-bulk-desactivar')
+        response = self.client.post(url, [self.servicio.id, otro.id, 9999], format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Servicio.objects.filter(activo=False).count(), 0)
+
+        response = self.client.post(f'{url}?modo=parcial', [self.servicio.id, otro.id, 9999], format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual(Servicio.objects.filter(activo=False).count(), 2)
+
+
+class BulkSolicitudesTest(TestCase):
+    """Tests para /api/solicitudes/bulk/"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.url = reverse('solicitud-bulk')
+        self.servicio = Servicio.objects.create(
+            nombre='Servicio Test',
+            categoria='Web',
+            descripcion='Descripción test',
+            precio_mxn=10000.00,
+            responsable_email='test@example.com',
+        )
+
+    def test_crear_lote_con_servicio_inexistente(self):
+        """Test: Un servicio inexistente es un error del elemento"""
+        lote = [
+            {'servicio': self.servicio.id, 'cliente_nombre': 'Ana', 'cliente_email': 'ana@example.com', 'mensaje': 'Hola'},
+            {'servicio': 9999, 'cliente_nombre': 'Luis', 'cliente_email': 'luis@example.com', 'mensaje': 'Hola'},
+            {'servicio': 'abc', 'cliente_nombre': 'Eva', 'cliente_email': 'eva@example.com', 'mensaje': 'Hola'},
+        ]
+        response = self.client.post(f'{self.url}?modo=parcial', lote, format='json')
+        self.assertEqual(response.status_code, status.HTTP_207_MULTI_STATUS)
+        self.assertEqual([e['indice'] for e in response.data['errores']], [1, 2])
+        self.assertIn('servicio', response.data['errores'][0]['errores'])
+        solicitud = SolicitudCliente.objects.get()
+        self.assertEqual(solicitud.servicio, self.servicio)
+        self.assertEqual(solicitud.estatus, 'nuevo')
+        self.assertIsNotNone(solicitud.fecha_creacion)
+
+    def test_actualizar_estatus_en_lote(self):
+        """Test: Actualizar el estatus de varias solicitudes"""
+        solicitudes = [
+            SolicitudCliente.objects.create(
+                servicio=self.servicio,
+                cliente_nombre=f'Cliente {i}',
+                cliente_email='cliente@example.com',
+                mensaje='Mensaje',
+            )
+            for i in range(3)
+        ]
+        lote = [{'id': s.id, 'estatus': 'cerrado'} for s in solicitudes]
+        response = self.client.patch(self.url, lote, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(SolicitudCliente.objects.filter(estatus='cerrado').count(), 3)
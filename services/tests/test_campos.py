@@ -0,0 +1,85 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from services.models import Servicio, SolicitudCliente
+
+
+class CamposSeleccionadosTest(TestCase):
+    """Tests para ?fields= / ?omit= y el recorte de columnas del SQL"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.servicios = [
+            Servicio.objects.create(
+                nombre=f'Servicio {i}', categoria='Web', descripcion='Descripción larga ' * 50,
+                precio_mxn=1000 * i, responsable_email='web@example.com',
+            )
+            for i in range(25)
+        ]
+        self.solicitud = SolicitudCliente.objects.create(
+            servicio=self.servicios[0], cliente_nombre='Juan Pérez', cliente_email='juan@example.com',
+            mensaje='Quiero una cotización',
+        )
+
+    def leer(self, url, params):
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return response, ' '.join(c['sql'] for c in consultas.captured_queries)
+
+    def test_fields_en_el_listado(self):
+        """Test: ?fields= devuelve esos campos (e id) y no lee las demás columnas"""
+        response, sql = self.leer(reverse('servicio-list'), {'fields': 'nombre,categoria,precio_mxn'})
+        for fila in response.data['results']:
+            self.assertEqual(set(fila), {'id', 'nombre', 'categoria', 'precio_mxn'})
+        self.assertNotIn('"descripcion"', sql)
+
+    def test_omit_en_el_detalle(self):
+        """Test: ?omit= quita esos campos del detalle y de la consulta"""
+        for url in (
+            reverse('servicio-detail', kwargs={'pk': self.servicios[0].pk}),
+            reverse('solicitud-detail', kwargs={'pk': self.solicitud.pk}),
+        ):
+            with self.subTest(url=url):
+                response, sql = self.leer(url, {'omit': 'descripcion' if 'servicios' in url else 'mensaje'})
+                self.assertNotIn('descripcion', response.data)
+                self.assertNotIn('mensaje', response.data)
+                self.assertNotIn('"descripcion"', sql)
+                self.assertNotIn('"mensaje"', sql)
+
+    def test_solicitudes_con_servicio(self):
+        """Test: En solicitudes, servicio_nombre sigue saliendo del mismo JOIN"""
+        response, _ = self.leer(reverse('solicitud-list'), {'fields': 'estatus,servicio_nombre'})
+        self.assertEqual(response.data['results'], [
+            {'id': self.solicitud.pk, 'servicio_nombre': 'Servicio 0', 'estatus': 'nuevo'}
+        ])
+
+    def test_cursor_con_campos(self):
+        """Test: La paginación por cursor funciona aunque la ordenación no se pida"""
+        response, _ = self.leer(reverse('servicio-list'), {'fields': 'precio_mxn', 'paginacion': 'cursor'})
+        siguiente = self.client.get(response.data['next'])
+        self.assertEqual(siguiente.status_code, status.HTTP_200_OK)
+        ids = [fila['id'] for fila in response.data['results'] + siguiente.data['results']]
+        self.assertEqual(sorted(ids), sorted(s.pk for s in self.servicios))
+
+    def test_campo_desconocido(self):
+        """Test: Un campo desconocido en ?fields= u ?omit= → 400"""
+        for params in ({'fields': 'nombre,costo'}, {'omit': 'costo'}):
+            with self.subTest(params=params):
+                response = self.client.get(reverse('servicio-list'), params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_escritura_con_campos(self):
+        """Test: Las escrituras validan todo y solo recortan la respuesta"""
+        response = self.client.post(f'{reverse("solicitud-list")}?fields=estatus', {
+            'servicio': self.servicios[0].pk,
+            'cliente_nombre': 'Ana',
+            'cliente_email': 'ana@example.com',
+            'mensaje': 'Hola',
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(set(response.data), {'id', 'estatus'})
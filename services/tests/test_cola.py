@@ -0,0 +1,149 @@
+import datetime
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from services import analitica, cola
+from services.models import (
+    ContadorSolicitudes,
+    MarcaResumen,
+    Servicio,
+    SolicitudCliente,
+    SolicitudPendiente,
+)
+from services.tests.utils import QueryBudgetMixin
+
+
+@override_settings(SOLICITUDES_EN_COLA=True)
+class ColaSolicitudesTest(QueryBudgetMixin, TestCase):
+    """Tests para la cola de escritura diferida de solicitudes"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.servicio = Servicio.objects.create(
+            nombre='Desarrollo Web',
+            categoria='Web',
+            descripcion='Desarrollo de aplicaciones web',
+            precio_mxn=50000.00,
+            responsable_email='web@example.com',
+        )
+        self.datos = {
+            'servicio': self.servicio.id,
+            'cliente_nombre': 'Juan Pérez',
+            'cliente_email': 'juan@example.com',
+            'mensaje': 'Me interesa el servicio',
+        }
+
+    def test_post_encola_y_responde_202(self):
+        """Test: Con la cola activa, POST valida, encola y responde 202 con seguimiento"""
+        response = self.client.post(reverse('solicitud-list'), self.datos, format='json')
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(response.data['estatus'], 'pendiente')
+        self.assertIn(str(response.data['seguimiento']), response['Location'])
+        self.assertFalse(SolicitudCliente.objects.exists())
+
+        response = self.client.post(
+            reverse('servicio-solicitudes', kwargs={'pk': self.servicio.id}),
+            {k: v for k, v in self.datos.items() if k != 'servicio'}, format='json',
+        )
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(SolicitudPendiente.objects.count(), 2)
+
+    def test_datos_invalidos_no_se_encolan(self):
+        """Test: La validación ocurre antes de encolar"""
+        response = self.client.post(
+            reverse('solicitud-list'), {**self.datos, 'cliente_email': 'no-es-email'}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertFalse(SolicitudPendiente.objects.exists())
+
+    def test_procesar_lote(self):
+        """Test: Un lote se inserta con un número fijo de consultas y ajusta los contadores"""
+        seguimientos = [
+            self.client.post(reverse('solicitud-list'), self.datos, format='json').data['seguimiento']
+            for _ in range(20)
+        ]
+        with self.assertMaxQueries(8):
+            lote = cola.procesar_lote()
+        self.assertEqual((lote.procesadas, lote.descartadas), (20, 0))
+        self.assertEqual(SolicitudCliente.objects.count(), 20)
+        self.assertEqual(ContadorSolicitudes.objects.get(servicio=self.servicio).nuevo, 20)
+
+        response = self.client.get(
+            reverse('solicitud-pendiente-detail', kwargs={'seguimiento': seguimientos[0]})
+        )
+        self.assertEqual(response.data['estatus'], 'procesada')
+        solicitud = SolicitudCliente.objects.get(pk=response.data['solicitud'])
+        self.assertEqual(solicitud.cliente_email, 'juan@example.com')
+        self.assertEqual(cola.procesar_lote().tamano, 0)
+
+    def test_fecha_de_llegada(self):
+        """Test: La solicitud conserva la fecha en que llegó y su día resumido se reabre"""
+        self.client.post(reverse('solicitud-list'), self.datos, format='json')
+        recibida = timezone.now() - datetime.timedelta(days=3)
+        SolicitudPendiente.objects.update(recibida=recibida)
+        MarcaResumen.objects.create(nombre=analitica.MARCA, procesado_hasta=timezone.localdate())
+
+        cola.procesar_lote()
+        self.assertEqual(SolicitudCliente.objects.get().fecha_creacion, recibida)
+        self.assertEqual(
+            MarcaResumen.objects.get(nombre=analitica.MARCA).procesado_hasta,
+            timezone.localdate(recibida) - datetime.timedelta(days=1),
+        )
+        self.assertEqual(analitica.consultar(7)['total'], 1)
+
+    def test_purga_en_modo_continuo(self):
+        """Test: Con --continuo también se purgan las pendientes procesadas"""
+        self.client.post(reverse('solicitud-list'), self.datos, format='json')
+        salida = StringIO()
+        with mock.patch('services.management.commands.procesar_pendientes.time.sleep',
+                        side_effect=KeyboardInterrupt):
+            with self.assertRaises(KeyboardInterrupt):
+                call_command(
+                    'procesar_pendientes', '--continuo', '--purgar-dias', '0', '--purgar-cada', '0',
+                    stdout=salida,
+                )
+        self.assertIn('Purgadas: 1', salida.getvalue())
+        self.assertFalse(SolicitudPendiente.objects.exists())
+
+    def test_servicio_eliminado(self):
+        """Test: Si el servicio ya no existe, la solicitud se descarta con su motivo"""
+        seguimiento = self.client.post(reverse('solicitud-list'), self.datos, format='json').data['seguimiento']
+        self.servicio.delete()
+        lote = cola.procesar_lote()
+        self.assertEqual((lote.procesadas, lote.descartadas), (0, 1))
+        pendiente = SolicitudPendiente.objects.get(seguimiento=seguimiento)
+        self.assertEqual(pendiente.error, 'El servicio ya no existe.')
+
+    def test_estado_y_comando(self):
+        """Test: Profundidad de la cola, retraso y tamaño del último lote"""
+        for _ in range(5):
+            self.client.post(reverse('solicitud-list'), self.datos, format='json')
+        estado = self.client.get(reverse('solicitud-pendiente-estado')).data
+        self.assertTrue(estado['activa'])
+        self.assertEqual(estado['en_cola'], 5)
+        self.assertGreaterEqual(estado['retraso_segundos'], 0)
+        self.assertIsNone(estado['ultimo_lote']['procesado'])
+
+        salida = StringIO()
+        call_command('procesar_pendientes', '--lote', '2', '--purgar-dias', '30', stdout=salida)
+        self.assertEqual(salida.getvalue().count('lote='), 3)
+        self.assertIn('5 solicitudes procesadas', salida.getvalue())
+
+        estado = self.client.get(reverse('solicitud-pendiente-estado')).data
+        self.assertEqual(estado['en_cola'], 0)
+        self.assertEqual(estado['retraso_segundos'], 0)
+        self.assertEqual(estado['ultimo_lote']['tamano'], 1)
+
+    @override_settings(SOLICITUDES_EN_COLA=False)
+    def test_desactivada(self):
+        """Test: Sin la cola, POST sigue creando la solicitud (201)"""
+        response = self.client.post(reverse('solicitud-list'), self.datos, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertFalse(SolicitudPendiente.objects.exists())
@@ -0,0 +1,112 @@
+import gzip
+import json
+import unittest
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core import compresion
+from core.compresion import negociar
+from services.models import Servicio, SolicitudCliente
+
+
+class CompresionTest(TestCase):
+    """Tests para la compresión negociada de las respuestas"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        for i in range(30):
+            servicio = Servicio.objects.create(
+                nombre=f'Servicio {i}', categoria='Web', descripcion='Aplicaciones web a la medida. ' * 20,
+                precio_mxn=1000 * i, responsable_email='web@example.com',
+            )
+            SolicitudCliente.objects.create(
+                servicio=servicio, cliente_nombre='Juan Pérez', cliente_email='juan@example.com',
+                mensaje='Quiero una cotización',
+            )
+        self.url = reverse('servicio-list')
+
+    def test_negociar(self):
+        """Test: Se elige la codificación de mayor q; en empate, brotli"""
+        br = 'br' if compresion.brotli is not None else 'gzip'
+        casos = {
+            'gzip, deflate, br': br,
+            'br;q=0.5, gzip': 'gzip',
+            'gzip;q=0, identity': None,
+            '*': br,
+            'deflate': None,
+            '': None,
+        }
+        for encabezado, esperado in casos.items():
+            with self.subTest(encabezado=encabezado):
+                self.assertEqual(negociar(encabezado), esperado)
+
+    def test_gzip(self):
+        """Test: Con gzip, el cuerpo descomprimido es el JSON original"""
+        original = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response['Vary'])
+        self.assertEqual(int(response['Content-Length']), len(response.content))
+        self.assertLess(len(response.content), len(original.content) / 3)
+        self.assertEqual(gzip.decompress(response.content), original.content)
+        self.assertEqual(response['ETag'], f'W/{original["ETag"]}')
+
+    @unittest.skipIf(compresion.brotli is None, 'brotli no está instalado')
+    def test_brotli(self):
+        """Test: Con br se comprime con brotli"""
+        original = self.client.get(self.url)
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip, br')
+        self.assertEqual(response['Content-Encoding'], 'br')
+        self.assertEqual(compresion.brotli.decompress(response.content), original.content)
+
+    def test_etag_debil_en_if_none_match(self):
+        """Test: El ETag débil de la respuesta comprimida sirve para el 304"""
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_no_comprime(self):
+        """Test: No se comprimen respuestas pequeñas, HTML (con token CSRF) ni bajo el umbral"""
+        response = self.client.get('/api/health', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        response = self.client.get('/admin/login/', HTTP_ACCEPT_ENCODING='gzip')
+        self.assertTrue(response['Content-Type'].startswith('text/html'))
+        self.assertGreater(len(response.content), 1024)
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+        with override_settings(COMPRESION_MINIMO_BYTES=10 ** 6):
+            response = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertFalse(response.has_header('Content-Encoding'))
+
+    def test_reutiliza_lo_comprimido(self):
+        """Test: Una lectura repetida (con ETag) no se vuelve a comprimir"""
+        with mock.patch('core.compresion.comprimir', wraps=compresion.comprimir) as comprimir:
+            primera = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+            segunda = self.client.get(self.url, HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(comprimir.call_count, 1)
+            self.assertEqual(primera.content, segunda.content)
+
+            # Con otro contenido se comprime de nuevo
+            self.client.get(self.url, {'categoria': 'Web', 'ordenar_por': 'precio_asc'}, HTTP_ACCEPT_ENCODING='gzip')
+            self.assertEqual(comprimir.call_count, 2)
+
+    def test_exportacion_en_flujo(self):
+        """Test: La exportación se comprime bloque por bloque"""
+        url = reverse('solicitud-exportar')
+        original = b''.join(self.client.get(url).streaming_content)
+        response = self.client.get(url, HTTP_ACCEPT_ENCODING='gzip')
+        self.assertEqual(response['Content-Encoding'], 'gzip')
+        self.assertFalse(response.has_header('Content-Length'))
+        contenido = gzip.decompress(b''.join(response.streaming_content))
+        self.assertEqual(contenido, original)
+        self.assertEqual(len(contenido.decode('utf-8').splitlines()), 30)
+        json.loads(contenido.decode('utf-8').splitlines()[0])
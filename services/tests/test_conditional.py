@@ -0,0 +1,208 @@
+from unittest import mock
+
+from django.db import connection
+from django.test import TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils.http import http_date
+from rest_framework.test import APIClient
+from rest_framework import status
+from services.models import Servicio
+from services.serializers import ServicioSerializer
+
+
+class ConditionalGetTest(TestCase):
+    """Tests para ETag / Last-Modified / 304 en las lecturas del catálogo"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.servicio = Servicio.objects.create(
+            nombre='Desarrollo Web',
+            categoria='Web',
+            descripcion='Desarrollo de aplicaciones web',
+            precio_mxn=50000.00,
+            responsable_email='web@example.com',
+        )
+        Servicio.objects.create(
+            nombre='Cloud Service',
+            categoria='Cloud',
+            descripcion='Servicios en la nube',
+            precio_mxn=30000.00,
+            responsable_email='cloud@example.com',
+        )
+        self.url_lista = reverse('servicio-list')
+        self.url_detalle = reverse('servicio-detail', kwargs={'pk': self.servicio.id})
+
+    def test_lista_incluye_validadores(self):
+        """Test: El listado incluye ETag y Last-Modified"""
+        response = self.client.get(self.url_lista)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.has_header('ETag'))
+        self.assertTrue(response.has_header('Last-Modified'))
+
+    def test_lista_304_sin_serializar(self):
+        """Test: If-None-Match con el ETag vigente → 304 sin serializar"""
+        etag = self.client.get(self.url_lista)['ETag']
+        with mock.patch.object(ServicioSerializer, 'to_representation') as to_representation:
+            with self.assertNumQueries(1):
+                response = self.client.get(self.url_lista, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertEqual(response['ETag'], etag)
+        to_representation.assert_not_called()
+
+    def test_lista_etag_cambia_con_los_datos(self):
+        """Test: Al modificar, crear o desactivar un servicio cambia el ETag"""
+        etag = self.client.get(self.url_lista)['ETag']
+        self.servicio.precio_mxn = 55000
+        self.servicio.save()
+        response = self.client.get(self.url_lista, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_lista_etag_depende_de_los_filtros(self):
+        """Test: Cada combinación de filtros tiene su propio ETag"""
+        etag = self.client.get(self.url_lista)['ETag']
+        response = self.client.get(self.url_lista, {'categoria': 'Web'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_lista_etag_cambia_cuando_una_fila_sale_del_filtro(self):
+        """Test: Si un servicio deja de cumplir el filtro, el ETag cambia"""
+        params = {'activo': 'true'}
+        etag = self.client.get(self.url_lista, params)['ETag']
+        otro = Servicio.objects.exclude(pk=self.servicio.pk).get()
+        Servicio.objects.filter(pk=otro.pk).update(activo=False)
+        response = self.client.get(self.url_lista, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_lista_por_cursor_sin_count(self):
+        """Test: Por cursor, el ETag sale de la página: 304 sin COUNT y cambia si cambia una fila"""
+        params = {'paginacion': 'cursor'}
+        with CaptureQueriesContext(connection) as consultas:
+            etag = self.client.get(self.url_lista, params)['ETag']
+        self.assertFalse(any('COUNT(' in c['sql'] for c in consultas.captured_queries))
+        response = self.client.get(self.url_lista, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        self.servicio.precio_mxn = 55000
+        self.servicio.save()
+        response = self.client.get(self.url_lista, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+        # Una fila que sale de la página, aunque no cambie ninguna versión
+        etag = response['ETag']
+        Servicio.objects.exclude(pk=self.servicio.pk).delete()
+        response = self.client.get(self.url_lista, params, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_detalle_304(self):
+        """Test: El detalle responde 304 con If-None-Match o If-Modified-Since"""
+        response = self.client.get(self.url_detalle)
+        etag = response['ETag']
+        self.assertEqual(
+            response['Last-Modified'], http_date(self.servicio.ultima_actualizacion.timestamp())
+        )
+        response = self.client.get(self.url_detalle, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        response = self.client.get(
+            self.url_detalle, HTTP_IF_MODIFIED_SINCE=response['Last-Modified']
+        )
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_detalle_etag_cambia_al_actualizar(self):
+        """Test: Tras un PATCH el ETag anterior ya no es válido"""
+        etag = self.client.get(self.url_detalle)['ETag']
+        self.client.patch(self.url_detalle, {'nombre': 'Nuevo nombre'}, format='json')
+        response = self.client.get(self.url_detalle, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['nombre'], 'Nuevo nombre')
+
+
+class ConditionalUpdateTest(TestCase):
+    """Tests para If-Match (412/428) y la escritura de solo las columnas cambiadas"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.servicio = Servicio.objects.create(
+            nombre='Desarrollo Web',
+            categoria='Web',
+            descripcion='Desarrollo de aplicaciones web' * 100,
+            precio_mxn=50000.00,
+            responsable_email='web@example.com',
+        )
+        self.url = reverse('servicio-detail', kwargs={'pk': self.servicio.id})
+
+    def etag(self):
+        return self.client.get(self.url)['ETag']
+
+    def test_if_match_vigente(self):
+        """Test: PATCH con el ETag vigente → 200 con el ETag de la versión nueva"""
+        etag = self.etag()
+        response = self.client.patch(self.url, {'nombre': 'Web'}, format='json', HTTP_IF_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+        self.assertEqual(response['ETag'], self.etag())
+
+    def test_if_match_desactualizado(self):
+        """Test: Dos ediciones con el mismo ETag: la segunda → 412 y no escribe"""
+        etag = self.etag()
+        self.client.patch(self.url, {'nombre': 'Primera'}, format='json', HTTP_IF_MATCH=etag)
+        response = self.client.patch(
+            self.url, {'nombre': 'Segunda', 'precio_mxn': 'no es número'}, format='json', HTTP_IF_MATCH=etag
+        )
+        self.assertEqual(response.status_code, status.HTTP_412_PRECONDITION_FAILED)
+        self.assertEqual(response.data['message'], 'Precondición fallida')
+        self.servicio.refresh_from_db()
+        self.assertEqual(self.servicio.nombre, 'Primera')
+
+    def test_if_match_debil_y_comodin(self):
+        """Test: If-Match acepta la versión débil del ETag (compresión) y *"""
+        for valor in (f'"otro", W/{self.etag()}', '*'):
+            with self.subTest(valor=valor):
+                response = self.client.put(
+                    self.url, ServicioSerializer(Servicio.objects.get()).data, format='json', HTTP_IF_MATCH=valor,
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(CORS_ALLOWED_ORIGINS=['https://sitio.example'], CORS_ALLOW_ALL_ORIGINS=False)
+    def test_if_match_desde_el_frontend(self):
+        """Test: CORS deja enviar If-Match y leer ETag y Retry-After desde otro origen"""
+        origen = {'HTTP_ORIGIN': 'https://sitio.example'}
+        response = self.client.options(
+            self.url, HTTP_ACCESS_CONTROL_REQUEST_METHOD='PATCH',
+            HTTP_ACCESS_CONTROL_REQUEST_HEADERS='content-type, if-match', **origen,
+        )
+        self.assertIn('if-match', response['Access-Control-Allow-Headers'])
+        expuestos = self.client.get(self.url, **origen)['Access-Control-Expose-Headers']
+        self.assertIn('etag', expuestos)
+        self.assertIn('retry-after', expuestos)
+
+    def test_exigir_if_match(self):
+        """Test: Con EXIGIR_IF_MATCH, un PATCH sin If-Match → 428"""
+        with self.settings(EXIGIR_IF_MATCH=True):
+            response = self.client.patch(self.url, {'nombre': 'Web'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_428_PRECONDITION_REQUIRED)
+        response = self.client.patch(self.url, {'nombre': 'Web'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_solo_escribe_lo_que_cambia(self):
+        """Test: El UPDATE solo lleva las columnas cambiadas; sin cambios no escribe"""
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.patch(self.url, {'nombre': 'Web', 'categoria': 'Web'}, format='json')
+        updates = [c['sql'] for c in consultas.captured_queries if c['sql'].startswith('UPDATE')]
+        self.assertEqual(len(updates), 1)
+        self.assertIn('"nombre"', updates[0])
+        self.assertIn('"ultima_actualizacion"', updates[0])
+        self.assertNotIn('"descripcion"', updates[0])
+        self.assertNotIn('"categoria"', updates[0])
+
+        etag = self.etag()
+        with CaptureQueriesContext(connection) as consultas:
+            response = self.client.put(
+                self.url, ServicioSerializer(Servicio.objects.get()).data, format='json', HTTP_IF_MATCH=etag,
+            )
+        self.assertFalse([c for c in consultas.captured_queries if c['sql'].startswith('UPDATE')])
+        self.assertEqual(response['ETag'], etag)
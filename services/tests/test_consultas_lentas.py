@@ -0,0 +1,151 @@
+import json
+import re
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.management import call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from core.consultas_lentas import ConsultasLentasMiddleware, huella, leer, resumir
+from services.filters import ServicioFilter
+from services.models import Servicio
+
+
+class ConsultasLentasTest(TestCase):
+    """Tests para el registro de consultas lentas y su resumen"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(directorio.cleanup)
+        self.archivo = Path(directorio.name) / 'consultas_lentas.log'
+        configuracion = override_settings(
+            CONSULTAS_LENTAS_MS=0, CONSULTAS_LENTAS_MUESTREO=1, CONSULTAS_LENTAS_ARCHIVO=str(self.archivo),
+        )
+        configuracion.enable()
+        self.addCleanup(configuracion.disable)
+        self.client = APIClient()
+        Servicio.objects.create(
+            nombre='Migración a la nube', categoria='Cloud', descripcion='Migración de servidores',
+            precio_mxn=2000, responsable_email='cloud@example.com',
+        )
+
+    def entradas(self):
+        return list(leer(self.archivo))
+
+    def test_registra_con_plan(self):
+        """Test: Se registran ruta, parámetros normalizados, huella y EXPLAIN"""
+        self.client.get(reverse('servicio-list'), {'search': 'nube', 'ordenar_por': 'precio_desc', 'page': '1'})
+        entradas = [e for e in self.entradas() if e['ruta'] == 'servicio-list']
+        self.assertTrue(entradas)
+        entrada = entradas[-1]
+        self.assertEqual(entrada['metodo'], 'GET')
+        self.assertEqual(entrada['parametros'], {'ordenar_por': 'precio_desc', 'search': 'nube'})
+        canonica = ServicioFilter(
+            {'search': 'nube', 'ordenar_por': 'precio_desc'}, queryset=Servicio.objects.all()
+        ).huella()
+        self.assertEqual(entrada['consulta'], canonica.clave)
+        self.assertIn('services_servicio', entrada['huella'])
+        self.assertTrue(entrada['plan'])
+        self.assertFalse(any('EXPLAIN falló' in linea for linea in entrada['plan']))
+
+    def test_huella_canonica(self):
+        """Test: Los parámetros son los de la huella canónica, no los crudos de la petición"""
+        self.client.get(reverse('servicio-list'), {'search': '  nube ', 'activo': '1', 'desconocido': 'x'})
+        entrada = [e for e in self.entradas() if e['ruta'] == 'servicio-list'][-1]
+        self.assertEqual(entrada['parametros'], {'activo': 'true', 'search': 'nube'})
+
+    def test_explain_fuera_de_las_metricas(self):
+        """Test: El EXPLAIN y su SAVEPOINT no cuentan como consultas de la petición"""
+        def consultas_medidas():
+            response = self.client.get(reverse('servicio-list'), {'search': 'nube'})
+            return int(re.search(r'desc="(\d+) consultas"', response['Server-Timing'])[1])
+
+        registrando = consultas_medidas()
+        self.assertTrue(self.entradas())
+        with self.settings(CONSULTAS_LENTAS_MS=10_000):
+            self.assertEqual(consultas_medidas(), registrando)
+
+    def test_sin_valores_de_la_consulta(self):
+        """Test: No se registran los valores del SQL (datos del cliente)"""
+        servicio = Servicio.objects.get()
+        self.client.post(reverse('solicitud-list'), {
+            'servicio': servicio.id, 'cliente_nombre': 'Ana Privada',
+            'cliente_email': 'ana.privada@example.com', 'mensaje': 'Mensaje confidencial',
+        }, format='json')
+        self.assertTrue(self.entradas())
+        self.assertNotIn('params', self.entradas()[0])
+        contenido = self.archivo.read_text(encoding='utf-8')
+        for valor in ('Ana Privada', 'ana.privada@example.com', 'confidencial'):
+            self.assertNotIn(valor, contenido)
+
+    def test_explain_al_cerrar_la_respuesta(self):
+        """Test: El EXPLAIN y la escritura se hacen al cerrar la respuesta, no durante la petición"""
+        def vista(request):
+            list(Servicio.objects.all())
+            return HttpResponse()
+
+        response = ConsultasLentasMiddleware(vista)(RequestFactory().get('/'))
+        self.assertEqual(self.entradas(), [])
+        with CaptureQueriesContext(connection) as consultas:
+            response.close()
+        self.assertTrue(any('EXPLAIN' in c['sql'] for c in consultas.captured_queries))
+        self.assertTrue(self.entradas()[0]['plan'])
+
+    def test_umbral_y_muestreo(self):
+        """Test: No se registra lo que está bajo el umbral ni fuera de la muestra"""
+        with self.settings(CONSULTAS_LENTAS_MS=10_000):
+            self.client.get(reverse('servicio-list'))
+        with self.settings(CONSULTAS_LENTAS_MUESTREO=0):
+            self.client.get(reverse('servicio-list'))
+        self.assertEqual(self.entradas(), [])
+
+    def test_fuera_de_peticion(self):
+        """Test: Las consultas fuera de una petición no se registran"""
+        self.client.get(reverse('health-check'))
+        list(Servicio.objects.all())
+        self.assertEqual(self.entradas(), [])
+
+    def test_huella(self):
+        """Test: La huella ignora listas IN, literales y espacios"""
+        self.assertEqual(
+            huella('SELECT *  FROM t WHERE id IN (%s, %s, %s) LIMIT 21'),
+            huella('SELECT * FROM t WHERE id IN (%s) LIMIT 50'),
+        )
+
+    def test_resumen_y_comando(self):
+        """Test: El resumen agrupa por ruta y huella y ordena por tiempo total"""
+        def entrada(ruta, sql, ms, **parametros):
+            return {
+                'ruta': ruta, 'metodo': 'GET', 'huella': sql, 'duracion_ms': ms,
+                'parametros': parametros, 'plan': [f'SCAN {ruta}'],
+            }
+        lineas = [
+            entrada('servicio-list', 'A', 300, search='nube'),
+            entrada('servicio-list', 'A', 500, search='nube'),
+            entrada('servicio-list', 'A', 250, search='web'),
+            entrada('solicitud-list', 'B', 900),
+        ]
+        self.archivo.write_text(
+            '\n'.join(json.dumps(linea) for linea in lineas) + '\nbasura\n', encoding='utf-8'
+        )
+
+        resumen = resumir(self.entradas())
+        self.assertEqual([(g['ruta'], g['veces'], g['total_ms']) for g in resumen],
+                         [('servicio-list', 3, 1050), ('solicitud-list', 1, 900)])
+        self.assertEqual(resumen[0]['max_ms'], 500)
+        self.assertEqual(resumen[0]['parametros'], {'search': 'nube'})
+        self.assertEqual(resumir(self.entradas(), 'max')[0]['ruta'], 'solicitud-list')
+
+        salida = StringIO()
+        call_command('consultas_lentas', '--archivo', str(self.archivo), '--top', '1', stdout=salida)
+        self.assertIn('1. servicio-list GET: 3 veces', salida.getvalue())
+        self.assertIn('parámetros: search=nube', salida.getvalue())
+        self.assertIn('SCAN servicio-list', salida.getvalue())
+        self.assertNotIn('solicitud-list', salida.getvalue())
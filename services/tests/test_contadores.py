@@ -0,0 +1,191 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.db.models import Count
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from services.contadores import ESTATUS
+from services.models import ContadorSolicitudes, Servicio, SolicitudCliente
+
+
+def solicitud_valida(servicio, **kwargs):
+    datos = {
+        'servicio': servicio.id,
+        'cliente_nombre': 'Juan Pérez',
+        'cliente_email': 'juan@example.com',
+        'mensaje': 'Me interesa el servicio',
+    }
+    datos.update(kwargs)
+    return datos
+
+
+class ContadorSolicitudesTest(TestCase):
+    """Tests para los contadores de solicitudes por servicio y estatus"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.servicios = [
+            Servicio.objects.create(
+                nombre=f'Servicio {i}',
+                categoria='Web' if i % 2 else 'Cloud',
+                descripcion='Desarrollo de aplicaciones web',
+                precio_mxn=1000,
+                responsable_email='web@example.com',
+            )
+            for i in range(3)
+        ]
+
+    def contadores(self, servicio):
+        contador = ContadorSolicitudes.objects.get(servicio=servicio)
+        return {estatus: getattr(contador, estatus) for estatus in ESTATUS}
+
+    def assertContadoresCorrectos(self):
+        """Los contadores coinciden con un COUNT ... GROUP BY sobre las solicitudes"""
+        for servicio in self.servicios:
+            esperado = dict.fromkeys(ESTATUS, 0)
+            filas = (
+                SolicitudCliente.objects.filter(servicio=servicio)
+                .values_list('estatus').annotate(total=Count('id')).order_by()
+            )
+            esperado.update(filas)
+            self.assertEqual(self.contadores(servicio), esperado, servicio.nombre)
+
+    def test_alta_cambio_de_estatus_y_baja(self):
+        """Test: Crear, cambiar de estatus, de servicio y eliminar actualizan los contadores"""
+        servicio, otro = self.servicios[:2]
+        response = self.client.post(reverse('solicitud-list'), solicitud_valida(servicio), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        url = reverse('solicitud-detail', kwargs={'pk': response.data['id']})
+        self.assertEqual(self.contadores(servicio), {'nuevo': 1, 'en_proceso': 0, 'cerrado': 0})
+
+        self.client.patch(url, {'estatus': 'en_proceso'}, format='json')
+        self.assertEqual(self.contadores(servicio), {'nuevo': 0, 'en_proceso': 1, 'cerrado': 0})
+
+        self.client.patch(url, {'servicio': otro.id, 'estatus': 'cerrado'}, format='json')
+        self.assertEqual(self.contadores(servicio), {'nuevo': 0, 'en_proceso': 0, 'cerrado': 0})
+        self.assertEqual(self.contadores(otro), {'nuevo': 0, 'en_proceso': 0, 'cerrado': 1})
+
+        # Guardar sin cambiar el estatus no mueve nada
+        self.client.patch(url, {'mensaje': 'Otro mensaje'}, format='json')
+        self.assertEqual(self.contadores(otro), {'nuevo': 0, 'en_proceso': 0, 'cerrado': 1})
+
+        self.client.delete(url)
+        self.assertContadoresCorrectos()
+
+    def test_lotes(self):
+        """Test: Crear y actualizar en lote actualiza los contadores"""
+        lote = [solicitud_valida(servicio) for servicio in self.servicios for _ in range(3)]
+        response = self.client.post(reverse('solicitud-bulk'), lote, format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertContadoresCorrectos()
+
+        ids = [resultado['id'] for resultado in response.data['resultados']]
+        cambios = [{'id': pk, 'estatus': 'cerrado'} for pk in ids[::2]]
+        cambios.append({'id': ids[1], 'servicio': self.servicios[2].id})
+        response = self.client.patch(reverse('solicitud-bulk'), cambios, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertContadoresCorrectos()
+
+    def test_servicio_nuevo_y_eliminado(self):
+        """Test: Los servicios nuevos nacen con contadores en cero y se eliminan en cascada"""
+        response = self.client.post(reverse('servicio-bulk'), [{
+            'nombre': 'En lote', 'categoria': 'Data', 'descripcion': 'Análisis de datos',
+            'precio_mxn': '100.00', 'responsable_email': 'data@example.com',
+        }], format='json')
+        nuevo = Servicio.objects.get(pk=response.data['resultados'][0]['id'])
+        self.assertEqual(self.contadores(nuevo), {'nuevo': 0, 'en_proceso': 0, 'cerrado': 0})
+
+        servicio = self.servicios[0]
+        SolicitudCliente.objects.create(**{**solicitud_valida(servicio), 'servicio': servicio})
+        servicio.delete()
+        self.assertFalse(ContadorSolicitudes.objects.filter(servicio_id=servicio.id).exists())
+
+    def test_reconciliar(self):
+        """Test: reconciliar_contadores corrige lo escrito sin pasar por las señales"""
+        servicio = self.servicios[0]
+        for _ in range(3):
+            SolicitudCliente.objects.create(**{**solicitud_valida(servicio), 'servicio': servicio})
+        SolicitudCliente.objects.filter(servicio=servicio).update(estatus='cerrado')
+        otro = self.servicios[1]
+        SolicitudCliente.objects.create(**{**solicitud_valida(otro), 'servicio': otro})
+        ContadorSolicitudes.objects.filter(servicio=otro).delete()
+
+        salida = StringIO()
+        call_command('reconciliar_contadores', stdout=salida)
+        self.assertIn('2 corregidos', salida.getvalue())
+        self.assertContadoresCorrectos()
+
+        salida = StringIO()
+        call_command('reconciliar_contadores', '--servicio', str(servicio.id), stdout=salida)
+        self.assertIn('0 corregidos', salida.getvalue())
+
+    def test_contador_faltante_se_reconstruye(self):
+        """Test: Si falta el contador de un servicio, se reconstruye al crear una solicitud"""
+        servicio = self.servicios[0]
+        SolicitudCliente.objects.create(**{**solicitud_valida(servicio), 'servicio': servicio})
+        ContadorSolicitudes.objects.filter(servicio=servicio).delete()
+        SolicitudCliente.objects.create(**{**solicitud_valida(servicio), 'servicio': servicio})
+        self.assertEqual(self.contadores(servicio), {'nuevo': 2, 'en_proceso': 0, 'cerrado': 0})
+
+    def test_endpoint_estadisticas(self):
+        """Test: /api/servicios/estadisticas/ con filtros, ETag y 304"""
+        servicio = self.servicios[1]
+        SolicitudCliente.objects.create(**{**solicitud_valida(servicio), 'servicio': servicio})
+
+        url = reverse('servicio-estadisticas')
+        response = self.client.get(url, {'categoria': 'Web'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 1)
+        fila = response.data['results'][0]
+        self.assertEqual(fila['servicio'], servicio.id)
+        self.assertEqual(fila['servicio_nombre'], servicio.nombre)
+        self.assertEqual((fila['nuevo'], fila['en_proceso'], fila['cerrado']), (1, 0, 0))
+
+        etag = response['ETag']
+        response = self.client.get(url, {'categoria': 'Web'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+        SolicitudCliente.objects.create(**{**solicitud_valida(servicio), 'servicio': servicio})
+        response = self.client.get(url, {'categoria': 'Web'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['results'][0]['nuevo'], 2)
+
+    def test_estadisticas_con_busqueda(self):
+        """Test: /api/servicios/estadisticas/ acepta ?search=, también por cursor"""
+        servicio = self.servicios[2]
+        servicio.nombre = 'Migración a la nube'
+        servicio.save()
+
+        url = reverse('servicio-estadisticas')
+        for params in ({'search': 'nube'}, {'search': 'nube', 'paginacion': 'cursor'}):
+            with self.subTest(params=params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual([fila['servicio'] for fila in response.data['results']], [servicio.id])
+
+    def test_contadores_opcionales_en_servicios(self):
+        """Test: ?contadores=true agrega los contadores al listado y al detalle"""
+        servicio = self.servicios[0]
+        SolicitudCliente.objects.create(**{**solicitud_valida(servicio), 'servicio': servicio})
+        detalle = reverse('servicio-detail', kwargs={'pk': servicio.id})
+
+        response = self.client.get(detalle)
+        self.assertNotIn('solicitudes_nuevo', response.data)
+
+        response = self.client.get(detalle, {'contadores': 'true'})
+        self.assertEqual(response.data['solicitudes_nuevo'], 1)
+        self.assertEqual(response.data['solicitudes_cerrado'], 0)
+
+        response = self.client.get(reverse('servicio-list'), {'contadores': 'true'})
+        por_id = {fila['id']: fila for fila in response.data['results']}
+        self.assertEqual(por_id[servicio.id]['solicitudes_nuevo'], 1)
+
+        # Un cambio en los contadores invalida el ETag del detalle con contadores
+        etag = self.client.get(detalle, {'contadores': 'true'})['ETag']
+        SolicitudCliente.objects.filter(servicio=servicio).first().delete()
+        response = self.client.get(detalle, {'contadores': 'true'}, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['solicitudes_nuevo'], 0)
@@ -0,0 +1,98 @@
+import csv
+import io
+import json
+from datetime import datetime, timedelta
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from services.models import Servicio, SolicitudCliente
+
+
+class ExportarSolicitudesTest(TestCase):
+    """Tests para la exportación en streaming de solicitudes"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.url = reverse('solicitud-exportar')
+        self.servicio = Servicio.objects.create(
+            nombre='Servicio Test',
+            categoria='Web',
+            descripcion='Descripción test',
+            precio_mxn=10000.00,
+            responsable_email='test@example.com',
+        )
+        self.otro = Servicio.objects.create(
+            nombre='Otro Servicio',
+            categoria='Cloud',
+            descripcion='Descripción',
+            precio_mxn=5000.00,
+            responsable_email='otro@example.com',
+        )
+        dia = timezone.make_aware(datetime(2024, 3, 10, 23, 30))
+        for i in range(5):
+            solicitud = SolicitudCliente.objects.create(
+                servicio=self.servicio if i % 2 else self.otro,
+                cliente_nombre=f'Cliente, "{i}"',
+                cliente_email='cliente@example.com',
+                mensaje='Mensaje\ncon salto de línea',
+                estatus='cerrado' if i == 4 else 'nuevo',
+            )
+            SolicitudCliente.objects.filter(id=solicitud.id).update(fecha_creacion=dia + timedelta(days=i))
+
+    def exportar(self, **params):
+        response = self.client.get(self.url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content).decode('utf-8')
+
+    def test_ndjson_igual_que_la_api(self):
+        """Test: Cada línea NDJSON coincide con la solicitud de la API"""
+        response, contenido = self.exportar()
+        self.assertTrue(response['Content-Type'].startswith('application/x-ndjson'))
+        filas = [json.loads(linea) for linea in contenido.splitlines()]
+        self.assertEqual(len(filas), 5)
+        detalle = self.client.get(reverse('solicitud-detail', kwargs={'pk': filas[0]['id']}))
+        self.assertEqual(filas[0], json.loads(detalle.content))
+
+    def test_csv(self):
+        """Test: El CSV lleva encabezado y escapa comas, comillas y saltos de línea"""
+        response, contenido = self.exportar(formato='csv')
+        self.assertIn('attachment', response['Content-Disposition'])
+        filas = list(csv.DictReader(io.StringIO(contenido)))
+        self.assertEqual(len(filas), 5)
+        self.assertEqual(filas[0]['cliente_nombre'], 'Cliente, "0"')
+        self.assertEqual(filas[0]['mensaje'], 'Mensaje\ncon salto de línea')
+
+    def test_filtros_y_rango_de_fechas(self):
+        """Test: estatus, servicio, desde y hasta filtran la exportación"""
+        _, contenido = self.exportar(estatus='nuevo', servicio=self.servicio.id)
+        self.assertEqual(len(contenido.splitlines()), 2)
+        # 2024-03-10 23:30 hora local: el día cuenta en la zona del proyecto
+        _, contenido = self.exportar(desde='2024-03-10', hasta='2024-03-11')
+        self.assertEqual(len(contenido.splitlines()), 2)
+
+    def test_parametros_invalidos(self):
+        """Test: Formato o fecha inválidos → 400"""
+        for params in ({'formato': 'xml'}, {'desde': '2024-13-40'}):
+            with self.subTest(params=params):
+                response = self.client.get(self.url, params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    async def test_streaming_asgi(self):
+        """Test: Bajo ASGI la exportación se envía con un iterador asíncrono"""
+        response = await self.async_client.get(self.url, {'formato': 'csv'})
+        self.assertTrue(response.is_async)
+        contenido = b''.join([bloque async for bloque in response.streaming_content])
+        self.assertEqual(len(contenido.decode('utf-8').splitlines()), 1 + 5 * 2)
+
+    def test_comando(self):
+        """Test: El comando exportar_solicitudes aplica los mismos filtros"""
+        salida = io.StringIO()
+        call_command('exportar_solicitudes', formato='ndjson', estatus='cerrado', stdout=salida)
+        filas = [json.loads(linea) for linea in salida.getvalue().splitlines()]
+        self.assertEqual([f['estatus'] for f in filas], ['cerrado'])
@@ -0,0 +1,131 @@
+import datetime
+from decimal import Decimal
+
+from django.core.exceptions import ImproperlyConfigured
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import serializers
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from core.renderers import FastJSONRenderer
+from services.fast import ValuesRepresentation
+from services.models import Servicio, SolicitudCliente
+from services.serializers import (
+    ServicioSerializer,
+    SolicitudClienteNestedSerializer,
+    SolicitudClienteSerializer,
+)
+
+
+class ValuesRepresentationTest(TestCase):
+    """Tests para la ruta rápida de lectura (ValuesRepresentation y FastJSONRenderer)"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.servicio = Servicio.objects.create(
+            nombre='Diseño “web”   ñ',
+            categoria='Web',
+            descripcion='Línea\ncon <html> & "comillas"   😀',
+            precio_mxn=Decimal('1234.50'),
+            responsable_email='web@example.com',
+        )
+        Servicio.objects.create(
+            nombre='Gratis',
+            categoria='Cloud',
+            descripcion='Sin costo',
+            precio_mxn=0,
+            responsable_email='cloud@example.com',
+        )
+        for i in range(3):
+            SolicitudCliente.objects.create(
+                servicio=self.servicio,
+                cliente_nombre=f'Cliente {i}',
+                cliente_email=f'cliente{i}@example.com',
+                mensaje='Mensaje con acentos: áéí',
+            )
+        # Fechas con y sin microsegundos
+        SolicitudCliente.objects.filter(cliente_nombre='Cliente 0').update(
+            fecha_creacion=datetime.datetime(2024, 3, 10, 12, 0, tzinfo=datetime.timezone.utc)
+        )
+
+    def renderizar_drf(self, serializer):
+        return JSONRenderer().render(serializer.data)
+
+    def test_misma_salida_que_el_serializer(self):
+        """Test: La representación desde .values() es idéntica byte a byte a la de DRF"""
+        casos = [
+            (ServicioSerializer, Servicio.objects.all()),
+            (SolicitudClienteSerializer, SolicitudCliente.objects.select_related('servicio')),
+            (SolicitudClienteNestedSerializer, SolicitudCliente.objects.all()),
+        ]
+        for zona in ['America/Mexico_City', 'UTC']:
+            with timezone.override(zona):
+                for serializer_class, queryset in casos:
+                    with self.subTest(serializer=serializer_class.__name__, zona=zona):
+                        representacion = ValuesRepresentation.para(serializer_class)
+                        esperado = self.renderizar_drf(serializer_class(queryset, many=True))
+                        filas = representacion.many(representacion.preparar(queryset))
+                        self.assertEqual(FastJSONRenderer().render(filas), esperado)
+
+                        instancia = queryset.first()
+                        self.assertEqual(
+                            FastJSONRenderer().render(representacion.instance(instancia)),
+                            self.renderizar_drf(serializer_class(instancia)),
+                        )
+
+    def test_endpoints_con_la_misma_salida(self):
+        """Test: list y retrieve responden lo mismo que el serializer de DRF"""
+        solicitud = SolicitudCliente.objects.first()
+        casos = [
+            (reverse('servicio-list'), ServicioSerializer(Servicio.objects.all(), many=True)),
+            (f'{reverse("servicio-list")}?search=diseño', ServicioSerializer([self.servicio], many=True)),
+            (f'{reverse("solicitud-list")}?paginacion=cursor',
+             SolicitudClienteSerializer(SolicitudCliente.objects.all(), many=True)),
+            (reverse('servicio-solicitudes', kwargs={'pk': self.servicio.id}),
+             SolicitudClienteNestedSerializer(SolicitudCliente.objects.all(), many=True)),
+        ]
+        for url, serializer in casos:
+            with self.subTest(url=url):
+                response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(JSONRenderer().render(response.json()['results']),
+                                 self.renderizar_drf(serializer))
+
+        url = reverse('solicitud-detail', kwargs={'pk': solicitud.id})
+        self.assertEqual(self.client.get(url).content,
+                         self.renderizar_drf(SolicitudClienteSerializer(solicitud)))
+
+    def test_renderer_igual_a_jsonrenderer(self):
+        """Test: FastJSONRenderer produce los mismos bytes que JSONRenderer"""
+        datos = {
+            'texto': 'ñ “comillas”    </script> \x00 😀',
+            'numeros': [0, -1, 2 ** 62, True, False, None],
+            'decimal': Decimal('10.50'),
+            'fecha': datetime.date(2024, 3, 10),
+            'fecha_hora': timezone.now(),
+            'anidado': {'lista': [{'a': 1}], 'vacio': {}},
+        }
+        self.assertEqual(FastJSONRenderer().render(datos), JSONRenderer().render(datos))
+        # Enteros fuera de 64 bits: se usa JSONRenderer
+        self.assertEqual(FastJSONRenderer().render({'n': 2 ** 70}), JSONRenderer().render({'n': 2 ** 70}))
+        # Con indentación también
+        contexto = {'indent': 2}
+        self.assertEqual(FastJSONRenderer().render(datos, renderer_context=contexto),
+                         JSONRenderer().render(datos, renderer_context=contexto))
+
+    def test_campos_no_soportados(self):
+        """Test: Un serializer con campos calculados no tiene ruta rápida"""
+        class ConMetodo(serializers.ModelSerializer):
+            resumen = serializers.SerializerMethodField()
+
+            class Meta:
+                model = Servicio
+                fields = ['id', 'resumen']
+
+            def get_resumen(self, obj):
+                return obj.nombre
+
+        with self.assertRaises(ImproperlyConfigured):
+            ValuesRepresentation(ConMetodo)
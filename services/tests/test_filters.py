@@ -0,0 +1,87 @@
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from services.filters import ServicioFilter, SolicitudClienteFilter
+from services.models import Servicio
+
+
+class HuellaConsultaTest(TestCase):
+    """Tests para la huella canónica de los filtros"""
+
+    def huella(self, filterset_class, params):
+        return filterset_class(params, queryset=filterset_class.Meta.model.objects.all()).huella()
+
+    def test_mismo_filtro_en_cualquier_orden(self):
+        """Test: Los mismos filtros en distinto orden dan la misma huella"""
+        a = self.huella(ServicioFilter, {'categoria': 'Web', 'min_precio': '100', 'activo': 'true'})
+        b = self.huella(ServicioFilter, {'activo': '1', 'min_precio': '100.00', 'categoria': 'Web'})
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertEqual(a.clave, b.clave)
+
+    def test_activo_acepta_los_valores_anteriores(self):
+        """Test: activo sigue aceptando 2/3 (NullBooleanSelect) y yes/no, con la misma huella"""
+        for verdadero, falso in (('true', 'false'), ('1', '0'), ('2', '3'), ('yes', 'no'), ('True', 'False')):
+            with self.subTest(valores=(verdadero, falso)):
+                self.assertEqual(self.huella(ServicioFilter, {'activo': verdadero}), (('activo', 'true'),))
+                self.assertEqual(self.huella(ServicioFilter, {'activo': falso}), (('activo', 'false'),))
+
+    def test_parametros_vacios_no_cuentan(self):
+        """Test: Los parámetros vacíos no cambian la huella"""
+        a = self.huella(ServicioFilter, {'categoria': 'Web'})
+        b = self.huella(ServicioFilter, {'categoria': 'Web', 'search': '', 'ordenar_por': ''})
+        self.assertEqual(a, b)
+
+    def test_filtros_distintos_dan_huellas_distintas(self):
+        """Test: Filtros distintos dan huellas distintas"""
+        a = self.huella(SolicitudClienteFilter, {'estatus': 'nuevo'})
+        b = self.huella(SolicitudClienteFilter, {'estatus': 'cerrado'})
+        self.assertNotEqual(a.clave, b.clave)
+        self.assertEqual(a.como_dict(), {'estatus': 'nuevo'})
+
+
+class PipelineFiltrosTest(TestCase):
+    """Tests para el pipeline único de filtros de ServicioViewSet"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        Servicio.objects.create(
+            nombre='Desarrollo Web',
+            categoria='Web',
+            descripcion='Desarrollo de aplicaciones web',
+            precio_mxn=50000.00,
+            responsable_email='web@example.com',
+        )
+
+    def test_cada_filtro_se_aplica_una_vez(self):
+        """Test: Cada filtro aparece una sola vez en el SQL"""
+        params = {
+            'categoria': 'Web', 'activo': 'true', 'min_precio': '100',
+            'max_precio': '90000', 'search': 'web', 'ordenar_por': 'precio_desc',
+        }
+        with CaptureQueriesContext(connection) as contexto:
+            response = self.client.get(reverse('servicio-list'), params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data['results']), 1)
+        sql = contexto.captured_queries[-1]['sql']
+        self.assertEqual(sql.count('"categoria" ='), 1)
+        self.assertEqual(sql.count('"precio_mxn" >='), 1)
+        self.assertEqual(sql.count('"precio_mxn" <='), 1)
+        self.assertEqual(sql.count('MATCH'), 1)
+
+    def test_parametro_invalido(self):
+        """Test: Un valor inválido en un filtro → 400"""
+        for params in ({'ordenar_por': 'alfabetico'}, {'min_precio': 'abc'}, {'ordering': 'descripcion'}):
+            with self.subTest(params=params):
+                response = self.client.get(reverse('servicio-list'), params)
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_huella_en_la_peticion(self):
+        """Test: La huella queda disponible en la petición"""
+        response = self.client.get(reverse('servicio-list'), {'activo': 'true', 'categoria': 'Web'})
+        huella = response.wsgi_request.huella_consulta
+        self.assertEqual(huella.como_dict(), {'activo': 'true', 'categoria': 'Web'})
@@ -0,0 +1,59 @@
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from services.indices import analizar, sugerir_indice
+from services.models import Servicio, SolicitudCliente
+
+
+class AsesorIndicesTest(TestCase):
+    """Tests para los índices de los listados y el asesor de índices"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        for numero in range(3):
+            servicio = Servicio.objects.create(
+                nombre=f'Servicio {numero}', categoria='Web', descripcion='Aplicaciones web',
+                precio_mxn=1000 * (numero + 1), responsable_email='web@example.com',
+            )
+            SolicitudCliente.objects.create(
+                servicio=servicio, cliente_nombre='Juan Pérez', cliente_email='juan@example.com',
+                mensaje='Quiero una cotización',
+            )
+
+    def test_listados_con_indice(self):
+        """Test: Los listados filtran y ordenan con los índices de su forma de consulta"""
+        consultas, _, _ = analizar()
+        listados = [c for c in consultas if any(f.split(' ')[0].endswith('-list') for f in c.formas)]
+        self.assertTrue(listados)
+        for consulta in listados:
+            with self.subTest(formas=consulta.formas):
+                self.assertEqual(consulta.problemas, [], consulta.plan)
+
+        usados = {indice for consulta in consultas for _, indice in consulta.indices}
+        # El catálogo solo lee activos: sin categoría ordena con el índice parcial
+        for indice in (
+            'servicio_categoria_orden_idx', 'servicio_activos_orden_idx',
+            'solicitud_orden_idx', 'solicitud_estatus_orden_idx', 'solicitud_servicio_orden_idx',
+        ):
+            self.assertIn(indice, usados)
+
+    def test_sugerir_indice(self):
+        """Test: La sugerencia junta las igualdades del WHERE y la ordenación"""
+        sql = (
+            'SELECT "services_servicio"."id" FROM "services_servicio" '
+            'WHERE ("services_servicio"."tiempo_estimado_dias" = %s AND "services_servicio"."activo") '
+            'ORDER BY "services_servicio"."nivel_prioridad" DESC, "services_servicio"."id" ASC LIMIT 10'
+        )
+        self.assertEqual(
+            sugerir_indice(sql),
+            "services_servicio: models.Index(fields=['tiempo_estimado_dias', '-nivel_prioridad', 'id'])",
+        )
+
+    def test_comando(self):
+        """Test: asesor_indices reporta las formas revisadas y los planes"""
+        salida = StringIO()
+        call_command('asesor_indices', '--planes', stdout=salida)
+        self.assertIn('formas de consulta', salida.getvalue())
+        self.assertIn('servicio_orden_idx', salida.getvalue())
@@ -0,0 +1,139 @@
+import re
+from unittest import mock
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.metricas import BUCKETS, Registro, Serie, registro
+from services.models import Servicio
+
+
+@override_settings(METRICAS_PUBLICAS=True)
+class MetricasTest(TestCase):
+    """Tests para el middleware de métricas y GET /api/metrics"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        registro.series.clear()
+        registro.estatus.clear()
+        self.client = APIClient()
+        self.servicio = Servicio.objects.create(
+            nombre='Desarrollo Web', categoria='Web', descripcion='Aplicaciones web',
+            precio_mxn=1000, responsable_email='web@example.com',
+        )
+
+    def metricas(self, **headers):
+        return self.client.get(reverse('metrics'), headers=headers)
+
+    def test_server_timing(self):
+        """Test: Cada respuesta trae el tiempo de BD, de serialización y total"""
+        response = self.client.get(reverse('solicitud-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        partes = re.fullmatch(
+            r'db;dur=([\d.]+);desc="(\d+) consultas", ser;dur=([\d.]+), total;dur=([\d.]+)',
+            response['Server-Timing'],
+        )
+        self.assertIsNotNone(partes)
+        self.assertGreater(int(partes[2]), 0)
+        self.assertLessEqual(float(partes[1]), float(partes[4]))
+
+    def test_exposicion(self):
+        """Test: /api/metrics expone conteos, histograma y totales por ruta"""
+        for _ in range(3):
+            self.client.get(reverse('solicitud-list'))
+        self.client.get(reverse('servicio-detail', kwargs={'pk': 999}))
+
+        response = self.metricas()
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        texto = response.content.decode()
+        self.assertIn('http_requests_total{route="solicitud-list",method="GET",status="200"} 3', texto)
+        self.assertIn('http_requests_total{route="servicio-detail",method="GET",status="404"} 1', texto)
+        self.assertIn(
+            'http_request_duration_seconds_bucket{route="solicitud-list",method="GET",le="+Inf"} 3', texto
+        )
+        self.assertIn('http_request_duration_seconds_count{route="solicitud-list",method="GET"} 3', texto)
+        self.assertRegex(texto, r'http_request_db_queries_total\{route="solicitud-list",method="GET"\} [1-9]')
+        self.assertIn('# TYPE http_response_size_bytes_total counter', texto)
+
+    def test_reunir_workers(self):
+        """Test: Se suman las métricas publicadas por otros workers"""
+        self.client.get(reverse('solicitud-list'))
+        otro = Registro()
+        otro.series[('solicitud-list', 'GET')] = Serie()
+        otro.series[('solicitud-list', 'GET')].buckets[0] = 2
+        otro.estatus[('solicitud-list', 'GET', 200)] = 2
+        cache.set('metricas:otro:1', otro.copia())
+        cache.set('metricas:workers', {registro.worker, 'otro:1'})
+
+        series, estatus = registro.reunir()
+        self.assertEqual(estatus[('solicitud-list', 'GET', 200)], 3)
+        self.assertEqual(series[('solicitud-list', 'GET')].peticiones, 3)
+
+        # Un worker cuya copia expiró se quita de la lista
+        cache.delete('metricas:otro:1')
+        registro.reunir()
+        self.assertEqual(cache.get('metricas:workers'), {registro.worker})
+
+    def test_buckets(self):
+        """Test: Cada duración cae en el primer bucket que la contiene"""
+        local = Registro()
+        medicion = type('M', (), {'db': 0.0, 'consultas': 0, 'serializacion': 0.0})()
+        for duracion in (0.001, BUCKETS[0], 0.3, 99):
+            local.observar('r', 'GET', 200, duracion, medicion, 0)
+        buckets = local.series[('r', 'GET')].buckets
+        self.assertEqual(buckets[0], 2)
+        self.assertEqual(buckets[BUCKETS.index(0.5)], 1)
+        self.assertEqual(buckets[-1], 1)
+
+    @override_settings(METRICAS_TOKEN='secreto')
+    def test_token(self):
+        """Test: Con METRICAS_TOKEN se exige el token"""
+        self.assertEqual(self.metricas().status_code, status.HTTP_401_UNAUTHORIZED)
+        self.assertEqual(
+            self.metricas(Authorization='Bearer otro').status_code, status.HTTP_401_UNAUTHORIZED
+        )
+        self.assertEqual(self.metricas(Authorization='Bearer secreto').status_code, status.HTTP_200_OK)
+        self.assertEqual(self.metricas(Authorization='Bearer señal').status_code, status.HTTP_401_UNAUTHORIZED)
+
+    def test_metodos_desconocidos(self):
+        """Test: Un método inventado cuenta como OTHER, sin crear series nuevas"""
+        for metodo in ('FOO', 'BAR'):
+            self.client.generic(metodo, reverse('solicitud-list'))
+        texto = self.metricas().content.decode()
+        self.assertIn('route="solicitud-list",method="OTHER",status="405"} 2', texto)
+        self.assertNotIn('method="FOO"', texto)
+
+    @override_settings(METRICAS_TOKEN='', METRICAS_PUBLICAS=False)
+    def test_sin_token_en_produccion(self):
+        """Test: Sin METRICAS_TOKEN ni METRICAS_PUBLICAS el endpoint no es público"""
+        self.assertEqual(self.metricas().status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_publicacion_fuera_de_la_peticion(self):
+        """Test: Las peticiones no escriben en la caché; una caché caída no las afecta"""
+        with mock.patch('core.metricas.cache') as cache_metricas:
+            response = self.client.get(reverse('solicitud-list'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        cache_metricas.set.assert_not_called()
+
+        with mock.patch('core.metricas.cache') as cache_caida, self.assertLogs('core.metricas', 'ERROR'):
+            cache_caida.set.side_effect = cache_caida.get.side_effect = ConnectionError('Redis caído')
+            registro.publicar()
+            series, _ = registro.reunir()
+            response = self.metricas()
+        self.assertEqual(series[('solicitud-list', 'GET')].peticiones, 1)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    @override_settings(METRICAS=False)
+    def test_desactivadas(self):
+        """Test: Con METRICAS=False no hay Server-Timing ni se registra nada"""
+        client = APIClient()
+        response = client.get(reverse('solicitud-list'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(registro.series, {})
+        self.assertEqual(client.get(reverse('metrics')).status_code, status.HTTP_404_NOT_FOUND)
@@ -48,6 +48,28 @@ class ServicioModelTest(TestCase):
         with self.assertRaises(ValidationError):
             servicio.full_clean()
 
+    def test_manager_activos(self):
+        """Test: Servicio.activos solo devuelve los servicios activos"""
+        activo = Servicio.objects.create(**self.servicio_data)
+        Servicio.objects.create(**{**self.servicio_data, 'activo': False})
+        self.assertEqual(list(Servicio.activos.all()), [activo])
+        self.assertEqual(Servicio.objects.count(), 2)
+
+    def test_desactivar_y_reactivar_por_conjunto(self):
+        """Test: desactivar/reactivar cambian solo los que no tenían ese estado, con un UPDATE"""
+        activo = Servicio.objects.create(**self.servicio_data)
+        inactivo = Servicio.objects.create(**{**self.servicio_data, 'activo': False})
+        antes = Servicio.objects.get(pk=inactivo.pk).ultima_actualizacion
+
+        with self.assertNumQueries(1):
+            self.assertEqual(Servicio.objects.desactivar(), 1)
+        self.assertFalse(Servicio.activos.exists())
+        self.assertEqual(Servicio.objects.get(pk=inactivo.pk).ultima_actualizacion, antes)
+        self.assertGreater(Servicio.objects.get(pk=activo.pk).ultima_actualizacion, activo.ultima_actualizacion)
+
+        self.assertEqual(Servicio.objects.filter(pk=inactivo.pk).reactivar(), 1)
+        self.assertEqual(list(Servicio.activos.all()), [inactivo])
+
 
 class SolicitudClienteModelTest(TestCase):
     """Tests para el modelo SolicitudCliente"""
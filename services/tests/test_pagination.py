@@ -0,0 +1,115 @@
+from datetime import timedelta
+
+from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework import status
+from services.models import Servicio, SolicitudCliente
+
+
+class PaginacionCursorTest(TestCase):
+    """Tests para la paginación keyset (?paginacion=cursor)"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.servicio = Servicio.objects.create(
+            nombre='Servicio Test',
+            categoria='Web',
+            descripcion='Descripción test',
+            precio_mxn=10000.00,
+            responsable_email='test@example.com',
+        )
+        for i in range(45):
+            precio = 1000 * (i % 7)
+            Servicio.objects.create(
+                nombre=f'Servicio {i:02d}',
+                categoria='Cloud',
+                descripcion='Descripción',
+                precio_mxn=precio,
+                responsable_email='cloud@example.com',
+            )
+
+        # Fechas repetidas para forzar el desempate por id
+        ahora = timezone.now()
+        for i in range(45):
+            solicitud = SolicitudCliente.objects.create(
+                servicio=self.servicio,
+                cliente_nombre=f'Cliente {i}',
+                cliente_email='cliente@example.com',
+                mensaje='Mensaje',
+            )
+            SolicitudCliente.objects.filter(id=solicitud.id).update(
+                fecha_creacion=ahora - timedelta(hours=i // 4)
+            )
+
+    def recorrer(self, url, params):
+        """Sigue los enlaces next y devuelve todos los resultados"""
+        response = self.client.get(url, params)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotIn('count', response.data)
+        resultados = list(response.data['results'])
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            resultados.extend(response.data['results'])
+        return resultados
+
+    def test_solicitudes_cursor_recorre_todo_en_orden(self):
+        """Test: El cursor recorre todas las solicitudes en orden (-fecha_creacion, id)"""
+        resultados = self.recorrer(reverse('solicitud-list'), {'paginacion': 'cursor'})
+        esperados = list(
+            SolicitudCliente.objects.order_by('-fecha_creacion', 'id').values_list('id', flat=True)
+        )
+        self.assertEqual([s['id'] for s in resultados], esperados)
+
+    def test_servicios_cursor_coincide_con_paginas(self):
+        """Test: El modo cursor devuelve lo mismo que la paginación por página"""
+        url = reverse('servicio-list')
+        resultados = self.recorrer(url, {'paginacion': 'cursor'})
+        esperados = list(
+            Servicio.objects.order_by('-fecha_publicacion', 'nombre', 'id').values_list('id', flat=True)
+        )
+        self.assertEqual([s['id'] for s in resultados], esperados)
+
+    def test_servicios_cursor_con_ordenar_por(self):
+        """Test: El cursor respeta ordenar_por con precios repetidos"""
+        resultados = self.recorrer(
+            reverse('servicio-list'),
+            {'paginacion': 'cursor', 'ordenar_por': 'precio_desc', 'categoria': 'Cloud'},
+        )
+        esperados = list(
+            Servicio.objects.filter(categoria='Cloud')
+            .order_by('-precio_mxn', 'id').values_list('id', flat=True)
+        )
+        self.assertEqual([s['id'] for s in resultados], esperados)
+
+    def test_servicios_cursor_con_ordering(self):
+        """Test: El cursor respeta el parámetro ordering"""
+        resultados = self.recorrer(
+            reverse('servicio-list'),
+            {'paginacion': 'cursor', 'ordering': 'nombre'},
+        )
+        esperados = list(Servicio.objects.order_by('nombre', 'id').values_list('id', flat=True))
+        self.assertEqual([s['id'] for s in resultados], esperados)
+
+    def test_cursor_invalido(self):
+        """Test: Un cursor inválido → 400"""
+        response = self.client.get(reverse('solicitud-list'), {'cursor': 'no-es-un-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_cursor_con_otra_ordenacion(self):
+        """Test: Un cursor no se puede reutilizar con otra ordenación → 400"""
+        url = reverse('servicio-list')
+        response = self.client.get(url, {'paginacion': 'cursor', 'ordenar_por': 'precio_asc'})
+        siguiente = response.data['next']
+        response = self.client.get(siguiente.replace('precio_asc', 'precio_desc'))
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_paginacion_por_pagina_por_defecto(self):
+        """Test: Sin paginacion=cursor se mantiene la paginación por página"""
+        response = self.client.get(reverse('solicitud-list'), {'page': 3})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 45)
+        self.assertEqual(len(response.data['results']), 5)
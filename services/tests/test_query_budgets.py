@@ -0,0 +1,138 @@
+from django.test import TestCase, override_settings
+from django.urls import NoReverseMatch, reverse
+from rest_framework.test import APIClient
+from services.models import Servicio, SolicitudCliente, SolicitudPendiente
+from services.tests.utils import QueryBudgetMixin, rutas_api
+
+# Consultas SQL máximas por petición, para cada ruta de core/urls.py y método.
+# Toda ruta nueva debe declarar aquí su presupuesto.
+PRESUPUESTOS = {
+    'api-root': {'get': 0},
+    'health-check': {'get': 0},
+    'metrics': {'get': 0},
+    'servicio-list': {'get': 2},          # MAX y COUNT + página
+    'servicio-detail': {'get': 1, 'delete': 2},  # id y activo + UPDATE de esos campos
+    'servicio-solicitudes': {'get': 3},   # servicio + COUNT + página
+    'servicio-estadisticas': {'get': 2},  # MAX y COUNT + página de contadores
+    'solicitud-analitica': {'get': 3},    # marca + resúmenes + hoy en vivo
+    'solicitud-list': {'get': 2},         # COUNT + página (JOIN con servicio)
+    'solicitud-detail': {'get': 1},
+    'solicitud-exportar': {'get': 1},     # una sola consulta, leída por bloques
+    'solicitud-pendiente-detail': {'get': 1},
+    'solicitud-pendiente-estado': {'get': 3},  # profundidad + último lote + su tamaño
+    # Lotes de 10 elementos: el número de consultas no depende del tamaño
+    'servicio-bulk': {'post': 6, 'patch': 6},   # (servicios +) SAVEPOINT + escritura + índice (+ contadores)
+    'servicio-bulk-desactivar': {'post': 2},    # ids existentes + UPDATE
+    'servicio-desactivar': {'post': 1},         # UPDATE con los filtros
+    'servicio-reactivar': {'post': 1},
+    'solicitud-bulk': {'post': 5, 'patch': 6},  # servicios/solicitudes + SAVEPOINT + escritura + contadores
+}
+
+# Con ?paginacion=cursor no hay COUNT: los listados leen solo la página (los
+# validadores HTTP salen de ella) y la página profunda cuesta lo mismo.
+PRESUPUESTOS_CURSOR = {
+    'servicio-list': 1,
+    'servicio-solicitudes': 2,   # servicio + página
+    'servicio-estadisticas': 1,
+    'solicitud-list': 1,
+}
+
+
+@override_settings(METRICAS_PUBLICAS=True)
+class PresupuestoConsultasTest(QueryBudgetMixin, TestCase):
+    """Tests de presupuesto de consultas SQL por endpoint"""
+
+    def setUp(self):
+        """Configuración inicial: suficientes filas para detectar consultas N+1"""
+        self.client = APIClient()
+        self.servicios = [
+            Servicio.objects.create(
+                nombre=f'Servicio {i}',
+                categoria='Web',
+                descripcion='Descripción',
+                precio_mxn=1000 * i,
+                responsable_email='test@example.com',
+            )
+            for i in range(5)
+        ]
+        self.solicitudes = [
+            SolicitudCliente.objects.create(
+                servicio=self.servicios[i % 5],
+                cliente_nombre=f'Cliente {i}',
+                cliente_email='cliente@example.com',
+                mensaje='Mensaje',
+            )
+            for i in range(25)
+        ]
+        self.pendiente = SolicitudPendiente.objects.create(datos={'servicio': self.servicios[0].pk})
+
+    def url(self, nombre):
+        if nombre == 'solicitud-pendiente-detail':
+            return reverse(nombre, kwargs={'seguimiento': self.pendiente.seguimiento})
+        if nombre in ('servicio-desactivar', 'servicio-reactivar'):
+            return f'{reverse(nombre)}?categoria=Web'
+        try:
+            return reverse(nombre)
+        except NoReverseMatch:
+            objeto = self.servicios[0] if nombre.startswith('servicio-') else self.solicitudes[0]
+            return reverse(nombre, kwargs={'pk': objeto.pk})
+
+    def cuerpo(self, nombre, metodo):
+        """Cuerpo de la petición para las rutas que escriben"""
+        if nombre == 'servicio-bulk' and metodo == 'post':
+            return [
+                {
+                    'nombre': f'Nuevo {i}',
+                    'categoria': 'Data',
+                    'descripcion': 'Descripción',
+                    'precio_mxn': '100.00',
+                    'responsable_email': 'nuevo@example.com',
+                }
+                for i in range(10)
+            ]
+        if nombre == 'servicio-bulk' and metodo == 'patch':
+            return [{'id': s.pk, 'nombre': f'Renombrado {s.pk}'} for s in self.servicios]
+        if nombre == 'servicio-bulk-desactivar':
+            return [s.pk for s in self.servicios]
+        if nombre == 'solicitud-bulk' and metodo == 'post':
+            return [
+                {
+                    'servicio': self.servicios[i % 5].pk,
+                    'cliente_nombre': f'Cliente {i}',
+                    'cliente_email': 'cliente@example.com',
+                    'mensaje': 'Mensaje',
+                }
+                for i in range(10)
+            ]
+        if nombre == 'solicitud-bulk' and metodo == 'patch':
+            return [{'id': s.pk, 'estatus': 'cerrado'} for s in self.solicitudes[:10]]
+        return None
+
+    def test_todas_las_rutas_tienen_presupuesto(self):
+        """Test: Cada ruta de core/urls.py declara su presupuesto de consultas"""
+        self.assertEqual(rutas_api() - set(PRESUPUESTOS), set())
+
+    def test_rutas_dentro_del_presupuesto(self):
+        """Test: Ninguna ruta supera su presupuesto de consultas"""
+        for nombre, metodos in PRESUPUESTOS.items():
+            for metodo, maximo in metodos.items():
+                with self.subTest(ruta=nombre, metodo=metodo):
+                    url = self.url(nombre)
+                    cuerpo = self.cuerpo(nombre, metodo)
+                    with self.assertMaxQueries(maximo):
+                        response = getattr(self.client, metodo)(url, cuerpo, format='json')
+                        if response.streaming:
+                            b''.join(response.streaming_content)
+                    self.assertLess(response.status_code, 400)
+
+    def test_listados_por_cursor_sin_count(self):
+        """Test: En modo cursor ninguna página (tampoco la siguiente) hace COUNT"""
+        for nombre, maximo in PRESUPUESTOS_CURSOR.items():
+            with self.subTest(ruta=nombre):
+                url = f'{self.url(nombre)}?paginacion=cursor'
+                while url:
+                    with self.assertMaxQueries(maximo) as consultas:
+                        response = self.client.get(url)
+                    self.assertEqual(response.status_code, 200)
+                    self.assertFalse(any('COUNT(' in c['sql'] for c in consultas.captured_queries))
+                    url = response.data['next']
@@ -0,0 +1,112 @@
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+
+from core.replicas import REPLICA, ReplicaRouter
+from services.models import Servicio
+
+
+class RouterEspia(ReplicaRouter):
+    """Anota a dónde iría cada lectura, pero lee de la única base de los tests"""
+
+    def __init__(self):
+        self.lecturas = []
+
+    def db_for_read(self, model, **hints):
+        self.lecturas.append(super().db_for_read(model, **hints))
+        return DEFAULT_DB_ALIAS
+
+
+class ReplicaRouterTest(TestCase):
+    """Tests para el envío de lecturas a la réplica y la fijación a la primaria"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.router = RouterEspia()
+        configuracion = override_settings(DATABASE_ROUTERS=[self.router])
+        configuracion.enable()
+        self.addCleanup(configuracion.disable)
+        self.client = APIClient(REMOTE_ADDR='10.0.0.1')
+        self.otro_cliente = APIClient(REMOTE_ADDR='10.0.0.2')
+        self.servicio = Servicio.objects.create(
+            nombre='Desarrollo Web', categoria='Web', descripcion='Aplicaciones web',
+            precio_mxn=1000, responsable_email='web@example.com',
+        )
+
+    def lecturas(self, client, url, metodo='get', cuerpo=None):
+        self.router.lecturas.clear()
+        response = getattr(client, metodo)(url, cuerpo, format='json')
+        return response, set(self.router.lecturas)
+
+    def crear_solicitud(self, client, **cambios):
+        return client.post(reverse('solicitud-list'), {
+            'servicio': self.servicio.pk,
+            'cliente_nombre': 'Juan Pérez',
+            'cliente_email': 'juan@example.com',
+            'mensaje': 'Quiero una cotización',
+            **cambios,
+        }, format='json')
+
+    def test_lecturas_a_la_replica(self):
+        """Test: Los GET de servicios y solicitudes leen de la réplica"""
+        for url in (
+            reverse('servicio-list'),
+            reverse('servicio-detail', kwargs={'pk': self.servicio.pk}),
+            reverse('solicitud-list'),
+        ):
+            with self.subTest(url=url):
+                response, lecturas = self.lecturas(self.client, url)
+                self.assertEqual(response.status_code, status.HTTP_200_OK)
+                self.assertEqual(lecturas, {REPLICA})
+
+    def test_exportacion_en_la_replica(self):
+        """Test: La exportación lee de la réplica aunque las filas se lean después de la vista"""
+        self.crear_solicitud(self.otro_cliente)
+        response, _ = self.lecturas(self.client, reverse('solicitud-exportar'))
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        contenido = b''.join(response.streaming_content)
+        self.assertEqual(len(contenido.splitlines()), 1)
+        self.assertEqual(set(self.router.lecturas), {REPLICA})
+
+    def test_escrituras_en_la_primaria(self):
+        """Test: Las lecturas dentro de una escritura van a la primaria"""
+        response, lecturas = self.lecturas(
+            self.client, reverse('servicio-detail', kwargs={'pk': self.servicio.pk}), 'patch',
+            {'nivel_prioridad': 5},
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(lecturas, {DEFAULT_DB_ALIAS})
+
+    def test_fuera_de_las_vistas(self):
+        """Test: Otras vistas y el código fuera de una petición usan la primaria"""
+        Servicio.objects.count()
+        self.assertEqual(set(self.router.lecturas), {DEFAULT_DB_ALIAS})
+
+    def test_leer_lo_escrito(self):
+        """Test: Tras escribir, el cliente lee de la primaria; los demás, de la réplica"""
+        self.assertEqual(self.crear_solicitud(self.client).status_code, status.HTTP_201_CREATED)
+
+        url = reverse('solicitud-list')
+        self.assertEqual(self.lecturas(self.client, url)[1], {DEFAULT_DB_ALIAS})
+        self.assertEqual(self.lecturas(self.otro_cliente, url)[1], {REPLICA})
+
+        # Al pasar la ventana vuelve a la réplica
+        cache.clear()
+        self.assertEqual(self.lecturas(self.client, url)[1], {REPLICA})
+
+    def test_escritura_fallida_no_fija(self):
+        """Test: Una escritura rechazada no fija al cliente a la primaria"""
+        response = self.crear_solicitud(self.client, cliente_email='no-es-email')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(self.lecturas(self.client, reverse('solicitud-list'))[1], {REPLICA})
+
+    @override_settings(REPLICA_FIJAR_SEGUNDOS=0)
+    def test_sin_ventana(self):
+        """Test: Con REPLICA_FIJAR_SEGUNDOS=0 no se fija al cliente"""
+        self.crear_solicitud(self.client)
+        self.assertEqual(self.lecturas(self.client, reverse('solicitud-list'))[1], {REPLICA})
@@ -0,0 +1,118 @@
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from services.models import ContadorSolicitudes, Servicio
+from services.search import buscar_servicios, consulta_pg, terminos
+
+
+class TerminosTest(TestCase):
+    """Tests para la normalización de términos de búsqueda"""
+
+    def test_quita_acentos_y_mayusculas(self):
+        """Test: 'Móvil' y 'movil' producen el mismo término"""
+        self.assertEqual(terminos('Móvil'), terminos('movil'))
+
+    def test_singular_y_plural(self):
+        """Test: Singular y plural producen la misma raíz"""
+        self.assertEqual(terminos('aplicación'), terminos('aplicaciones'))
+        self.assertEqual(terminos('móvil'), terminos('móviles'))
+        self.assertEqual(terminos('desarrollo'), terminos('desarrollos'))
+
+    def test_consulta_pg_sin_raices(self):
+        """Test: La tsquery de PostgreSQL lleva las palabras sin reducir (PostgreSQL las reduce)"""
+        self.assertEqual(consulta_pg('Aplicaciones Móviles'), 'aplicaciones:* & moviles:*')
+
+
+class BusquedaServiciosTest(TestCase):
+    """Tests para la búsqueda de texto completo de servicios"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        self.client = APIClient()
+        self.movil = Servicio.objects.create(
+            nombre='App Móvil',
+            categoria='Móvil',
+            descripcion='Desarrollo de aplicaciones para iOS y Android',
+            precio_mxn=80000.00,
+            responsable_email='mobile@example.com',
+        )
+        self.web = Servicio.objects.create(
+            nombre='Desarrollo Web',
+            categoria='Web',
+            descripcion='Sitios web con versión móvil incluida',
+            precio_mxn=50000.00,
+            responsable_email='web@example.com',
+        )
+        self.cloud = Servicio.objects.create(
+            nombre='Migración a la nube',
+            categoria='Cloud',
+            descripcion='Migración de infraestructura',
+            precio_mxn=30000.00,
+            responsable_email='cloud@example.com',
+        )
+
+    def buscar(self, texto, **params):
+        response = self.client.get(reverse('servicio-list'), {'search': texto, **params})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [s['id'] for s in response.data['results']]
+
+    def test_busqueda_sin_acentos(self):
+        """Test: 'movil' encuentra 'Móvil', con el nombre antes que la descripción"""
+        self.assertEqual(self.buscar('movil'), [self.movil.id, self.web.id])
+
+    def test_busqueda_por_raiz(self):
+        """Test: 'aplicación' encuentra 'aplicaciones'"""
+        self.assertEqual(self.buscar('aplicación'), [self.movil.id])
+
+    def test_busqueda_por_prefijo_y_varias_palabras(self):
+        """Test: Todas las palabras deben coincidir, como prefijo"""
+        self.assertEqual(self.buscar('desarr andro'), [self.movil.id])
+
+    def test_busqueda_con_ordenar_por(self):
+        """Test: ordenar_por tiene prioridad sobre la relevancia"""
+        self.assertEqual(self.buscar('movil', ordenar_por='precio_asc'), [self.web.id, self.movil.id])
+
+    def test_busqueda_con_paginacion_cursor(self):
+        """Test: La búsqueda funciona con la paginación por cursor"""
+        response = self.client.get(
+            reverse('servicio-list'), {'search': 'movil', 'paginacion': 'cursor'}
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([s['id'] for s in response.data['results']], [self.movil.id, self.web.id])
+
+    def test_indice_se_actualiza_al_guardar(self):
+        """Test: Al renombrar un servicio el índice se actualiza"""
+        self.cloud.nombre = 'Kubernetes administrado'
+        self.cloud.save()
+        self.assertEqual(self.buscar('kubernetes'), [self.cloud.id])
+        self.assertEqual(self.buscar('nube'), [])
+
+    def test_indice_se_actualiza_al_eliminar(self):
+        """Test: Un servicio eliminado deja de aparecer en la búsqueda"""
+        self.cloud.delete()
+        self.assertEqual(
+            list(buscar_servicios(Servicio.objects.all(), 'migración')), []
+        )
+
+    def test_busqueda_como_subconsulta(self):
+        """Test: La búsqueda sirve como subconsulta y con otro alias de la tabla"""
+        encontrados = buscar_servicios(Servicio.objects.all(), 'movil').values('pk')
+        self.assertEqual(
+            set(Servicio.objects.exclude(pk__in=encontrados).values_list('pk', flat=True)), {self.cloud.id}
+        )
+        self.assertEqual(
+            set(ContadorSolicitudes.objects.filter(servicio__in=encontrados).values_list('servicio', flat=True)),
+            {self.movil.id, self.web.id},
+        )
+
+    def test_desactivar_y_reactivar_por_busqueda(self):
+        """Test: /desactivar/ y /reactivar/ con ?search= cambian solo los encontrados"""
+        response = self.client.post(f'{reverse("servicio-desactivar")}?search=aplicación')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'actualizados': 1})
+        self.assertEqual(set(Servicio.objects.filter(activo=True)), {self.web, self.cloud})
+
+        response = self.client.post(f'{reverse("servicio-reactivar")}?search=movil')
+        self.assertEqual(response.data, {'actualizados': 1})
+        self.assertFalse(Servicio.objects.filter(activo=False).exists())
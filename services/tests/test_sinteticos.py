@@ -0,0 +1,96 @@
+import datetime
+from io import StringIO
+
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db.models import Count
+from django.test import TestCase
+from django.utils import timezone
+from services.models import ContadorSolicitudes, Servicio, SolicitudCliente
+from services.search import buscar_servicios
+from services.sinteticos import CATALOGO, GeneradorSintetico
+
+
+class GeneradorSinteticoTest(TestCase):
+    """Tests para el generador de datos sintéticos y seed_services"""
+
+    hasta = datetime.date(2025, 6, 30)
+
+    def generar(self, servicios=30, solicitudes=2000, semilla=42, **opciones):
+        generador = GeneradorSintetico(
+            semilla=semilla, hasta=self.hasta, dias=120, tamano_lote=500, usar_copy=False, **opciones
+        )
+        creados = generador.servicios(servicios)
+        generador.solicitudes(creados, solicitudes)
+        return creados
+
+    def filas(self):
+        return list(
+            SolicitudCliente.objects.order_by('id').values_list(
+                'servicio__nombre', 'cliente_email', 'estatus', 'fecha_creacion'
+            )
+        )
+
+    def test_misma_semilla_mismos_datos(self):
+        """Test: Con la misma semilla y el mismo hasta se generan los mismos datos"""
+        self.generar()
+        primera = self.filas()
+        SolicitudCliente.objects.all().delete()
+        Servicio.objects.all().delete()
+        self.generar()
+        self.assertEqual(self.filas(), primera)
+
+        SolicitudCliente.objects.all().delete()
+        Servicio.objects.all().delete()
+        self.generar(semilla=43)
+        self.assertNotEqual(self.filas(), primera)
+
+    def test_distribuciones(self):
+        """Test: Catálogo primero, fechas en rango y popularidad concentrada"""
+        servicios = self.generar()
+        self.assertEqual(len(servicios), 30)
+        self.assertEqual([s.nombre for s in servicios[:len(CATALOGO)]], [s['nombre'] for s in CATALOGO])
+        self.assertEqual(SolicitudCliente.objects.count(), 2000)
+
+        publicacion = {s.pk: s.fecha_publicacion for s in servicios}
+        for servicio_id, fecha in SolicitudCliente.objects.values_list('servicio_id', 'fecha_creacion'):
+            dia = timezone.localdate(fecha)
+            self.assertLessEqual(dia, self.hasta)
+            self.assertGreaterEqual(dia, publicacion[servicio_id])
+
+        # Los 3 servicios más populares concentran buena parte de las solicitudes
+        por_servicio = sorted(
+            SolicitudCliente.objects.values('servicio').annotate(n=Count('pk')).values_list('n', flat=True),
+            reverse=True,
+        )
+        self.assertGreater(sum(por_servicio[:3]), 2000 * 0.4)
+
+    def test_contadores_y_busqueda(self):
+        """Test: Los contadores y el índice de búsqueda quedan al día sin señales"""
+        self.generar()
+        for contador in ContadorSolicitudes.objects.all():
+            conteos = dict(
+                SolicitudCliente.objects.filter(servicio_id=contador.servicio_id)
+                .values_list('estatus').annotate(n=Count('pk'))
+            )
+            self.assertEqual(
+                (contador.nuevo, contador.en_proceso, contador.cerrado),
+                (conteos.get('nuevo', 0), conteos.get('en_proceso', 0), conteos.get('cerrado', 0)),
+            )
+        self.assertTrue(buscar_servicios(Servicio.objects.all(), 'penetración').exists())
+
+    def test_comando(self):
+        """Test: seed_services con opciones, avance y validación"""
+        salida = StringIO()
+        call_command(
+            'seed_services', '--servicios', '12', '--solicitudes', '300', '--semilla', '1',
+            '--hasta', '2025-06-30', '--lote', '100', stdout=salida,
+        )
+        self.assertIn('semilla 1', salida.getvalue())
+        self.assertIn('solicitudes: 300/300 (100%)', salida.getvalue())
+        self.assertEqual(Servicio.objects.count(), 12)
+        self.assertEqual(SolicitudCliente.objects.count(), 300)
+
+        for argumentos in (['--lote', '0'], ['--servicios', '0'], ['--hasta', '2999-01-01']):
+            with self.subTest(argumentos=argumentos), self.assertRaises(CommandError):
+                call_command('seed_services', *argumentos, stdout=StringIO())
@@ -0,0 +1,189 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+from django.test import RequestFactory, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from rest_framework import status
+from core.throttling import IPTokenBucketThrottle
+from services.models import Servicio, SolicitudCliente, SolicitudPendiente
+
+
+def tasas(**valores):
+    """REST_FRAMEWORK con las tasas de límite dadas"""
+    return override_settings(REST_FRAMEWORK={
+        **settings.REST_FRAMEWORK,
+        'DEFAULT_THROTTLE_RATES': {'solicitudes_ip': None, 'solicitudes_servicio': None, **valores},
+    })
+
+
+class LimiteSolicitudesTest(TestCase):
+    """Tests para los límites token bucket de creación de solicitudes"""
+
+    def setUp(self):
+        """Configuración inicial para los tests"""
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+        self.web = Servicio.objects.create(
+            nombre='Desarrollo Web', categoria='Web', descripcion='Aplicaciones web',
+            precio_mxn=1000, responsable_email='web@example.com',
+        )
+        self.cloud = Servicio.objects.create(
+            nombre='Migración', categoria='Cloud', descripcion='Migración a la nube',
+            precio_mxn=2000, responsable_email='cloud@example.com',
+        )
+        self.reloj = mock.patch('core.throttling.time.time', return_value=1_000_000.0)
+        self.tiempo = self.reloj.start()
+        self.addCleanup(self.reloj.stop)
+
+    def crear(self, servicio, ip='10.0.0.1'):
+        return self.client.post(reverse('solicitud-list'), {
+            'servicio': servicio.id,
+            'cliente_nombre': 'Cliente',
+            'cliente_email': 'cliente@example.com',
+            'mensaje': 'Mensaje',
+        }, format='json', REMOTE_ADDR=ip)
+
+    @tasas(solicitudes_ip='3/min')
+    def test_limite_por_ip_y_recarga(self):
+        """Test: Ráfaga de la capacidad, luego 429 con Retry-After; el bucket se rellena"""
+        for _ in range(3):
+            self.assertEqual(self.crear(self.web).status_code, status.HTTP_201_CREATED)
+
+        response = self.crear(self.web)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '20')
+        self.assertEqual(response.data['message'], 'Demasiadas solicitudes')
+        self.assertEqual(response.data['details']['retry_after'], 20)
+        self.assertEqual(SolicitudCliente.objects.count(), 3)
+
+        # Otra IP tiene su propio bucket
+        self.assertEqual(self.crear(self.web, ip='10.0.0.2').status_code, status.HTTP_201_CREATED)
+
+        # Una ficha cada 20 s
+        self.tiempo.return_value += 20
+        self.assertEqual(self.crear(self.web).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.crear(self.web).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        self.tiempo.return_value += 60
+        for _ in range(3):
+            self.assertEqual(self.crear(self.web).status_code, status.HTTP_201_CREATED)
+
+    @tasas(solicitudes_ip='5/min')
+    def test_workers_concurrentes(self):
+        """Test: Dos instancias (dos workers) a la vez sobre un bucket ya relleno no pasan de la capacidad"""
+        class Throttle(IPTokenBucketThrottle):
+            scope = 'solicitudes_ip'
+
+        request = RequestFactory().post('/', REMOTE_ADDR='10.0.0.9')
+        self.assertTrue(Throttle().allow_request(request, None))
+        # La clave sigue en la caché, pero el bucket ya se rellenó
+        self.tiempo.return_value += 600
+
+        workers = [Throttle(), Throttle()]
+        salida = threading.Barrier(20)
+
+        def pedir(i):
+            salida.wait()
+            return workers[i % 2].allow_request(request, None)
+
+        def lenta(operacion):
+            # Cada operación de caché tarda, así los hilos se intercalan entre ellas
+            def envoltura(*args, **kwargs):
+                resultado = operacion(*args, **kwargs)
+                time.sleep(0.002)
+                return resultado
+            return envoltura
+
+        operaciones = {nombre: lenta(getattr(LocMemCache, nombre)) for nombre in ('get', 'set', 'add', 'incr')}
+        with mock.patch.multiple(LocMemCache, **operaciones), ThreadPoolExecutor(max_workers=20) as ejecutor:
+            permitidas = list(ejecutor.map(pedir, range(20)))
+        self.assertEqual(permitidas.count(True), 5)
+
+    @tasas(solicitudes_servicio='2/hour')
+    def test_limite_por_servicio(self):
+        """Test: El límite por servicio aplica a todas las IPs y a la ruta anidada"""
+        self.assertEqual(self.crear(self.web, ip='10.0.0.1').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.crear(self.web, ip='10.0.0.2').status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.crear(self.web, ip='10.0.0.3').status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+        anidada = reverse('servicio-solicitudes', kwargs={'pk': self.web.id})
+        datos = {'cliente_nombre': 'Cliente', 'cliente_email': 'cliente@example.com', 'mensaje': 'Mensaje'}
+        response = self.client.post(anidada, datos, format='json')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '1800')
+
+        self.assertEqual(self.crear(self.cloud).status_code, status.HTTP_201_CREATED)
+        # Las lecturas no consumen fichas
+        self.assertEqual(self.client.get(anidada).status_code, status.HTTP_200_OK)
+
+    @tasas(solicitudes_ip='1/min', solicitudes_servicio='1/min')
+    def test_solo_creacion(self):
+        """Test: Sin servicio válido no se toma ficha del servicio; el resto de rutas no se limita"""
+        response = self.client.post(reverse('solicitud-list'), {'servicio': 'x'}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            self.crear(self.web, ip='10.0.0.9').status_code, status.HTTP_201_CREATED
+        )
+        for _ in range(3):
+            self.assertEqual(self.client.get(reverse('solicitud-list')).status_code, status.HTTP_200_OK)
+
+    def lote(self, servicios, ip='10.0.0.1'):
+        return self.client.post(reverse('solicitud-bulk'), [
+            {
+                'servicio': servicio.id,
+                'cliente_nombre': 'Cliente',
+                'cliente_email': 'cliente@example.com',
+                'mensaje': 'Mensaje',
+            }
+            for servicio in servicios
+        ], format='json', REMOTE_ADDR=ip)
+
+    @tasas(solicitudes_ip='5/min')
+    def test_lote_cobra_por_elemento(self):
+        """Test: Cada elemento del lote cuesta una ficha: el lote también recibe 429"""
+        self.assertEqual(self.lote([self.web] * 3).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.crear(self.web).status_code, status.HTTP_201_CREATED)
+        response = self.lote([self.web] * 2)
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(response['Retry-After'], '12')
+        self.assertEqual(self.lote([self.web]).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.lote([self.web]).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertEqual(SolicitudCliente.objects.count(), 5)
+
+        # Un lote mayor que la capacidad nunca cabe: sin Retry-After
+        response = self.lote([self.web] * 6, ip='10.0.0.2')
+        self.assertEqual(response.status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        self.assertFalse(response.has_header('Retry-After'))
+
+    @tasas(solicitudes_servicio='3/hour')
+    def test_lote_por_servicio(self):
+        """Test: En el lote, cada servicio paga por sus elementos"""
+        self.assertEqual(self.lote([self.web, self.web, self.cloud]).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.lote([self.web, self.web]).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+        # El lote rechazado no consumió las fichas de cloud
+        self.assertEqual(self.lote([self.cloud, self.cloud, self.web]).status_code, status.HTTP_201_CREATED)
+        self.assertEqual(self.crear(self.cloud).status_code, status.HTTP_429_TOO_MANY_REQUESTS)
+
+    @tasas(solicitudes_ip='5/min')
+    @override_settings(SOLICITUDES_EN_COLA=True)
+    def test_lote_en_cola(self):
+        """Test: Con la cola activa el lote se encola: 202 con un seguimiento por elemento"""
+        response = self.lote([self.web, self.cloud])
+        self.assertEqual(response.status_code, status.HTTP_202_ACCEPTED)
+        self.assertEqual(len(response.data['resultados']), 2)
+        self.assertIn('seguimiento', response.data['resultados'][0])
+        self.assertFalse(SolicitudCliente.objects.exists())
+        self.assertEqual(SolicitudPendiente.objects.count(), 2)
+
+    @tasas()
+    def test_sin_tasas(self):
+        """Test: Sin tasas configuradas no hay límite"""
+        for _ in range(5):
+            self.assertEqual(self.crear(self.web).status_code, status.HTTP_201_CREATED)
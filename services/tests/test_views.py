@@ -1,4 +1,6 @@
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -37,11 +39,11 @@ class ServicioViewSetTest(TestCase):
         )
 
     def test_listar_servicios(self):
-        """Test: Listar todos los servicios"""
+        """Test: Listar los servicios activos"""
         url = reverse('servicio-list')
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data['results']), 3)
+        self.assertEqual(len(response.data['results']), 2)
 
     def test_crear_servicio_valido(self):
         """Test: Crear un servicio válido → 201"""
@@ -135,6 +137,49 @@ class ServicioViewSetTest(TestCase):
         self.servicio1.refresh_from_db()
         self.assertFalse(self.servicio1.activo)
 
+    def test_soft_delete_solo_escribe_activo(self):
+        """Test: El soft delete lee y escribe solo activo y ultima_actualizacion"""
+        url = reverse('servicio-detail', kwargs={'pk': self.servicio1.id})
+        with CaptureQueriesContext(connection) as consultas:
+            self.client.delete(url)
+        update = next(c['sql'] for c in consultas.captured_queries if c['sql'].startswith('UPDATE'))
+        self.assertNotIn('nombre', update)
+        self.assertIn('ultima_actualizacion', update)
+
+    def test_inactivos_fuera_del_catalogo(self):
+        """Test: Un servicio inactivo no se lee en el catálogo, pero se puede editar y reactivar"""
+        detalle = reverse('servicio-detail', kwargs={'pk': self.servicio3.id})
+        listado = self.client.get(reverse('servicio-list'), {'activo': 'false'})
+        self.assertEqual(listado.data['results'], [])
+        self.assertEqual(self.client.get(detalle).status_code, status.HTTP_404_NOT_FOUND)
+        estadisticas = self.client.get(reverse('servicio-estadisticas'))
+        self.assertNotIn(self.servicio3.id, [fila['servicio'] for fila in estadisticas.data['results']])
+
+        response = self.client.patch(detalle, {'nivel_prioridad': 5}, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        response = self.client.post(f'{reverse("servicio-reactivar")}?activo=false')
+        self.assertEqual(response.data, {'actualizados': 1})
+        self.assertEqual(self.client.get(detalle).data['nivel_prioridad'], 5)
+
+    def test_desactivar_por_filtros(self):
+        """Test: /desactivar/ y /reactivar/ cambian los servicios que cumplen los filtros"""
+        response = self.client.post(f'{reverse("servicio-desactivar")}?max_precio=60000')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data, {'actualizados': 1})
+        self.assertEqual(Servicio.activos.get(), self.servicio2)
+
+        response = self.client.post(f'{reverse("servicio-reactivar")}?search=nube')
+        self.assertEqual(response.data, {'actualizados': 1})
+        self.assertEqual(set(Servicio.activos.all()), {self.servicio2, self.servicio3})
+
+    def test_desactivar_sin_filtros(self):
+        """Test: /desactivar/ sin filtros (o solo con ordenación) → 400"""
+        for params in ('', '?ordenar_por=precio_asc'):
+            with self.subTest(params=params):
+                response = self.client.post(f'{reverse("servicio-desactivar")}{params}')
+                self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Servicio.activos.count(), 2)
+
 
 class SolicitudClienteViewSetTest(TestCase):
     """Tests para SolicitudClienteViewSet"""
@@ -222,7 +267,55 @@ class SolicitudNestedTest(TestCase):
         url = reverse('servicio-solicitudes', kwargs={'pk': self.servicio.id})
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
-        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response.data['count'], 1)
+        self.assertEqual(len(response.data['results']), 1)
+
+    def test_listar_solicitudes_de_servicio_paginado(self):
+        """Test: El listado anidado se pagina igual que /api/solicitudes/"""
+        otro = Servicio.objects.create(
+            nombre='Otro Servicio',
+            categoria='Cloud',
+            descripcion='Descripción',
+            precio_mxn=5000.00,
+            responsable_email='otro@example.com',
+        )
+        for i in range(25):
+            SolicitudCliente.objects.create(
+                servicio=self.servicio if i < 23 else otro,
+                cliente_nombre=f'Cliente {i}',
+                cliente_email='cliente@example.com',
+                mensaje='Mensaje',
+            )
+        url = reverse('servicio-solicitudes', kwargs={'pk': self.servicio.id})
+        response = self.client.get(url)
+        self.assertEqual(response.data['count'], 23)
+        self.assertEqual(len(response.data['results']), 20)
+        response = self.client.get(response.data['next'])
+        self.assertEqual(len(response.data['results']), 3)
+        self.assertIsNone(response.data['next'])
+
+    def test_filtrar_solicitudes_de_servicio_por_estatus(self):
+        """Test: El listado anidado filtra por estatus"""
+        for estatus in ('nuevo', 'cerrado', 'cerrado'):
+            SolicitudCliente.objects.create(
+                servicio=self.servicio,
+                cliente_nombre='Cliente',
+                cliente_email='cliente@example.com',
+                mensaje='Mensaje',
+                estatus=estatus,
+            )
+        url = reverse('servicio-solicitudes', kwargs={'pk': self.servicio.id})
+        response = self.client.get(url, {'estatus': 'cerrado'})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['count'], 2)
+        response = self.client.get(url, {'estatus': 'invalido'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_listar_solicitudes_de_servicio_inexistente(self):
+        """Test: Listar solicitudes de un servicio inexistente → 404"""
+        url = reverse('servicio-solicitudes', kwargs={'pk': 9999})
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
 
     def test_crear_solicitud_en_servicio(self):
         """Test: Crear solicitud anidada en un servicio"""
@@ -0,0 +1,43 @@
+"""
+Utilidades compartidas por los tests.
+"""
+from contextlib import contextmanager
+
+from django.db import connections
+from django.test.utils import CaptureQueriesContext
+from django.urls import URLPattern, URLResolver, get_resolver
+
+
+class QueryBudgetMixin:
+    """
+    Mixin para TestCase que agrega ``assertMaxQueries``: como
+    ``assertNumQueries``, pero solo falla si se supera el presupuesto.
+    """
+
+    @contextmanager
+    def assertMaxQueries(self, maximo, using='default'):
+        with CaptureQueriesContext(connections[using]) as contexto:
+            yield contexto
+        ejecutadas = len(contexto)
+        if ejecutadas > maximo:
+            consultas = '\n'.join(
+                f'{i}. {consulta["sql"]}'
+                for i, consulta in enumerate(contexto.captured_queries, start=1)
+            )
+            self.fail(f'{ejecutadas} consultas ejecutadas, presupuesto {maximo}:\n{consultas}')
+
+
+def rutas_api(urlconf=None):
+    """Nombres de las rutas de ``core/urls.py``, sin las del admin"""
+    nombres = set()
+
+    def recorrer(patrones):
+        for patron in patrones:
+            if isinstance(patron, URLResolver):
+                if patron.namespace != 'admin':
+                    recorrer(patron.url_patterns)
+            elif isinstance(patron, URLPattern) and patron.name:
+                nombres.add(patron.name)
+
+    recorrer(get_resolver(urlconf).url_patterns)
+    return nombres
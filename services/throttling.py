@@ -0,0 +1,67 @@
+"""
+Límites de creación de solicitudes públicas (``POST /api/solicitudes/``,
+``POST /api/solicitudes/bulk/`` y ``POST /api/servicios/{id}/solicitudes/``),
+por IP y por servicio. Ver ``core/throttling.py``.
+
+Cada solicitud de un lote cuesta una ficha, como una creación individual:
+el lote no sirve para saltarse los límites.
+"""
+from collections import Counter
+
+from core.throttling import IPTokenBucketThrottle, TokenBucketThrottle
+
+
+def es_lote(request):
+    return isinstance(request.data, list)
+
+
+def _servicio(valor):
+    try:
+        return int(valor)
+    except (TypeError, ValueError):
+        return None
+
+
+class SolicitudIPThrottle(IPTokenBucketThrottle):
+    """Solicitudes creadas desde una misma IP"""
+    scope = 'solicitudes_ip'
+
+    def get_cargos(self, request, view):
+        if not es_lote(request):
+            return super().get_cargos(request, view)
+        return [(self.get_cache_key(request, view), len(request.data))]
+
+
+class SolicitudServicioThrottle(TokenBucketThrottle):
+    """Solicitudes creadas para un mismo servicio, sin importar el cliente"""
+    scope = 'solicitudes_servicio'
+
+    def get_cache_key(self, request, view):
+        # En la ruta anidada el servicio viene en la URL; en /api/solicitudes/,
+        # en el cuerpo. Si falta o no es válido, la validación responde 400.
+        servicio = view.kwargs.get('pk')
+        if servicio is None and isinstance(request.data, dict):
+            servicio = request.data.get('servicio')
+        return self.clave(_servicio(servicio))
+
+    def get_cargos(self, request, view):
+        if not es_lote(request):
+            return super().get_cargos(request, view)
+        # Cada servicio del lote paga por sus elementos
+        por_servicio = Counter(
+            _servicio(elemento.get('servicio'))
+            for elemento in request.data if isinstance(elemento, dict)
+        )
+        por_servicio.pop(None, None)
+        return [
+            (self.clave(servicio), fichas)
+            for servicio, fichas in sorted(por_servicio.items())
+        ]
+
+    def clave(self, servicio):
+        if servicio is None:
+            return None
+        return self.cache_format % {'scope': self.scope, 'ident': servicio}
+
+
+THROTTLES_SOLICITUDES = [SolicitudIPThrottle, SolicitudServicioThrottle]
@@ -1,87 +1,106 @@
-from rest_framework import viewsets, status
+from collections import Counter
+
+from rest_framework import mixins, viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
+from rest_framework.exceptions import ValidationError
 from rest_framework.permissions import AllowAny
-from django_filters.rest_framework import DjangoFilterBackend
-from rest_framework.filters import OrderingFilter, SearchFilter
+from django.core.handlers.asgi import ASGIRequest
+from django.http import StreamingHttpResponse
 from django.shortcuts import get_object_or_404
-from django.db import models
+from django.urls import reverse
+from django.db.models import Count, Max
+from django.utils import timezone
 
-from .models import Servicio, SolicitudCliente
+from core.replicas import LecturasEnReplicaMixin
+from .models import ContadorSolicitudes, Servicio, SolicitudCliente, SolicitudPendiente
 from .serializers import (
+    AnaliticaParametrosSerializer,
+    ContadorSolicitudesSerializer,
+    ServicioConContadoresSerializer,
     ServicioSerializer,
     SolicitudClienteSerializer,
-    SolicitudClienteNestedSerializer
+    SolicitudClienteNestedSerializer,
+    SolicitudPendienteSerializer,
+)
+from .filters import (
+    CanonicalFilterBackend,
+    ServicioFilter,
+    SolicitudClienteFilter,
+    aplicar_filterset,
+)
+from . import analitica, cola, contadores, export
+from .conditional import (
+    ConditionalUpdateMixin,
+    agregar_validadores,
+    calcular_etag,
+    respuesta_condicional,
+    validadores_de_pagina,
 )
-from .filters import ServicioFilter, SolicitudClienteFilter
+from .fast import FastReadMixin, ValuesRepresentation
+from .bulk import BulkMixin, ResultadoLote, leer_elementos, leer_modo
+from .search import CAMPOS_INDEXADOS, indexar_servicios
+from .throttling import THROTTLES_SOLICITUDES
 
 
-class ServicioViewSet(viewsets.ModelViewSet):
+class ServicioViewSet(LecturasEnReplicaMixin, ConditionalUpdateMixin, BulkMixin, viewsets.ModelViewSet):
     """
     ViewSet para el modelo Servicio.
     
-    Permite CRUD completo con filtros, búsqueda y ordenación.
+    Permite CRUD completo con filtros, búsqueda y ordenación. Todos los
+    parámetros (``categoria``, ``activo``, ``min_precio``, ``max_precio``,
+    ``search``, ``ordenar_por`` y ``ordering``) los valida y aplica una sola
+    vez ``ServicioFilter``.
+    Sin ``ordering`` ni ``ordenar_por`` se usa el ``Meta.ordering`` del modelo,
+    que también es la clave de la paginación por cursor. Las lecturas llevan
+    ETag y Last-Modified y se representan desde ``.values()``, PUT y PATCH
+    aceptan ``If-Match`` (ver ``ConditionalUpdateMixin`` y
+    ``FastReadMixin``) y las escrituras
+    masivas van por /bulk/ (ver ``BulkMixin``). Con ``?contadores=true`` las
+    lecturas incluyen el número de solicitudes por estatus. Con réplica
+    configurada, las lecturas van a ella (ver ``core/replicas.py``).
+    /desactivar/ y /reactivar/ cambian con un solo UPDATE todos los servicios
+    que cumplen los filtros.
+    Las lecturas públicas (listado, detalle y /estadisticas/) solo ven los
+    activos (``Servicio.activos``); las escrituras, /desactivar/, /reactivar/
+    y /bulk/ usan ``Servicio.objects``, que incluye los inactivos.
     """
     queryset = Servicio.objects.all()
+    queryset_catalogo = Servicio.activos.all()
+    acciones_catalogo = ('list', 'retrieve', 'estadisticas')
     serializer_class = ServicioSerializer
     permission_classes = [AllowAny]  # En producción, usar permisos apropiados
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = [CanonicalFilterBackend]
     filterset_class = ServicioFilter
-    search_fields = ['nombre', 'descripcion']
-    ordering_fields = ['precio_mxn', 'fecha_publicacion', 'nombre']
-    ordering = ['-fecha_publicacion']
 
     def get_queryset(self):
-        """
-        Permite filtrado adicional por parámetros de query.
-        """
+        if self.action in self.acciones_catalogo:
+            # La base de la que parten los mixins (GenericAPIView lee
+            # ``self.queryset``); la instancia es de esta petición
+            self.queryset = self.queryset_catalogo
         queryset = super().get_queryset()
-        
-        # Aplicar filtros personalizados
-        categoria = self.request.query_params.get('categoria', None)
-        if categoria:
-            queryset = queryset.filter(categoria=categoria)
-        
-        activo = self.request.query_params.get('activo', None)
-        if activo is not None:
-            activo_bool = activo.lower() in ('true', '1', 'yes')
-            queryset = queryset.filter(activo=activo_bool)
-        
-        min_precio = self.request.query_params.get('min_precio', None)
-        if min_precio:
-            try:
-                queryset = queryset.filter(precio_mxn__gte=float(min_precio))
-            except ValueError:
-                pass
-        
-        max_precio = self.request.query_params.get('max_precio', None)
-        if max_precio:
-            try:
-                queryset = queryset.filter(precio_mxn__lte=float(max_precio))
-            except ValueError:
-                pass
-        
-        # Búsqueda por nombre o descripción
-        search = self.request.query_params.get('search', None)
-        if search:
-            queryset = queryset.filter(
-                models.Q(nombre__icontains=search) |
-                models.Q(descripcion__icontains=search)
-            )
-        
-        # Ordenación
-        ordenar_por = self.request.query_params.get('ordenar_por', None)
-        if ordenar_por == 'precio_asc':
-            queryset = queryset.order_by('precio_mxn')
-        elif ordenar_por == 'precio_desc':
-            queryset = queryset.order_by('-precio_mxn')
-        elif ordenar_por == 'fecha_asc':
-            queryset = queryset.order_by('fecha_publicacion')
-        elif ordenar_por == 'fecha_desc':
-            queryset = queryset.order_by('-fecha_publicacion')
-        
+        if self.action == 'retrieve' and contadores.pide_contadores(self.request):
+            queryset = queryset.select_related('contador')
+        elif self.action == 'destroy':
+            queryset = queryset.only('id', 'activo')
         return queryset
 
+    def get_serializer_class(self):
+        if self.action in ('list', 'retrieve') and contadores.pide_contadores(self.request):
+            return ServicioConContadoresSerializer
+        return super().get_serializer_class()
+
+    def get_campos_version(self):
+        campos = super().get_campos_version()
+        if contadores.pide_contadores(self.request):
+            campos.append(contadores.CAMPO_VERSION)
+        return campos
+
+    def get_throttles(self):
+        if self.action == 'solicitudes' and self.request.method == 'POST':
+            return [throttle() for throttle in THROTTLES_SOLICITUDES]
+        return super().get_throttles()
+
     @action(detail=True, methods=['get', 'post'], url_path='solicitudes')
     def solicitudes(self, request, pk=None):
         """
@@ -89,60 +108,283 @@ class ServicioViewSet(viewsets.ModelViewSet):
         
         GET /api/servicios/{id}/solicitudes - Lista solicitudes del servicio
         POST /api/servicios/{id}/solicitudes - Crea una solicitud para el servicio
+
+        El listado usa la misma paginación, filtros (``estatus``) y ordenación
+        que /api/solicitudes/, así que nunca carga más de una página en memoria.
         """
-        servicio = self.get_object()
+        servicio = get_object_or_404(Servicio.objects.only('id', 'nombre'), pk=pk)
+        self.check_object_permissions(request, servicio)
         
         if request.method == 'GET':
-            solicitudes = servicio.solicitudes.all()
-            serializer = SolicitudClienteNestedSerializer(solicitudes, many=True)
-            return Response(serializer.data)
+            filterset = SolicitudClienteFilter(
+                request.query_params, queryset=servicio.solicitudes.all(), request=request
+            )
+            representacion = ValuesRepresentation.para(SolicitudClienteNestedSerializer)
+            page = self.paginate_queryset(
+                representacion.preparar(aplicar_filterset(request, filterset))
+            )
+            return self.get_paginated_response(representacion.many(page))
         
         elif request.method == 'POST':
-            serializer = SolicitudClienteSerializer(data=request.data)
+            datos = dict(request.data) if isinstance(request.data, dict) else {}
+            datos['servicio'] = servicio.pk
+            serializer = SolicitudClienteSerializer(data=datos)
             if serializer.is_valid():
+                if cola.activa():
+                    return respuesta_encolada(
+                        request, cola.encolar({**serializer.validated_data, 'servicio': servicio})
+                    )
                 serializer.save(servicio=servicio)
                 return Response(serializer.data, status=status.HTTP_201_CREATED)
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
+    @action(detail=False, methods=['get'], url_path='estadisticas')
+    def estadisticas(self, request):
+        """
+        Número de solicitudes por estatus de cada servicio.
+
+        GET /api/servicios/estadisticas/ - Acepta los mismos filtros que el listado
+
+        Se lee de ``ContadorSolicitudes`` (sin agrupar las solicitudes) y
+        lleva ETag y Last-Modified como el resto de las lecturas.
+        """
+        servicios = self.filter_queryset(self.get_queryset())
+        queryset = ContadorSolicitudes.objects.filter(servicio__in=servicios.values('pk'))
+        representacion = ValuesRepresentation.para(ContadorSolicitudesSerializer)
+        if self.paginator.usa_cursor(request):
+            page = self.paginator.paginate_queryset(
+                representacion.preparar(queryset, columnas_extra=['actualizado']), request, view=self
+            )
+            etag, ultima = validadores_de_pagina(request, page, ['actualizado'], self.paginator.keyset.has_next)
+            response = respuesta_condicional(request, etag, ultima)
+            if response is None:
+                response = self.get_paginated_response(representacion.many(page))
+            return agregar_validadores(response, etag, ultima)
+
+        agregado = queryset.aggregate(ultima=Max('actualizado'), total=Count('pk'))
+        ultima = agregado['ultima']
+        etag = calcular_etag('estadisticas', request.get_full_path(), ultima, agregado['total'])
+
+        response = respuesta_condicional(request, etag, ultima)
+        if response is None:
+            page = self.paginator.paginate_queryset(
+                representacion.preparar(queryset), request, view=self, total=agregado['total']
+            )
+            response = self.get_paginated_response(representacion.many(page))
+        return agregar_validadores(response, etag, ultima)
+
+    @action(detail=False, methods=['post'], url_path='bulk/desactivar')
+    def bulk_desactivar(self, request):
+        """
+        Desactiva varios servicios con un solo UPDATE.
+
+        POST /api/servicios/bulk/desactivar/ - Body: lista de ids
+        """
+        modo = leer_modo(request)
+        ids = leer_elementos(request, self.max_lote, tipo=int)
+        existentes = set(
+            Servicio.objects.filter(pk__in=ids).values_list('pk', flat=True)
+        )
+        resultado = ResultadoLote()
+        for indice, pk in enumerate(ids):
+            if pk in existentes:
+                resultado.validos.append((indice, pk))
+            else:
+                resultado.agregar_error(indice, {'id': ['No existe un objeto con este id.']})
+
+        desactivados = []
+        if resultado.se_escribe(modo):
+            desactivados = [pk for _, pk in resultado.validos]
+            Servicio.objects.filter(pk__in=desactivados).desactivar()
+        return resultado.respuesta(desactivados, status.HTTP_200_OK)
+
+    @action(detail=False, methods=['post'], url_path='desactivar')
+    def desactivar(self, request):
+        """
+        Desactiva con un solo UPDATE los servicios que cumplen los filtros.
+
+        POST /api/servicios/desactivar/?categoria=Web - Acepta los mismos filtros que el listado
+        """
+        return self._cambiar_activo(request, False)
+
+    @action(detail=False, methods=['post'], url_path='reactivar')
+    def reactivar(self, request):
+        """
+        Reactiva con un solo UPDATE los servicios que cumplen los filtros.
+
+        POST /api/servicios/reactivar/?categoria=Web - Acepta los mismos filtros que el listado
+        """
+        return self._cambiar_activo(request, True)
+
+    def _cambiar_activo(self, request, activo):
+        servicios = self.filter_queryset(self.get_queryset())
+        if not {nombre for nombre, _ in request.huella_consulta} - {'ordenar_por', 'ordering'}:
+            # Sin filtros cambiaría todo el catálogo
+            raise ValidationError({'filtros': ['Indica al menos un filtro (categoria, activo, precio o search).']})
+        # El UPDATE va sobre los ids: los filtros pueden traer JOINs y ordenación
+        seleccionados = Servicio.objects.filter(pk__in=servicios.order_by().values('pk'))
+        actualizados = seleccionados.reactivar() if activo else seleccionados.desactivar()
+        return Response({'actualizados': actualizados}, status=status.HTTP_200_OK)
+
+    def perform_bulk_create(self, objetos):
+        # bulk_create no envía post_save: el índice de búsqueda se actualiza aquí
+        super().perform_bulk_create(objetos)
+        indexar_servicios(objetos)
+        contadores.crear_contadores(objetos)
+
+    def perform_bulk_update(self, objetos, campos):
+        super().perform_bulk_update(objetos, campos)
+        if CAMPOS_INDEXADOS & set(campos):
+            indexar_servicios(objetos)
+
     def destroy(self, request, *args, **kwargs):
         """
         Soft delete: en lugar de eliminar, marca el servicio como inactivo.
+
+        Solo se leen y se escriben ``activo`` y ``ultima_actualizacion``.
         """
         instance = self.get_object()
         instance.activo = False
-        instance.save()
+        instance.save(update_fields=['activo', 'ultima_actualizacion'])
         return Response(
             {'message': 'Servicio desactivado correctamente'},
             status=status.HTTP_200_OK
         )
 
 
-class SolicitudClienteViewSet(viewsets.ModelViewSet):
+def respuesta_encolada(request, pendiente):
+    """202 con el seguimiento de una solicitud encolada (ver ``services/cola.py``)"""
+    url = request.build_absolute_uri(
+        reverse('solicitud-pendiente-detail', kwargs={'seguimiento': pendiente.seguimiento})
+    )
+    return Response(
+        SolicitudPendienteSerializer(pendiente).data,
+        status=status.HTTP_202_ACCEPTED,
+        headers={'Location': url},
+    )
+
+
+class SolicitudClienteViewSet(LecturasEnReplicaMixin, FastReadMixin, BulkMixin, viewsets.ModelViewSet):
     """
     ViewSet para el modelo SolicitudCliente.
     
-    Permite CRUD completo con filtros.
+    Permite CRUD completo con filtros (``SolicitudClienteFilter``) y
+    escrituras masivas por /bulk/ (ver ``BulkMixin``). Las lecturas se
+    representan desde ``.values()`` (ver ``FastReadMixin``). La creación
+    pública tiene límites por IP y por servicio (ver ``services/throttling.py``).
+    Con réplica configurada, las lecturas van a ella (ver ``core/replicas.py``).
     """
-    queryset = SolicitudCliente.objects.all()
+    # El servicio se trae en el mismo JOIN, y de él solo el nombre, que es lo
+    # único que usa el serializer (servicio_nombre).
+    queryset = SolicitudCliente.objects.select_related('servicio').only(
+        'id',
+        'servicio__id',
+        'servicio__nombre',
+        'cliente_nombre',
+        'cliente_email',
+        'mensaje',
+        'estatus',
+        'fecha_creacion',
+    )
     serializer_class = SolicitudClienteSerializer
     permission_classes = [AllowAny]  # En producción, usar permisos apropiados
-    filter_backends = [DjangoFilterBackend]
+    filter_backends = [CanonicalFilterBackend]
     filterset_class = SolicitudClienteFilter
 
-    def get_queryset(self):
+    def get_throttles(self):
+        # El lote público crea solicitudes igual que create: paga una ficha por elemento
+        if self.action == 'create' or (self.action == 'bulk' and self.request.method == 'POST'):
+            return [throttle() for throttle in THROTTLES_SOLICITUDES]
+        return super().get_throttles()
+
+    def create(self, request, *args, **kwargs):
+        if not cola.activa():
+            return super().create(request, *args, **kwargs)
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        return respuesta_encolada(request, cola.encolar(serializer.validated_data))
+
+    def bulk_create(self, elementos, modo):
+        """Con la cola activa, el lote también se encola (202 con un seguimiento por elemento)"""
+        if not cola.activa():
+            return super().bulk_create(elementos, modo)
+        resultado = ResultadoLote()
+        self.validar_lote(self.get_bulk_serializer(elementos), elementos, resultado)
+        pendientes = []
+        if resultado.se_escribe(modo):
+            pendientes = cola.encolar_lote([datos for _, datos in resultado.validos])
+        return resultado.respuesta(
+            [pendiente.seguimiento for pendiente in pendientes], status.HTTP_202_ACCEPTED,
+            campo='seguimiento',
+        )
+
+    def perform_bulk_create(self, objetos):
+        # bulk_create no envía post_save: los contadores se ajustan aquí
+        super().perform_bulk_create(objetos)
+        contadores.ajustar(Counter(contadores.posiciones(objetos)))
+
+    def perform_bulk_update(self, objetos, campos):
+        if not contadores.CAMPOS_SOLICITUD & set(campos):
+            return super().perform_bulk_update(objetos, campos)
+        anteriores = contadores.leer_posiciones([objeto.pk for objeto in objetos])
+        super().perform_bulk_update(objetos, campos)
+        contadores.ajustar(contadores.cambios_entre(
+            [anteriores.get(objeto.pk) for objeto in objetos], contadores.posiciones(objetos)
+        ))
+
+    @action(detail=False, methods=['get'], url_path='analitica')
+    def analitica(self, request):
         """
-        Permite filtrado por servicio y estatus.
+        Solicitudes por día, categoría y estatus de los últimos ``dias`` días.
+
+        GET /api/solicitudes/analitica/?dias=90&categoria=&estatus=
+
+        Los días ya resumidos salen de ``ResumenDiarioSolicitudes`` y solo
+        los posteriores (normalmente, hoy) se cuentan en vivo.
         """
-        queryset = super().get_queryset()
-        
-        servicio_id = self.request.query_params.get('servicio', None)
-        if servicio_id:
-            queryset = queryset.filter(servicio_id=servicio_id)
-        
-        estatus = self.request.query_params.get('estatus', None)
-        if estatus:
-            queryset = queryset.filter(estatus=estatus)
-        
-        return queryset
+        parametros = AnaliticaParametrosSerializer(data=request.query_params)
+        parametros.is_valid(raise_exception=True)
+        return Response(analitica.consultar(**parametros.validated_data))
+
+    @action(detail=False, methods=['get'], url_path='exportar')
+    def exportar(self, request):
+        """
+        Exporta las solicitudes filtradas sin paginar, en streaming.
 
+        GET /api/solicitudes/exportar/?formato=ndjson|csv&estatus=&servicio=&desde=&hasta=
+        """
+        formato = request.query_params.get('formato', 'ndjson')
+        if formato not in export.FORMATOS:
+            raise ValidationError(
+                {'formato': f'Formato inválido, use uno de: {", ".join(export.FORMATOS)}.'}
+            )
+        queryset = self.filter_queryset(self.get_queryset())
+        # Las filas se leen al enviar la respuesta, cuando el router ya no ve
+        # la petición: la base (la réplica, si le toca) se elige aquí
+        queryset = queryset.using(queryset.db)
+        contenido = export.generar(queryset, formato)
+        if isinstance(request._request, ASGIRequest):
+            contenido = export.generar_async(contenido)
+
+        response = StreamingHttpResponse(contenido, content_type=export.FORMATOS[formato])
+        nombre = f'solicitudes-{timezone.localdate():%Y%m%d}.{formato}'
+        response['Content-Disposition'] = f'attachment; filename="{nombre}"'
+        return response
+
+
+class SolicitudPendienteViewSet(mixins.RetrieveModelMixin, viewsets.GenericViewSet):
+    """
+    Seguimiento de las solicitudes encoladas con ``SOLICITUDES_EN_COLA``.
+
+    GET /api/solicitudes-pendientes/{seguimiento}/ - Estado de una solicitud encolada
+    GET /api/solicitudes-pendientes/estado/ - Profundidad, retraso y último lote de la cola
+    """
+    queryset = SolicitudPendiente.objects.all()
+    serializer_class = SolicitudPendienteSerializer
+    permission_classes = [AllowAny]  # En producción, usar permisos apropiados
+    lookup_field = 'seguimiento'
+    lookup_value_regex = '[0-9a-f-]{36}'
 
+    @action(detail=False, methods=['get'], url_path='estado')
+    def estado(self, request):
+        return Response(cola.estado())